@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shell")))
+from enc_engine import RUN_SEED, load_program, solve_batch
+
+# Gate penalties in spin form (bias > 0 favours bit 0): inputs 0, 1 -> output 2
+GATES = {
+    "AND": ("edge 0 1 1.0\nedge 0 2 -2.0\nedge 1 2 -2.0", (-1.0, -1.0, 2.0), lambda a, b: a & b),
+    "OR": ("edge 0 1 1.0\nedge 0 2 -2.0\nedge 1 2 -2.0", (1.0, 1.0, -2.0), lambda a, b: a | b),
+}
+PIN = 5.0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Many tiny .enc programs: one request each vs block-diagonal batches.")
+    parser.add_argument("--base-url", help="API base URL (default: local reference kernel)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Client rate limit in req/s (0 = off)")
+    parser.add_argument("--programs", type=int, default=200)
+    parser.add_argument("--total-time", type=float, default=35.0)
+    parser.add_argument("--skip-single", action="store_true", help="Only run the batched mode")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def make_program(rng):
+    """(script, expected bits) for a random NOT / AND / OR gate or one ASCII character."""
+    kind = rng.choice(("NOT", "AND", "OR", "CHAR"))
+    if kind == "NOT":
+        a = rng.randrange(2)
+        return f"edge 0 1 1.0\nnode 0 {-PIN if a else PIN}", [a, 1 - a]
+    if kind == "CHAR":
+        bits = [int(b) for b in format(ord(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")), "08b")]
+        return "\n".join(f"node {i} {-PIN if b else PIN}" for i, b in enumerate(bits)), bits
+    edges, (ha, hb, hz), fn = GATES[kind]
+    a, b = rng.randrange(2), rng.randrange(2)
+    nodes = [f"node 0 {ha + (-PIN if a else PIN)}", f"node 1 {hb + (-PIN if b else PIN)}", f"node 2 {hz}"]
+    return edges + "\n" + "\n".join(nodes), [a, b, fn(a, b)]
+
+
+def make_solver(client):
+    if client is not None:
+        return client.solve
+    from enchan_client import solve_local
+    return lambda body: asyncio.get_running_loop().run_in_executor(None, solve_local, json.loads(body))
+
+
+async def solve_single(models, solve, duration):
+    """Baseline: one request per program, as `run` would issue them."""
+    start = time.perf_counter()
+    results = await asyncio.gather(*(solve_batch([m], solve, duration) for m in models))
+    elapsed = time.perf_counter() - start
+    return [r["programs"][0] for r in results], elapsed
+
+
+async def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    scripts, expected = zip(*(make_program(rng) for _ in range(args.programs)))
+    models = [load_program(s) for s in scripts]
+
+    print(f"--- Enchan Batched Programs ---")
+    print(f"Programs     : {args.programs} gates / characters ({sum(m.N for m in models)} nodes)")
+    print(f"Backend      : {args.base_url or 'local reference kernel'}")
+    print("-" * 60)
+
+    client = None
+    if args.base_url:
+        from enchan_client import AsyncEnchanClient
+        client = AsyncEnchanClient(args.base_url, rate=args.rate or None, burst=2, pool_size=2)
+    solve = make_solver(client)
+    report = {}
+    try:
+        batch = await solve_batch(models, solve, args.total_time, seed=RUN_SEED)
+        correct = sum(p["bits"] == e for p, e in zip(batch["programs"], expected))
+        report["batch"] = dict(batch["report"], correct=correct)
+        print(f" [BATCH]       {batch['report']['requests']} requests, {batch['report']['wall_time']:.3f}s, "
+              f"{batch['report']['programs_per_sec']:.1f} programs/s, {correct}/{args.programs} correct")
+        if not args.skip_single:
+            single, elapsed = await solve_single(models, solve, args.total_time)
+            correct = sum(p["bits"] == e for p, e in zip(single, expected))
+            report["single"] = {"requests": len(models), "wall_time": elapsed,
+                                "programs_per_sec": len(models) / elapsed, "correct": correct}
+            print(f" [SINGLE]      {len(models)} requests, {elapsed:.3f}s, "
+                  f"{len(models) / elapsed:.1f} programs/s, {correct}/{args.programs} correct")
+    finally:
+        if client:
+            client.close()
+
+    if "single" in report:
+        print("-" * 60)
+        print(f" [SPEEDUP]     {report['batch']['programs_per_sec'] / report['single']['programs_per_sec']:.1f}x "
+              f"programs/s, {len(models) // report['batch']['requests']}x fewer requests")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
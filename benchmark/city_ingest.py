@@ -0,0 +1,92 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client.cityio import CityCache, load_cities
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="City dataset ingestion: csv.reader vs single-pass loader.")
+    parser.add_argument("--csv", help="Existing `name,lat,lon` CSV (default: generate one)")
+    parser.add_argument("--cities", type=int, default=1000000, help="Rows to generate without --csv")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def reader_baseline(path):
+    """The previous two-pass loader: 4 KiB SHA256 blocks, then csv.reader row by row."""
+    start = time.perf_counter()
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(4096), b""):
+            digest.update(block)
+    names, rows = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if len(row) < 3:
+                continue
+            names.append(row[0].strip())
+            rows.append([float(row[1]), float(row[2])])
+    return digest.hexdigest(), np.array(rows), time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv
+        if not path:
+            rng = np.random.default_rng(args.seed)
+            lat = np.round(rng.uniform(24.0, 46.0, args.cities), 5)
+            lon = np.round(rng.uniform(123.0, 146.0, args.cities), 5)
+            path = os.path.join(tmp, "cities.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("Name,Latitude,Longitude\n")
+                f.writelines(f"stop{i},{a},{b}\n" for i, (a, b) in enumerate(zip(lat.tolist(), lon.tolist())))
+        size = os.path.getsize(path)
+
+        print(f"--- Enchan City Ingestion ---")
+        print(f"Dataset      : {path} ({size / 1e6:.1f} MB)")
+        print("-" * 60)
+
+        digest, baseline, t_reader = reader_baseline(path)
+        cache = CityCache(os.path.join(tmp, "cache"))
+        cold = load_cities(path, cache=cache)
+        warm = load_cities(path, cache=cache)
+        npy = os.path.join(tmp, "cities.npy")
+        np.save(npy, np.ascontiguousarray(cold.coords))
+        binary = load_cities(npy)
+        same = digest == cold.file_hash and np.array_equal(baseline, cold.coords) and np.array_equal(baseline, warm.coords)
+
+        report = {
+            "rows": len(cold),
+            "bytes": size,
+            "csv_reader": t_reader,
+            "single_pass": cold.load_time,
+            "cache_hit": warm.load_time,
+            "npy_mmap": binary.load_time,
+            "identical": bool(same),
+        }
+        print(f" [CSV READER]  {t_reader:.3f}s ({len(baseline) / t_reader / 1e6:.2f}M rows/s)")
+        print(f" [ONE PASS]    {cold.load_time:.3f}s ({size / cold.load_time / 1e6:.0f} MB/s, "
+              f"x{t_reader / cold.load_time:.1f})")
+        print(f" [CACHE HIT]   {warm.load_time * 1e3:.1f} ms (memory-mapped .npy)")
+        print(f" [NPY]         {binary.load_time * 1e3:.1f} ms (hash + mmap)")
+        print(f" [CHECK]       {'IDENTICAL' if same else 'MISMATCH'} (SHA256 {cold.file_hash[:16]}...)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,21 @@
-import requests
+import argparse
+import os
+import sys
 import time
 import json
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import DEFAULT_BASE_URL, CachedClient, EnchanClient, default_cache, encode_solve_json, solve_payload
+from enchan_client.corpus import corpus_graph
+from enchan_client.trace import Tracer, format_phases, set_tracer
+
 # --- Enchan API: Quantum-Transcendence Challenge ---
-API_URL = "https://enchan-api-82345546010.us-central1.run.app/v1/solve"
+BASE_URL = DEFAULT_BASE_URL
+
+def run_extreme_challenge(explicit=False, trace=None, cache=False):
+    tracer = Tracer(source="fcmc_benchmark")
+    set_tracer(tracer)
 
-def run_extreme_challenge():
     # ══════════════════════════════════════════════════
     #  ENCHAN EXTREME BENCHMARK CONFIGURATION
     # ══════════════════════════════════════════════════
@@ -13,11 +23,12 @@ def run_extreme_challenge():
     DENSITY = 1.0
     TOTAL_TIME = 35.0
 
-    payload = {
-        "graph": {"N": N, "density": DENSITY},
-        "control": {"total_time": TOTAL_TIME}, 
-        "seed": 777
-    }
+    if explicit:
+        # The full mesh from the local corpus, so other backends solve the identical input
+        g, _ = corpus_graph("er", N, seed=777, density=DENSITY)
+        payload = encode_solve_json(g.N, g.u, g.v, total_time=TOTAL_TIME, seed=777)
+    else:
+        payload = solve_payload(N, density=DENSITY, total_time=TOTAL_TIME, seed=777)
 
     total_edges = int(N * (N - 1) / 2)
 
@@ -27,13 +38,10 @@ def run_extreme_challenge():
     start_wall = time.perf_counter()
     
     try:
-        response = requests.post(API_URL, json=payload, timeout=300)
-        response.raise_for_status()
+        with CachedClient(EnchanClient(BASE_URL, timeout=300), default_cache() if cache else None) as client:
+            data = client.solve(payload)
         
         end_wall = time.perf_counter()
-        
-        # --- data extraction ---
-        data = response.json()
 
         # ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼
         # View raw data from the server
@@ -96,18 +104,34 @@ def run_extreme_challenge():
         print(f" [MEMORY]      {mem_str}")
         print("-" * 55)
 
-        print(f" [LATENCY]     {total_latency:.3f}s (Round Trip)")
-        print(f" [SOLVE TIME]  {pure_solve_time:.3f}s (Core Physics Engine)")
-        print(f" [OVERHEAD]    {overhead:.3f}s (Network/IO)")
+        if client.last_hit:
+            # A cache hit never reached the server, so round trip and overhead are meaningless
+            print(f" [LATENCY]     n/a (cached result, {total_latency:.3f}s local)")
+            print(f" [SOLVE TIME]  {pure_solve_time:.3f}s (Core Physics Engine, original run)")
+        else:
+            print(f" [LATENCY]     {total_latency:.3f}s (Round Trip)")
+            print(f" [SOLVE TIME]  {pure_solve_time:.3f}s (Core Physics Engine)")
+            print(f" [OVERHEAD]    {overhead:.3f}s (Network/IO)")
+        print(f" [PHASES]      {format_phases(tracer.records()) or 'n/a'}")
+        print(f" [CACHE]       {'HIT (served from local result cache)' if client.last_hit else 'MISS'}")
         print("-" * 55)
 
         print(f" [RESULT]      Max-Cut Score: {cut_score:,}")
         print(f" [GAIN]        {gain_percent:+.2f}% vs expected baseline")
         print(f" [S-HASH]      {s_hash}")
         print("═" * 55 + "\n")
+        if trace:
+            tracer.write_jsonl(trace)
 
     except Exception as e:
         print(f"\n❌ Benchmark Failed: {e}")
 
 if __name__ == "__main__":
-    run_extreme_challenge()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Enchan extreme benchmark (N=2000, full mesh).")
+    parser.add_argument("--explicit", action="store_true",
+                        help="Send the cached corpus edge list instead of server-side density generation")
+    parser.add_argument("--trace", help="Append per-phase timing spans to this JSON-lines file")
+    parser.add_argument("--cache", action="store_true",
+                        help="Serve repeated runs from the local result cache (no latency measurement on a hit)")
+    args = parser.parse_args()
+    run_extreme_challenge(args.explicit, args.trace, args.cache)
\ No newline at end of file
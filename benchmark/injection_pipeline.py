@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import AsyncEnchanClient, solve_payload
+from enchan_client.graph import generate_random_graph
+from enchan_client.injection import adaptive_injection
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Adaptive Resource Injection pipeline (survey + warm-start rounds).")
+    parser.add_argument("--base-url", help="API base URL (default: local reference kernels)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Client rate limit in req/s (0 = off)")
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--total-time", type=float, default=35.0)
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--top-k", type=int, default=64, help="Vulnerable nodes flipped per round")
+    parser.add_argument("--patience", type=int, default=2, help="Stop after this many non-improving rounds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    u, v, _ = generate_random_graph(args.nodes, args.density, args.seed)
+    payload = solve_payload(args.nodes, np.column_stack([u, v]).tolist(),
+                            total_time=args.total_time, seed=args.seed)
+
+    print(f"--- Enchan Adaptive Injection ---")
+    print(f"Graph        : N={args.nodes:,}, E={len(u):,}")
+    print(f"Backend      : {args.base_url or 'local reference kernels'}")
+    print("-" * 60)
+
+    client = None
+    if args.base_url:
+        client = AsyncEnchanClient(args.base_url, rate=args.rate or None, burst=2, pool_size=2)
+    try:
+        result = await adaptive_injection(payload, client, rounds=args.rounds, top_k=args.top_k,
+                                          patience=args.patience)
+    finally:
+        if client:
+            client.close()
+
+    report = result["report"]
+    print(f" [SURVEY]      cut {report['base_cut']:,.0f} in {report['survey_time']:.3f}s "
+          f"(sequential: {report['survey_sequential']:.3f}s)")
+    print(f"{'Round':>5} {'Targets':>8} {'Cut':>12} {'Gain':>8} {'Latency':>10} {'Gain/s':>10}")
+    for h in report["rounds"]:
+        print(f"{h['round']:>5} {h['targets']:>8} {h['cut']:>12,.0f} {h['gain']:>+8.0f} "
+              f"{h['latency']:>9.3f}s {h['gain_per_sec']:>10.1f}{'' if h['accepted'] else '  (rejected)'}")
+    print("-" * 60)
+    print(f" [BEST CUT]    {report['best_cut']:,.0f} (+{report['improvement']:,.0f})")
+    print(f" [WALL]        {report['wall_time']:.3f}s (injection {report['injection_time']:.3f}s)")
+    print(f" [GAIN/SEC]    {report['gain_per_sec']:.1f} cut per injection wall-second")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
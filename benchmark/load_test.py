@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import AsyncEnchanClient
+from enchan_client.audit import make_verifier
+from enchan_client.loadgen import default_workload, format_report, parse_mix, run_load, summarize
+from enchan_client.trace import Tracer, format_phases, set_tracer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Enchan API load test (throughput & tail latency).")
+    parser.add_argument("--base-url", help="API base URL (default: start a local stand-in server)")
+    parser.add_argument("--requests", type=int, default=60, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=4, help="In-flight requests")
+    parser.add_argument("--mix", default="solve=3,scan_resonance=1,tsp=1", help="Weighted endpoint mix")
+    parser.add_argument("--rate", type=float, default=0.0, help="Client rate limit in req/s (0 = off)")
+    parser.add_argument("--nodes", type=int, default=200, help="Graph size for solve/scan")
+    parser.add_argument("--density", type=float, default=0.05)
+    parser.add_argument("--cities", type=int, default=100, help="City count for tsp")
+    parser.add_argument("--total-time", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Solver processes of the in-process stand-in (0 = request threads)")
+    parser.add_argument("--no-pack", action="store_true", help="Disable small-request packing in the stand-in")
+    parser.add_argument("--audit", action="store_true",
+                        help="Send explicit edge lists and verify every solve/tsp response locally")
+    parser.add_argument("--trace", help="Append per-phase timing spans to this JSON-lines file")
+    parser.add_argument("--json", help="Also write the summary to this JSON file")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        from enchan_server import start_background
+        server, base_url = start_background(workers=args.workers, pack=not args.no_pack)
+
+    tracer = Tracer(source="load_test") if args.trace else None
+    set_tracer(tracer)
+    workload = default_workload(args.nodes, args.density, args.cities, args.total_time, args.seed,
+                                explicit_edges=args.audit)
+    verify = make_verifier(workload) if args.audit else None
+    mix = parse_mix(args.mix)
+
+    print(f"--- Enchan Load Test ---")
+    print(f"Target       : {base_url}{' (local stand-in)' if server else ''}")
+    print(f"Requests     : {args.requests} @ concurrency {args.concurrency}")
+    print(f"Mix          : {mix}")
+    print("-" * 60)
+
+    client = AsyncEnchanClient(base_url, rate=args.rate or None, burst=args.concurrency,
+                               pool_size=args.concurrency)
+    try:
+        samples, wall = await run_load(client, workload, mix, args.requests, args.concurrency, args.seed,
+                                       verify)
+    finally:
+        client.close()
+        if server:
+            server.shutdown()
+            stats = server.scheduler.snapshot()
+            server.server_close()
+
+    summary = summarize(samples, wall)
+    print(format_report(summary))
+    print("-" * 60)
+    print(f" [WALL]        {wall:.3f}s")
+    print(f" [THROUGHPUT]  {summary['overall']['rps']:.2f} req/s")
+    if server and stats["workers"]:
+        print(f" [STAND-IN]    {stats['workers']} workers, {stats['packed_requests']} requests packed into "
+              f"{stats['packs']} tasks, {stats['rejected']} rejected (queue full)")
+    if args.audit:
+        overall = summary["overall"]
+        print(f" [AUDIT]       {overall['audited']} verified, {overall['audit_failures']} failed")
+    if tracer:
+        tracer.write_jsonl(args.trace)
+        print(f" [PHASES]      {format_phases(tracer.records())}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import encode_solve_json, solve_payload
+from enchan_client.wire import decode_request, encode_base64_json, encode_binary, zstandard
+
+
+def timed(fn, repeat):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def run_benchmark():
+    parser = argparse.ArgumentParser(description="Solve payload size & encode/decode time: JSON vs binary.")
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--density", type=float, default=1.0)
+    parser.add_argument("--weighted", action="store_true", help="Attach float weights")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    N = args.nodes
+    rng = np.random.default_rng(42)
+    iu, iv = np.triu_indices(N, 1)
+    keep = rng.random(len(iu)) < args.density
+    u, v = iu[keep].astype(np.int32), iv[keep].astype(np.int32)
+    w = rng.choice([-1.0, 1.0], size=len(u)).astype(np.float32) if args.weighted else None
+
+    print(f"--- Enchan Payload Benchmark ---")
+    print(f"Graph        : N={N:,}, E={len(u):,}{' (weighted)' if args.weighted else ''}")
+    print("-" * 72)
+
+    cases = [
+        ("json (lists)", lambda: json.dumps(solve_payload(
+            N, np.column_stack([u, v]).tolist(), None if w is None else w.tolist(),
+            total_time=35.0, seed=42)).encode(), "application/json"),
+        ("json (arrays)", lambda: encode_solve_json(N, u, v, w, total_time=35.0, seed=42), "application/json"),
+    ]
+    codecs = ["none", "gzip"] + (["zstd"] if zstandard is not None else [])
+    for codec in codecs:
+        cases.append((f"binary/{codec}", lambda c=codec: encode_binary(N, u, v, w, 35.0, 42, codec=c),
+                      "application/x-enchan-graph"))
+    for codec in codecs[1:]:
+        cases.append((f"b64-json/{codec}", lambda c=codec: encode_base64_json(N, u, v, w, 35.0, 42, codec=c),
+                      "application/json"))
+
+    print(f"{'Format':<18} {'Size':>12} {'Ratio':>8} {'Encode':>10} {'Decode':>10}")
+    baseline = None
+    for name, encode, content_type in cases:
+        body, enc_t = timed(encode, args.repeat)
+        decoded, dec_t = timed(lambda: decode_request(body, content_type), args.repeat)
+        assert len(decoded["graph"]["edges"]) == len(u)
+        baseline = baseline or len(body)
+        print(f"{name:<18} {len(body) / 1e6:>10.2f}MB {baseline / len(body):>7.1f}x "
+              f"{enc_t * 1e3:>8.1f}ms {dec_t * 1e3:>8.1f}ms")
+    if zstandard is None:
+        print("\n(zstd skipped: install 'zstandard' to include it)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import AsyncEnchanClient, solve_payload
+from enchan_client.graph import generate_random_graph
+from enchan_client.portfolio import portfolio_seeds, solve_portfolio
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Best-of-K multi-seed portfolio vs wall time.")
+    parser.add_argument("--base-url", help="API base URL (default: local reference kernel)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Client rate limit in req/s (0 = off)")
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--total-time", type=float, default=35.0)
+    parser.add_argument("--seeds", type=int, default=8, help="Portfolio size K")
+    parser.add_argument("--concurrency", type=int, help="Parallel solves (default: min(K, CPUs))")
+    parser.add_argument("--processes", action="store_true", help="Local kernel in a process pool instead of threads")
+    parser.add_argument("--target-cut", type=float, help="Stop once this cut is reached")
+    parser.add_argument("--budget", type=float, help="Stop after this many seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Graph seed and first portfolio seed")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    u, v, _ = generate_random_graph(args.nodes, args.density, args.seed)
+    payload = solve_payload(args.nodes, np.column_stack([u, v]).tolist(), total_time=args.total_time)
+
+    print(f"--- Enchan Seed Portfolio ---")
+    print(f"Graph        : N={args.nodes:,}, E={len(u):,}, K={args.seeds}")
+    print(f"Backend      : {args.base_url or ('local kernel, ' + ('processes' if args.processes else 'threads'))}")
+    print("-" * 60)
+
+    client = None
+    if args.base_url:
+        client = AsyncEnchanClient(args.base_url, rate=args.rate or None, burst=args.seeds,
+                                   pool_size=args.concurrency or args.seeds)
+    try:
+        result = await solve_portfolio(payload, portfolio_seeds(args.seeds, args.seed), client,
+                                       target_cut=args.target_cut, budget=args.budget,
+                                       concurrency=args.concurrency, processes=args.processes)
+    finally:
+        if client:
+            client.close()
+
+    report = result["report"]
+    print(f"{'Arrival':>8} {'Seed':>10} {'Cut':>10} {'Best':>10} {'Elapsed':>9}")
+    for i, a in enumerate(report["arrivals"], 1):
+        print(f"{i:>8} {a['seed']:>10} {a['cut']:>10,.0f} {a['best_cut']:>10,.0f} {a['elapsed']:>8.3f}s")
+    print("-" * 60)
+    print(f"{'K':>4} {'E[best cut]':>12} {'Est. wall':>10}")
+    for row in report["best_of_k"]:
+        print(f"{row['k']:>4} {row['expected_best_cut']:>12,.1f} {row['est_wall_time']:>9.3f}s")
+    print("-" * 60)
+    print(f" [BEST CUT]    {report['best_cut']:,.0f} (seed {report['best_seed']}, "
+          f"mean {report['mean_cut']:,.1f}, worst {report['worst_cut']:,.0f})")
+    print(f" [WALL]        {report['wall_time']:.3f}s at concurrency {report['concurrency']}")
+    print(f" [STOP]        {report['stop_reason']} ({report['completed']} done, {report['cancelled']} cancelled)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
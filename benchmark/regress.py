@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import EnchanClient
+from enchan_client.regress import (
+    DEFAULT_ALPHA,
+    DEFAULT_MEMORY_THRESHOLD,
+    DEFAULT_REPEATS,
+    DEFAULT_THRESHOLD,
+    MIN_SAMPLES,
+    client_backend,
+    compare,
+    format_comparison,
+    format_run,
+    load_baseline,
+    local_backend,
+    run_suite,
+    save_baseline,
+    select,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Enchan performance regression suite.")
+    parser.add_argument("--suite", default="quick", choices=("quick", "full", "all"))
+    parser.add_argument("--only", nargs="+", help="Run scenarios whose name contains any of these")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help=f"Timed runs per scenario (comparisons need at least {MIN_SAMPLES})")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per scenario")
+    parser.add_argument("--base-url", help="Measure through this API (default: local reference kernels)")
+    parser.add_argument("--stand-in", action="store_true", help="Measure through an in-process stand-in server")
+    parser.add_argument("--baseline", help="Compare against this baseline file; exit 1 on regression")
+    parser.add_argument("--save", help="Write this run as a baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed p50 latency / throughput change (0.10 = 10%%)")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help="Significance level of the one-sided Mann-Whitney U test")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    parser.add_argument("--allow-drift", action="store_true", help="Do not fail when a cut or hash changes")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced peak-memory run")
+    parser.add_argument("--json", help="Also write the run (and comparison) to this JSON file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    server = client = None
+    if args.stand_in:
+        from enchan_server import start_background
+        server, base_url = start_background()
+        args.base_url = base_url
+    if args.base_url:
+        client = EnchanClient(args.base_url, rate=None)
+        call, backend = client_backend(client), args.base_url if not server else "stand-in"
+    else:
+        call, backend = local_backend(), "local"
+
+    scenarios = select(args.suite, args.only)
+    print(f"--- Enchan Regression Suite ---")
+    print(f"Backend      : {backend}")
+    print(f"Scenarios    : {len(scenarios)} ({args.suite}), {args.repeats} runs + {args.warmup} warm-up each")
+    print("-" * 60)
+
+    progress = lambda name, st: print(f" [{name}] p50 {st['p50']:.3f}s", flush=True)
+    try:
+        report = run_suite(scenarios, call, backend, args.repeats, args.warmup, not args.no_memory,
+                           progress=progress)
+    finally:
+        if client:
+            client.close()
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    print("-" * 60)
+    print(format_run(report))
+    comparison = None
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        comparison = compare(report, baseline, args.threshold, args.memory_threshold, args.allow_drift,
+                             args.alpha)
+        print("-" * 60)
+        print(f"Baseline     : {args.baseline} ({baseline['created']}, {baseline['env']['backend']})")
+        if not comparison["env_match"]:
+            print("Note         : environment differs from the baseline; latency ratios include that change")
+        print(format_comparison(comparison))
+        print("-" * 60)
+        verdict = "FAILED (" + ", ".join(comparison["failed"]) + ")" if comparison["failed"] else "PASSED"
+        print(f" [REGRESSION]  {verdict} at ±{args.threshold * 100:.0f}%")
+    if args.save:
+        save_baseline(args.save, report)
+        print(f" [BASELINE]    saved to {args.save}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"run": report, "comparison": comparison}, f, indent=2)
+    if comparison and comparison["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client.trace import compare, format_summary, load_jsonl, summarize, write_chrome
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Summarize or convert per-phase timing traces (JSON lines).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    summary = sub.add_parser("summary", help="Aggregate spans per phase across runs")
+    summary.add_argument("traces", nargs="+", help="JSON-lines trace file(s)")
+    summary.add_argument("--baseline", nargs="+", help="Trace file(s) to compare against, phase by phase")
+    summary.add_argument("--json", help="Also write the summary to this JSON file")
+
+    chrome = sub.add_parser("chrome", help="Convert to a Chrome trace-event file (chrome://tracing, Perfetto)")
+    chrome.add_argument("traces", nargs="+", help="JSON-lines trace file(s)")
+    chrome.add_argument("-o", "--output", required=True, help="Output .json file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    records = load_jsonl(*args.traces)
+    if args.command == "chrome":
+        write_chrome(records, args.output)
+        print(f"Wrote {len(records)} spans to {args.output}")
+        return
+
+    summary = summarize(records)
+    baseline = summarize(load_jsonl(*args.baseline)) if args.baseline else None
+    print(f"--- Enchan Trace Summary ---")
+    print(format_summary(summary, baseline))
+    if args.json:
+        report = dict(summary, baseline=compare(summary, baseline) if baseline else None)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import MAX_NODES, AsyncEnchanClient, tsp_payload
+from enchan_client.audit import audit_tour
+from enchan_client.tsp import solve_tsp_local
+from enchan_client.tsp_decompose import solve_tsp_decomposed_async
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Cluster / solve / stitch / refine TSP beyond one /v1/tsp call.")
+    parser.add_argument("--base-url", help="API base URL (default: local reference solver)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Client rate limit in req/s (0 = off)")
+    parser.add_argument("--cities", type=int, default=20000, help="Random cities (ignored with --request)")
+    parser.add_argument("--request", help="Request JSON with `cities` as [[lat, lon], ...]")
+    parser.add_argument("--cluster-size", type=int, default=MAX_NODES, help="Max cities per cluster")
+    parser.add_argument("--method", choices=["kmeans", "grid"], default="kmeans")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--time-limit", type=float, help="Cap on the final refinement pass in seconds")
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the single-call comparison")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+async def single_call(coords, client):
+    start = time.perf_counter()
+    payload = tsp_payload(coords)
+    if client is not None:
+        res = await client.tsp(payload)
+    else:
+        res = await asyncio.get_running_loop().run_in_executor(None, solve_tsp_local, payload)
+    return res, time.perf_counter() - start
+
+
+async def main():
+    args = parse_args()
+    if args.request:
+        with open(args.request, "r", encoding="utf-8") as f:
+            coords = np.asarray(json.load(f)["cities"], dtype=np.float64)
+    else:
+        rng = np.random.default_rng(args.seed)
+        coords = np.column_stack([rng.uniform(30.0, 45.0, args.cities), rng.uniform(130.0, 145.0, args.cities)])
+
+    print(f"--- Enchan TSP Spatial Decomposition ---")
+    print(f"Cities       : {len(coords):,} (clusters of <= {args.cluster_size:,}, {args.method})")
+    print(f"Backend      : {args.base_url or 'local reference solver'}")
+    print("-" * 60)
+
+    client = None
+    if args.base_url:
+        client = AsyncEnchanClient(args.base_url, rate=args.rate or None, burst=args.concurrency,
+                                   pool_size=args.concurrency)
+    try:
+        result = await solve_tsp_decomposed_async(coords, client, max_size=args.cluster_size, method=args.method,
+                                                  concurrency=args.concurrency, time_limit=args.time_limit)
+        baseline = None
+        if len(coords) <= MAX_NODES and not args.no_baseline:
+            baseline = await single_call(coords, client)
+    finally:
+        if client:
+            client.close()
+
+    report = result["report"]
+    audit = audit_tour(coords, result)
+    print(f" [CLUSTERS]    {report['clusters']} of {report['min_cluster']:,}-{report['max_cluster']:,} cities "
+          f"({report['cluster_time']:.3f}s)")
+    print(f" [SOLVE]       {report['solve_time']:.3f}s at concurrency {report['concurrency']}"
+          + (f" ({report['invalid_subtours']} invalid replies replaced)" if report["invalid_subtours"] else ""))
+    print(f" [STITCH]      {report['stitched_distance']:,.1f} km ({report['stitch_time']:.3f}s)")
+    print(f" [REFINE]      {report['distance']:,.1f} km, {report['refine_moves']:,} moves "
+          f"({report['refine_time']:.3f}s)")
+    print(f" [AUDIT]       {'PASSED' if audit['ok'] else 'FAILED'}")
+    print(f" [WALL]        {report['wall_time']:.3f}s")
+    if baseline is not None:
+        res, wall = baseline
+        single = float(res["outputs"]["distance"])
+        report["baseline"] = {"distance": single, "wall_time": wall}
+        print("-" * 60)
+        print(f" [SINGLE]      {single:,.1f} km in {wall:.3f}s")
+        print(f" [RATIO]       distance x{report['distance'] / single:.4f}, "
+              f"wall x{report['wall_time'] / wall:.2f} vs one call")
+    elif not args.no_baseline:
+        print(f" [SINGLE]      n/a ({len(coords):,} cities exceed the {MAX_NODES:,}-city cap)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client.audit import audit_tour, format_audit
+from enchan_client.tsp import cKDTree, refine_tour, space_filling_tour
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verify and polish large TSP tours with k-NN 2-opt / Or-opt.")
+    parser.add_argument("--cities", type=int, default=10000, help="Random cities (ignored with --response)")
+    parser.add_argument("--response", help="Saved /v1/tsp response JSON; its request body via --request")
+    parser.add_argument("--request", help="Request JSON with `cities` matching --response")
+    parser.add_argument("--k", type=int, default=8, help="Candidate neighbours per city")
+    parser.add_argument("--passes", type=int, default=50)
+    parser.add_argument("--time-limit", type=float, help="Stop refining after this many seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.response:
+        with open(args.request, "r", encoding="utf-8") as f:
+            coords = np.asarray(json.load(f)["cities"], dtype=np.float64)
+        with open(args.response, "r", encoding="utf-8") as f:
+            response = json.load(f)
+        source = args.response
+    else:
+        rng = np.random.default_rng(args.seed)
+        coords = np.column_stack([rng.uniform(30.0, 45.0, args.cities), rng.uniform(130.0, 145.0, args.cities)])
+        start = time.perf_counter()
+        order = space_filling_tour(coords)
+        response = {"outputs": {"order": order.tolist() + order[:1].tolist()}}
+        source = f"Hilbert-curve tour ({(time.perf_counter() - start) * 1e3:.1f} ms)"
+
+    print(f"--- Enchan TSP Verify & Polish ---")
+    print(f"Cities       : {len(coords):,}")
+    print(f"Tour         : {source}")
+    print(f"Candidates   : k={args.k} via {'cKDTree' if cKDTree is not None else 'brute force (install scipy)'}")
+    print("-" * 60)
+
+    audit = audit_tour(coords, response)
+    print(f" [AUDIT]       {'PASSED' if audit['ok'] else 'FAILED'} {audit['distance']:,.1f} km "
+          f"({audit['audit_time'] * 1e3:.2f} ms)")
+    if not audit["ok"]:
+        print(format_audit(audit))
+        if not audit["checks"]["permutation"]["ok"]:
+            return
+
+    order, report = refine_tour(coords, response["outputs"]["order"], k=args.k, max_passes=args.passes,
+                                time_limit=args.time_limit)
+    final = audit_tour(coords, {"outputs": {"order": order}})
+    print(f" [POLISH]      {report['distance']:,.1f} km (-{report['improvement'] / report['initial_distance']:.2%})")
+    print(f" [MOVES]       {report['two_opt_moves']:,} 2-opt, {report['or_opt_moves']:,} Or-opt "
+          f"in {report['passes']} passes")
+    print(f" [TIME]        {report['refine_time']:.3f}s (k-NN {report['knn_time']:.3f}s)")
+    print(f" [RE-AUDIT]    {'PASSED' if final['ok'] else 'FAILED'}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
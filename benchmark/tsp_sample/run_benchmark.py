@@ -1,23 +1,25 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
-import requests
 import json
 import time
-import csv
 import os
-import hashlib
+import sys
 import math
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from enchan_client import DEFAULT_BASE_URL, EnchanClient, tsp_payload
+from enchan_client.audit import audit_tour, format_audit
+from enchan_client.cityio import load_cities
+from enchan_client.tsp import leg_distances, refine_tour
+
 # ==============================================================================
 # 1. GLOBAL CONFIGURATION
 # ==============================================================================
-API_URL = "https://enchan-api-82345546010.us-central1.run.app/v1/tsp"
-HEADERS = {"Content-Type": "application/json"}
+BASE_URL = DEFAULT_BASE_URL
 
 CSV_FILENAME = "jp_prefectures.csv"
 CSV_FILE = os.path.join(os.path.dirname(__file__), CSV_FILENAME)
-R_EARTH = 6371.0  # Earth radius in km
 
 # Enchan v5.3 Solver Parameters
 # K: Golden Ratio base resonance. Set to None for automatic optimization.
@@ -26,35 +28,11 @@ K = None
 # ==============================================================================
 # 2. CORE UTILITIES
 # ==============================================================================
-def get_file_hash(filepath):
-    """Integrity check: returns SHA256 hash of the dataset."""
-    sha256_hash = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
-
-def load_cities_from_csv(filepath):
-    """Loads geospatial coordinates from CSV."""
-    if not os.path.exists(filepath):
-        raise FileNotFoundError(f"Missing dataset: {filepath}")
-    names, coords_list = [], []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        next(reader)  # Skip header
-        for row in reader:
-            if len(row) < 3: continue
-            names.append(row[0].strip())
-            coords_list.append([float(row[1]), float(row[2])])
-    return names, np.array(coords_list)
-
-def haversine_distance(coord1, coord2):
-    """Calculates geodesic distance between two points."""
-    lat1, lon1 = np.radians(coord1)
-    lat2, lon2 = np.radians(coord2)
-    dlat, dlon = lat2 - lat1, lon2 - lon1
-    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
-    return R_EARTH * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+def load_dataset(filepath):
+    """Loads the dataset in one streaming pass; returns (SHA256, names, coords, load report)."""
+    table = load_cities(filepath)
+    source = "content-hash cache" if table.cached else "parsed"
+    return table.file_hash, table.names, table.coords, f"{table.load_time * 1e3:.1f} ms ({source})"
 
 # ==============================================================================
 # 3. BENCHMARK EXECUTION
@@ -63,8 +41,7 @@ def run_benchmark():
     """Executes the Enchan Earth TSP Benchmark."""
     print(f"--- Enchan Earth Benchmark: Japan TSP ---")
     try:
-        file_hash = get_file_hash(CSV_FILE)
-        city_names, coords = load_cities_from_csv(CSV_FILE)
+        file_hash, city_names, coords, load_report = load_dataset(CSV_FILE)
     except Exception as e:
         print(f"[Critical Error] Failed to initialize: {e}")
         return
@@ -72,25 +49,19 @@ def run_benchmark():
     N = len(city_names)
     print(f"Dataset Hash : {file_hash[:16]}... (SHA256)")
     print(f"Nodes        : {N} locations")
+    print(f"Load         : {load_report}")
     print("-" * 60)
     
-    payload = {
-        "cities": coords.tolist(),
-        "use_earth_metric": True,
-        "seed": 314,
-        "K": K,
-        "industrial_strict": True,
-        "use_2opt": True
-    }
-
-    print(f"Requesting Solution from {API_URL}...")
+    payload = tsp_payload(coords.tolist(), use_earth_metric=True, seed=314, K=K,
+                          industrial_strict=True, use_2opt=True)
+
+    print(f"Requesting Solution from {BASE_URL}/tsp...")
     start_wall = time.time()
 
     try:
-        response = requests.post(API_URL, headers=HEADERS, json=payload, timeout=60)
-        response.raise_for_status()
+        with EnchanClient(BASE_URL, timeout=60) as client:
+            result = client.tsp(payload)
         end_wall = time.time()
-        result = response.json()
     except Exception as e:
         print(f"\n[API ERROR] Transmission failed: {e}")
         return
@@ -135,20 +106,29 @@ def run_benchmark():
 
     print("-" * 55)
 
-    # Path Verification
-    local_distance = 0.0
-    for i in range(len(order) - 1):
-        local_distance += haversine_distance(coords[order[i]], coords[order[i+1]])
+    # Path Verification (vectorized haversine over every leg)
+    audit = audit_tour(coords, result)
+    local_distance = audit["distance"]
+    legs = leg_distances(coords, order) if len(order) > 1 else np.zeros(0)
 
     print(f" [RESULT]      Total Path Distance: {local_distance:.1f} km")
+    print(f" [AUDIT]       {'PASSED' if audit['ok'] else 'FAILED'} ({audit['audit_time'] * 1e3:.2f} ms)")
+    if not audit["ok"]:
+        print(format_audit(audit))
+
+    # Local polish (k-NN 2-opt / Or-opt) as a quality reference for the returned order
+    if audit["checks"]["permutation"]["ok"]:
+        _, polish = refine_tour(coords, order)
+        gap = polish["improvement"] / local_distance * 100 if local_distance > 0 else 0.0
+        print(f" [POLISH]      {polish['distance']:.1f} km (-{gap:.2f}%, {polish['two_opt_moves']} 2-opt / "
+              f"{polish['or_opt_moves']} Or-opt moves, {polish['refine_time'] * 1e3:.1f} ms)")
     print("═" * 55 + "\n")
 
     # Itinerary Output
     print("--- Optimal Route Itinerary ---")
     print(f"{'Step':<5} | {'City Name':<12} | {'Leg Dist'}")
     print("-" * 35)
-    for i in range(len(order) - 1):
-        d = haversine_distance(coords[order[i]], coords[order[i+1]])
+    for i, d in enumerate(legs):
         print(f" {i+1:<4} | {city_names[order[i]]:<12} | +{d:6.1f} km")
     print(f" GOAL  | {city_names[order[-1]]:<12} | (Terminus)")
     print("-" * 35 + "\n")
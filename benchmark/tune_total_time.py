@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import AsyncEnchanClient, solve_payload
+from enchan_client.graph import generate_random_graph
+from enchan_client.tuning import DEFAULT_DURATIONS, TuningStore, tune_workload
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Successive-halving sweep of control.total_time per graph class.")
+    parser.add_argument("--base-url", help="API base URL (default: local reference kernel)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Client rate limit in req/s (0 = off)")
+    parser.add_argument("--nodes", default="500,2000", help="Comma-separated graph sizes of the workload")
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--graphs", type=int, default=4, help="Graphs per size")
+    parser.add_argument("--seeds", default="42,777,314", help="Comma-separated solve seeds")
+    parser.add_argument("--durations", default=",".join(str(d) for d in DEFAULT_DURATIONS))
+    parser.add_argument("--tol", type=float, default=0.005, help="Allowed relative cut loss vs the best duration")
+    parser.add_argument("--store", help="Recommendation file (default: ENCHAN_TUNING_FILE or ~/.cache/enchan)")
+    parser.add_argument("--no-save", action="store_true", help="Print recommendations without persisting them")
+    parser.add_argument("--json", help="Also write the full report to this JSON file")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    payloads = []
+    for n in (int(x) for x in args.nodes.split(",")):
+        for g in range(args.graphs):
+            u, v, _ = generate_random_graph(n, args.density, 1000 + g)
+            payloads.append(solve_payload(n, np.column_stack([u, v]).tolist()))
+
+    print(f"--- Enchan total_time Tuner ---")
+    print(f"Workload     : {len(payloads)} graphs x {len(args.seeds.split(','))} seeds, tol={args.tol:.2%}")
+    print(f"Backend      : {args.base_url or 'local reference kernel'}")
+    print("-" * 60)
+
+    client = None
+    if args.base_url:
+        client = AsyncEnchanClient(args.base_url, rate=args.rate or None, burst=2, pool_size=4)
+    try:
+        reports = await tune_workload(payloads, client, tol=args.tol,
+                                      durations=[float(d) for d in args.durations.split(",")],
+                                      seeds=[int(s) for s in args.seeds.split(",")])
+    finally:
+        if client:
+            client.close()
+
+    for key, r in reports.items():
+        print(f" [{key}]")
+        print("    " + "  ".join(f"{c['total_time']:g}s:{c['relative_cut']:.4f}" for c in r["curve"]))
+        for rd in r["rounds"]:
+            print(f"    round  {rd['samples']:>3} samples  {len(rd['candidates']):>2} candidates  "
+                  f"converged from {rd['converged'][0]:g}s")
+        print(f"    -> total_time {r['total_time']:g}s (saves {r['saved_per_solve']:g}s per solve; "
+              f"sweep used {r['compute_seconds']:,.0f} of {r['grid_compute_seconds']:,.0f} grid seconds)")
+    print("-" * 60)
+    if not args.no_save:
+        store = TuningStore(args.store).update(reports)
+        store.save()
+        print(f" [SAVED]       {store.path}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
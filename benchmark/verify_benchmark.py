@@ -1,36 +1,48 @@
-import requests
+import argparse
+import os
+import sys
 import time
 
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from enchan_client import DEFAULT_BASE_URL, CachedClient, EnchanClient, default_cache, encode_solve_json, solve_payload
+from enchan_client.corpus import corpus_graph
+from enchan_client.trace import Tracer, format_phases, set_tracer
+
 # --- Configuration ---
-API_URL = "https://enchan-api-82345546010.us-central1.run.app/v1/solve"
+BASE_URL = DEFAULT_BASE_URL
+
+def run_benchmark(explicit=False, trace=None, cache=False):
+    # Per-phase spans split the round trip below (encode / connect / upload / server / download / decode)
+    tracer = Tracer(source="verify_benchmark")
+    set_tracer(tracer)
 
-def run_benchmark():
     # Parameters for Server-Side Graph Generation
     N = 2000
     DENSITY = 0.005  # ≈ 10,000 edges
+    TOTAL_TIME = 35.0
 
-    payload = {
-        "graph": {"N": N, "density": DENSITY},
-        "control": {"total_time": 35.0},
-        "seed": 42
-    }
-
-    print(f"1. Triggering Server-Side Generation (N={N}, density={DENSITY})...")
+    if explicit:
+        # Same G(N, p) instance from the local corpus, sent as an edge list any backend can reproduce
+        g, meta = corpus_graph("er", N, seed=42, density=DENSITY)
+        payload = encode_solve_json(g.N, g.u, g.v, total_time=TOTAL_TIME, seed=42)
+        print(f"1. Sending corpus instance {meta['name']} ({g.E:,} edges, {meta['load_time'] * 1e3:.1f} ms load)...")
+    else:
+        payload = solve_payload(N, density=DENSITY, total_time=TOTAL_TIME, seed=42)
+        print(f"1. Triggering Server-Side Generation (N={N}, density={DENSITY})...")
     start_wall = time.time()
 
     try:
         # Public preview: no authentication required
-        response = requests.post(API_URL, json=payload, timeout=60)
-        response.raise_for_status()
+        with CachedClient(EnchanClient(BASE_URL, timeout=60), default_cache() if cache else None) as client:
+            try:
+                data = client.solve(payload)
+            except ValueError:
+                print("[ERROR] Invalid JSON response from server.")
+                return
         end_wall = time.time()
 
-        try:
-            data = response.json()
-        except ValueError:
-            print("[ERROR] Invalid JSON response from server.")
-            print(response.text[:200])
-            return
-
         metrics = data.get("metrics", {})
         timing = data.get("TIMING", {})
         env = data.get("ENV", {}).get("runtime", {})
@@ -45,7 +57,7 @@ def run_benchmark():
         # --- 0. Problem Scale (Added) ---
         print(f" [NODES]       {N} nodes")
         print(f" [DENSITY]     {DENSITY*100:.2f}%")
-        print(f" [SIM TIME]    {payload['control']['total_time']:.1f} virtual sec")
+        print(f" [SIM TIME]    {TOTAL_TIME:.1f} virtual sec")
         print("-" * 55)
 
         # --- 1. System Environment Proof ---
@@ -57,9 +69,16 @@ def run_benchmark():
         print("-" * 55)
 
         # --- 2. Performance Metrics ---
-        print(f" [LATENCY]     {total_latency:.3f}s (Round Trip)")
-        print(f" [SOLVE TIME]  {pure_solve_time:.3f}s (Core Physics Engine)")
-        print(f" [OVERHEAD]    {total_latency - pure_solve_time:.3f}s (Network/Cold Start)")
+        if client.last_hit:
+            # A cache hit never reached the server, so round trip and overhead are meaningless
+            print(f" [LATENCY]     n/a (cached result, {total_latency:.3f}s local)")
+            print(f" [SOLVE TIME]  {pure_solve_time:.3f}s (Core Physics Engine, original run)")
+        else:
+            print(f" [LATENCY]     {total_latency:.3f}s (Round Trip)")
+            print(f" [SOLVE TIME]  {pure_solve_time:.3f}s (Core Physics Engine)")
+            print(f" [OVERHEAD]    {total_latency - pure_solve_time:.3f}s (Network/Cold Start)")
+        print(f" [PHASES]      {format_phases(tracer.records()) or 'n/a'}")
+        print(f" [CACHE]       {'HIT (served from local result cache)' if client.last_hit else 'MISS'}")
         print("-" * 55)
 
         # --- 3. Physics Results ---
@@ -70,6 +89,8 @@ def run_benchmark():
         print(f" [RESULT]      Max-Cut Score: {int(cut)}")
         print(f" [GAIN]        {gain:+.2f}% vs expected baseline")
         print("═" * 55 + "\n")
+        if trace:
+            tracer.write_jsonl(trace)
 
     except requests.exceptions.Timeout:
         print("\n[ERROR] Request timed out. Try reducing N or increasing timeout.")
@@ -77,4 +98,11 @@ def run_benchmark():
         print(f"\n[ERROR] Benchmark Failed: {e}")
 
 if __name__ == "__main__":
-    run_benchmark()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Enchan solve benchmark (N=2000, density 0.5%).")
+    parser.add_argument("--explicit", action="store_true",
+                        help="Send the cached corpus edge list instead of server-side density generation")
+    parser.add_argument("--trace", help="Append per-phase timing spans to this JSON-lines file")
+    parser.add_argument("--cache", action="store_true",
+                        help="Serve repeated runs from the local result cache (no latency measurement on a hit)")
+    args = parser.parse_args()
+    run_benchmark(args.explicit, args.trace, args.cache)
\ No newline at end of file
@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shell")))
+from enc_engine import EncEngine
+from enchan_client import solve_local
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Edit-run turnaround of the shell engine: warm vs cold re-solves.")
+    parser.add_argument("--nodes", type=int, default=400)
+    parser.add_argument("--degree", type=int, default=6, help="Average couplings per node")
+    parser.add_argument("--edits", type=int, default=5, help="Edit-run iterations")
+    parser.add_argument("--edit-size", type=int, default=8, help="Edges changed or added per edit")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def make_program(n, degree, rng):
+    lines = [f"node {i} {rng.choice((-1.0, 1.0))}" for i in range(0, n, 8)]
+    for _ in range(n * degree // 2):
+        i, j = rng.sample(range(n), 2)
+        lines.append(f"edge {i} {j} {rng.choice((-1.0, 1.0))}")
+    return "\n".join(lines)
+
+
+def make_edit(n, size, rng):
+    """A few coupling changes plus one new node wired into the program."""
+    lines = []
+    for _ in range(size - 2):
+        i, j = rng.sample(range(n), 2)
+        lines.append(f"edge {i} {j} {rng.choice((-1.0, 1.0))}")
+    lines.append(f"edge {n} {rng.randrange(n)} -1.0")
+    lines.append(f"edge {n} {rng.randrange(n)} 1.0")
+    return lines
+
+
+def make_engine(warm):
+    timing = {}
+
+    async def solve(body):
+        start = time.perf_counter()
+        res = await asyncio.get_running_loop().run_in_executor(None, solve_local, json.loads(body))
+        timing["solve"] = time.perf_counter() - start
+        timing["cut"] = res["metrics"]["cut"]
+        return res
+
+    engine = EncEngine(solve=solve)
+    engine.warm = warm
+    engine.warm_backend = True
+    original = engine.build_payload
+
+    def build_payload(duration, init=None):
+        start = time.perf_counter()
+        body = original(duration, init)
+        timing.update(encode=time.perf_counter() - start, duration=duration, bytes=len(body))
+        return body
+
+    engine.build_payload = build_payload
+    return engine, timing
+
+
+async def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    program = make_program(args.nodes, args.degree, rng)
+    edits = [make_edit(args.nodes + k, args.edit_size, rng) for k in range(args.edits)]
+
+    print(f"--- Enchan Warm-Start Edit Loop ---")
+    print(f"Program      : N={args.nodes:,}, {args.edits} edits x {args.edit_size} lines")
+    print("-" * 60)
+
+    report = {}
+    for mode in ("cold", "warm"):
+        engine, timing = make_engine(mode == "warm")
+        await engine.run_script(program, bulk=True)
+        await engine.execute("run", echo=False)
+        rows = []
+        for lines in edits:
+            start = time.perf_counter()
+            for line in lines:
+                await engine.execute(line, echo=False)
+            await engine.execute("run", echo=False)
+            rows.append(dict(timing, turnaround=time.perf_counter() - start))
+        report[mode] = rows
+        mean = lambda key: sum(r[key] for r in rows) / len(rows)
+        print(f" [{mode.upper()}]        t={rows[-1]['duration']}s  encode {mean('encode') * 1e3:.2f} ms  "
+              f"solve {mean('solve'):.3f}s  turnaround {mean('turnaround'):.3f}s  "
+              f"cut {mean('cut'):,.1f}")
+
+    cold = sum(r["turnaround"] for r in report["cold"])
+    warm = sum(r["turnaround"] for r in report["warm"])
+    print("-" * 60)
+    print(f" [SPEEDUP]     {cold / warm:.2f}x per edit-run iteration")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+"""Enchan client toolkit: local reference kernel and helpers for the Enchan API."""
+from .cache import CachedClient, ResultCache, default_cache, request_key
+from .client import (
+    DEFAULT_BASE_URL,
+    PUBLIC_BASE_URL,
+    AsyncEnchanClient,
+    EnchanAPIError,
+    EnchanClient,
+    make_session,
+)
+from .edgeio import EdgeList, load_edges
+from .graph import MAX_NODES, GraphHasher, build_csr, graph_hash, normalize_graph
+from .kernel import solve_local
+from .payloads import encode_solve_json, solve_payload, tsp_payload
+from .ratelimit import TokenBucket, backoff_delay
+
+__all__ = [
+    "DEFAULT_BASE_URL",
+    "MAX_NODES",
+    "PUBLIC_BASE_URL",
+    "AsyncEnchanClient",
+    "CachedClient",
+    "EdgeList",
+    "EnchanAPIError",
+    "EnchanClient",
+    "GraphHasher",
+    "ResultCache",
+    "TokenBucket",
+    "backoff_delay",
+    "build_csr",
+    "default_cache",
+    "encode_solve_json",
+    "graph_hash",
+    "load_edges",
+    "make_session",
+    "normalize_graph",
+    "request_key",
+    "solve_local",
+    "solve_payload",
+    "tsp_payload",
+]
@@ -0,0 +1,210 @@
+"""Content-addressed result cache for deterministic Enchan API calls.
+
+The engine is deterministic (same graph, seed and control -> same S-HASH), so
+a response can be reused whenever the canonical request key matches. Keys are
+built from the canonical graph hash rather than the raw JSON, so edge order and
+list formatting do not cause misses.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .graph import graph_hash, normalize_graph
+
+CACHE_VERSION = "enchan-cache-v1"
+
+
+# ==========================================
+# Canonical Keys
+# ==========================================
+def _array_hash(values, dtype):
+    return hashlib.sha256(np.ascontiguousarray(values, dtype=dtype).tobytes()).hexdigest()
+
+
+def graph_key(graph, seed=None):
+    """Canonical identity of a `graph` object (edge-list hash or generator params)."""
+    edges = graph.get("edges")
+    if edges is None or len(edges) == 0:
+        if graph.get("graph_hash"):
+            return {"N": int(graph["N"]), "graph_hash": graph["graph_hash"]}
+        if graph.get("density"):
+            return {"N": int(graph["N"]), "density": float(graph["density"]), "seed": seed}
+    N, u, v, w = normalize_graph(graph)
+    return {"N": N, "graph_hash": graph_hash(N, u, v, w)}
+
+
+def request_key(endpoint, payload, namespace=""):
+    """Hex key for an API call; `namespace` separates backends (e.g. the base URL)."""
+    endpoint = endpoint.strip("/")
+    if isinstance(payload, (bytes, bytearray)):
+        ident = hashlib.sha256(payload).hexdigest()
+    elif endpoint == "tsp":
+        ident = {k: v for k, v in payload.items() if k != "cities"}
+        ident["cities"] = _array_hash(payload.get("cities") or [], "<f8")
+    else:
+        seed = payload.get("seed")
+        ident = {
+            "graph": graph_key(payload.get("graph") or {}, seed),
+            "control": payload.get("control") or {},
+            "seed": seed,
+        }
+        if payload.get("initial_state") is not None:
+            ident["initial_state"] = _array_hash(payload["initial_state"], "<f8")
+    blob = json.dumps([CACHE_VERSION, namespace, endpoint, ident], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ==========================================
+# Storage
+# ==========================================
+def default_cache_dir():
+    return os.environ.get("ENCHAN_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "enchan"))
+
+
+class ResultCache:
+    """Two-level LRU cache: bounded in-memory entries plus a size-bounded disk store.
+
+    Disk entries are gzip-compressed JSON files named by key; their mtime is
+    refreshed on every hit so eviction drops the least recently used first.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=256 * 1024 * 1024,
+                 directory=None, disk_max_bytes=2 * 1024 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._mem = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def _remember(self, key, blob, value):
+        with self._lock:
+            if key in self._mem:
+                self._mem_bytes -= self._mem.pop(key)[0]
+            self._mem[key] = (len(blob), value)
+            self._mem_bytes += len(blob)
+            while self._mem and (len(self._mem) > self.max_entries or self._mem_bytes > self.max_bytes):
+                self._mem_bytes -= self._mem.popitem(last=False)[1][0]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    blob = f.read()
+                value = json.loads(gzip.decompress(blob))
+                os.utime(path)
+            except (OSError, ValueError):
+                pass
+            else:
+                self._remember(key, blob, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        blob = gzip.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), compresslevel=3)
+        self._remember(key, blob, value)
+        if self.directory:
+            tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self._path(key))
+            self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json.gz"):
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json.gz"):
+                    os.remove(os.path.join(self.directory, name))
+
+
+def default_cache():
+    """Disk-backed cache under ENCHAN_CACHE_DIR, or None when ENCHAN_CACHE=off."""
+    if os.environ.get("ENCHAN_CACHE", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    return ResultCache(directory=default_cache_dir())
+
+
+class CachedClient:
+    """Wraps an EnchanClient so deterministic calls are served from a ResultCache."""
+
+    def __init__(self, client, cache=None):
+        self.client = client
+        self.cache = cache
+        self.last_hit = False
+
+    def post(self, endpoint, payload):
+        if self.cache is None:
+            self.last_hit = False
+            return self.client.post(endpoint, payload)
+        # Key on the duration actually sent, not on "auto"
+        payload = self.client._prepare(payload)
+        key = request_key(endpoint, payload, namespace=self.client.base_url)
+        cached = self.cache.get(key)
+        self.last_hit = cached is not None
+        if cached is not None:
+            return cached
+        result = self.client.post(endpoint, payload)
+        self.cache.put(key, result)
+        return result
+
+    def solve(self, payload):
+        return self.post("solve", payload)
+
+    def scan_resonance(self, payload):
+        return self.post("scan_resonance", payload)
+
+    def tsp(self, payload):
+        return self.post("tsp", payload)
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,274 @@
+"""Single-pass city dataset ingestion into float64 coordinate columns.
+
+CSV files (`name,lat,lon` or `lat,lon` per line, optional header) are read in
+fixed-size chunks. Each chunk updates the file's SHA256; name columns and
+commas are then masked out with vectorized byte operations and the remaining
+numbers are parsed by NumPy in one call into a preallocated (2, n)
+latitude/longitude buffer, so no per-row Python objects are created. Names
+are kept as one byte blob with offsets and decoded only when asked for. Binary inputs (`.npy` of
+shape (n, 2), raw little-endian float64 pairs) are memory-mapped instead.
+
+Parsed CSVs are cached as `.npy` files named by content hash. A small stat
+index (path, size, mtime) lets an unchanged file skip hashing and parsing
+entirely and load as a memory map.
+"""
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from .cache import default_cache_dir
+from .edgeio import CHUNK_BYTES, iter_text_chunks
+
+BINARY_SUFFIXES = (".f64", ".bin")
+CITY_CACHE_VERSION = 1
+
+
+class CityTable:
+    """Parsed city set: (n, 2) float64 `[lat, lon]` coords, content hash and optional names."""
+
+    def __init__(self, coords, file_hash, name_blob=None, name_offsets=None, source=None, cached=False):
+        self.coords = coords
+        self.file_hash = file_hash
+        self._name_blob = name_blob
+        self._name_offsets = name_offsets
+        self._names = None
+        self.source = source
+        self.cached = cached
+        self.load_time = 0.0
+
+    def __len__(self):
+        return len(self.coords)
+
+    @property
+    def lat(self):
+        return self.coords[:, 0]
+
+    @property
+    def lon(self):
+        return self.coords[:, 1]
+
+    @property
+    def names(self):
+        """Row names as strings (row numbers when the file has no name column)."""
+        if self._names is None:
+            if self._name_blob is None:
+                self._names = [str(i) for i in range(len(self))]
+            else:
+                blob, off = self._name_blob.tobytes(), self._name_offsets.tolist()
+                self._names = [blob[a:b].decode("utf-8").strip() for a, b in zip(off[:-1], off[1:])]
+        return self._names
+
+
+# ==========================================
+# Vectorized Text Parsing
+# ==========================================
+def _line_ranges(b):
+    nl = np.flatnonzero(b == 10)
+    starts = np.concatenate([[0], nl + 1])
+    return starts[starts < len(b)]
+
+
+def _gather_ranges(starts, lengths):
+    """Concatenated byte indices of [start, start + length) ranges."""
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.arange(total) - np.repeat(np.cumsum(lengths) - lengths - starts, lengths)
+
+
+def parse_city_chunk(chunk, ncols):
+    """Parses complete CSV lines into ((k, 2) coords, name bytes, name lengths)."""
+    b = np.frombuffer(chunk, dtype=np.uint8).copy()
+    starts = _line_ranges(b)
+    commas = np.flatnonzero(b == 44)
+    line = np.searchsorted(starts, commas, side="right") - 1
+    per_line = np.bincount(line, minlength=len(starts))
+    rows = per_line > 0
+    if np.any(per_line[rows] != ncols - 1):
+        raise ValueError(f"Expected {ncols} comma-separated columns on every line.")
+    names = lengths = None
+    if ncols == 3:
+        first = commas[np.searchsorted(line, np.flatnonzero(rows))]
+        lengths = first - starts[rows]
+        idx = _gather_ranges(starts[rows], lengths)
+        names = b[idx].copy()
+        b[idx] = 32
+    b[commas] = 32
+    # Only numbers and whitespace are left: one C-level parse for the whole chunk
+    values = np.fromstring(b.tobytes(), dtype=np.float64, sep=" ") if rows.any() else np.zeros(0)
+    if len(values) != 2 * int(rows.sum()):
+        raise ValueError("Malformed city file: every row needs a latitude and a longitude.")
+    return values.reshape(-1, 2), names, lengths
+
+
+def _split_header(chunk):
+    """(ncols, chunk without a header line) from the first chunk of a CSV."""
+    body = chunk
+    while body:
+        cut = body.find(b"\n")
+        line, rest = (body, b"") if cut < 0 else (body[:cut], body[cut + 1:])
+        if line.strip():
+            fields = line.split(b",")
+            try:
+                [float(f) for f in fields[-2:]]
+            except ValueError:
+                return len(fields), rest
+            return len(fields), body
+        body = rest
+    return 2, body
+
+
+# ==========================================
+# Loading
+# ==========================================
+def load_csv_cities(path, use_mmap=False, chunk_bytes=CHUNK_BYTES):
+    """Streams a CSV into a CityTable, hashing and parsing in the same pass."""
+    size = os.path.getsize(path)
+    buf = np.empty((2, max(1024, size // 12)), dtype=np.float64)
+    hasher = hashlib.sha256()
+    names, lengths = [], []
+    n, ncols = 0, None
+    for chunk in iter_text_chunks(path, chunk_bytes, use_mmap):
+        hasher.update(chunk)
+        if ncols is None:
+            ncols, chunk = _split_header(bytes(chunk))
+            if ncols not in (2, 3):
+                raise ValueError(f"Expected `name,lat,lon` or `lat,lon` columns, found {ncols}.")
+        values, nb, nl = parse_city_chunk(chunk, ncols)
+        k = len(values)
+        if n + k > buf.shape[1]:
+            grown = np.empty((2, max(n + k, 2 * buf.shape[1])), dtype=np.float64)
+            grown[:, :n] = buf[:, :n]
+            buf = grown
+        buf[:, n:n + k] = values.T
+        n += k
+        if nb is not None:
+            names.append(nb)
+            lengths.append(nl)
+    blob = offsets = None
+    if names:
+        blob = np.concatenate(names)
+        offsets = np.concatenate([[0], np.cumsum(np.concatenate(lengths))]).astype(np.int64)
+    return CityTable(buf[:, :n].T, hasher.hexdigest(), blob, offsets, source=path)
+
+
+def _hash_file(path, chunk_bytes=CHUNK_BYTES):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_bytes), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def load_binary_cities(path):
+    """Memory-maps `.npy` (n, 2) or raw little-endian float64 `[lat, lon]` pairs."""
+    if path.lower().endswith(".npy"):
+        coords = np.load(path, mmap_mode="r")
+        if coords.ndim != 2 or coords.shape[1] != 2:
+            raise ValueError("Coordinate arrays must have shape (n, 2).")
+    else:
+        coords = np.memmap(path, dtype="<f8", mode="r").reshape(-1, 2)
+    return CityTable(coords, _hash_file(path), source=path)
+
+
+# ==========================================
+# Content-Hash Cache
+# ==========================================
+def default_city_cache_dir():
+    """`cities/` under the result cache directory, or None when ENCHAN_CACHE=off."""
+    if os.environ.get("ENCHAN_CACHE", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    return os.path.join(default_cache_dir(), "cities")
+
+
+def _write_atomic(path, save):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        save(f)
+    os.replace(tmp, path)
+
+
+class CityCache:
+    """Parsed CSVs as `<sha256>.npy` (+ `<sha256>.names.npz`), with a stat index to skip re-hashing."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+
+    def _index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get("files", {}) if data.get("version") == CITY_CACHE_VERSION else {}
+
+    @staticmethod
+    def _stat(path):
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+
+    def lookup(self, path):
+        """Cached table for an unchanged file, else None."""
+        entry = self._index().get(os.path.abspath(path))
+        if not entry or entry["stat"] != self._stat(path):
+            return None
+        base = os.path.join(self.directory, entry["hash"])
+        if not os.path.exists(f"{base}.npy"):
+            return None
+        blob = offsets = None
+        if os.path.exists(f"{base}.names.npz"):
+            with np.load(f"{base}.names.npz") as data:
+                blob, offsets = data["blob"], data["offsets"]
+        return CityTable(np.load(f"{base}.npy", mmap_mode="r"), entry["hash"], blob, offsets,
+                         source=path, cached=True)
+
+    def store(self, path, table):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, table.file_hash)
+        if not os.path.exists(f"{base}.npy"):
+            coords = np.ascontiguousarray(table.coords)
+            _write_atomic(f"{base}.npy", lambda f: np.save(f, coords))
+            if table._name_blob is not None:
+                _write_atomic(f"{base}.names.npz", lambda f: np.savez(f, blob=table._name_blob,
+                                                                     offsets=table._name_offsets))
+        index = self._index()
+        index[os.path.abspath(path)] = {"stat": self._stat(path), "hash": table.file_hash}
+        _write_atomic(self.index_path, lambda f: f.write(
+            json.dumps({"version": CITY_CACHE_VERSION, "files": index}, indent=1).encode("utf-8")))
+
+
+def load_cities(path, cache=None, use_mmap=False, chunk_bytes=CHUNK_BYTES):
+    """Loads a city file into a CityTable; dispatches on the file suffix.
+
+    `cache` is a CityCache, False to disable, or None for the default
+    (`~/.cache/enchan/cities`, off with ENCHAN_CACHE=off). Binary files are
+    never cached since they already load as memory maps.
+    """
+    start = time.perf_counter()
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Missing dataset: {path}")
+    if path.lower().endswith((".npy",) + BINARY_SUFFIXES):
+        table = load_binary_cities(path)
+    else:
+        if cache is None:
+            directory = default_city_cache_dir()
+            cache = CityCache(directory) if directory else False
+        table = cache.lookup(path) if cache else None
+        if table is None:
+            table = load_csv_cities(path, use_mmap, chunk_bytes)
+            if cache:
+                try:
+                    cache.store(path, table)
+                except OSError:
+                    pass  # a read-only cache dir must not break loading
+    table.load_time = time.perf_counter() - start
+    return table
+
+
+def save_binary_cities(path, coords):
+    """Writes raw little-endian float64 `[lat, lon]` pairs readable by `load_cities`."""
+    np.ascontiguousarray(coords, dtype="<f8").tofile(path)
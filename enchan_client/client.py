@@ -0,0 +1,263 @@
+"""Connection-pooled sync and asyncio clients for the Enchan API."""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .ratelimit import TokenBucket, backoff_delay
+from .trace import get_tracer
+from .tuning import resolve_total_time
+
+PUBLIC_BASE_URL = "https://enchan-api-82345546010.us-central1.run.app/v1"
+# Point every client at another deployment (e.g. a local stand-in) without code changes
+DEFAULT_BASE_URL = os.environ.get("ENCHAN_BASE_URL", PUBLIC_BASE_URL)
+
+# Statuses that mean "try again later"; anything else is returned or raised at once
+RETRY_STATUS = (429, 503)
+HEADERS = {"Content-Type": "application/json"}
+
+
+class EnchanAPIError(requests.exceptions.HTTPError):
+    """Non-200 response from the API, carrying the decoded error `detail`."""
+
+    def __init__(self, status_code, detail, response=None):
+        super().__init__(f"Error ({status_code}): {detail}", response=response)
+        self.status_code = status_code
+        self.detail = detail
+
+
+# ==========================================
+# Traced Connections
+# ==========================================
+class _TimedConnection:
+    """Records connect / upload / server (time to first byte) spans on the active tracer."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            get_tracer().add("connect", start, time.perf_counter(), host=self.host)
+
+    def request(self, *args, **kwargs):
+        if self.sock is None:
+            self.connect()  # http.client would connect lazily inside the upload
+        with get_tracer().span("upload"):
+            return super().request(*args, **kwargs)
+
+    def getresponse(self):
+        with get_tracer().span("server"):
+            return super().getresponse()
+
+
+class _TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TracedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools open timed connections (no-ops unless a tracer is active)."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
+
+
+def make_session(pool_size=8):
+    """Keep-alive session whose adapter pools up to `pool_size` connections per host."""
+    session = requests.Session()
+    adapter = TracedAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def _decode(response):
+    if response.status_code == 200:
+        with get_tracer().span("decode", endpoint=response.url.rsplit("/", 1)[-1]):
+            return response.json()
+    try:
+        detail = response.json().get("detail", response.text)
+    except ValueError:
+        detail = response.text
+    raise EnchanAPIError(response.status_code, detail, response=response)
+
+
+class EnchanClient:
+    """Synchronous client sharing one pooled session and one rate limiter.
+
+    Requests are paced by a token bucket (`rate` requests/s, `burst` tokens). A
+    429/503 drains the bucket for the server's Retry-After (or a jittered
+    exponential delay) before retrying, up to `max_retries` times.
+
+    `control.total_time = "auto"` is resolved from `tuning` (a TuningStore) per
+    graph class, falling back to 35.0.
+    """
+
+    def __init__(self, base_url=None, rate=1.0, burst=1, max_retries=5,
+                 timeout=300.0, pool_size=8, session=None, tuning=None):
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.tuning = tuning
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.session = session or make_session(pool_size)
+
+    def url(self, endpoint):
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def _send(self, url, payload):
+        """POSTs a dict as JSON, or pre-encoded bytes as-is (see `wire.EncodedPayload`).
+
+        The body is read before returning, so encode / upload / server /
+        download land in separate spans when a tracer is active.
+        """
+        tracer = get_tracer()
+        with tracer.scope(endpoint=url.rsplit("/", 1)[-1]):
+            if isinstance(payload, (bytes, bytearray)):
+                headers = {"Content-Type": getattr(payload, "content_type", HEADERS["Content-Type"])}
+                data = payload
+            else:
+                with tracer.span("encode") as args:
+                    data = json.dumps(payload, allow_nan=False).encode("utf-8")
+                    args["bytes"] = len(data)
+                headers = HEADERS
+            response = self.session.post(url, data=data, headers=headers, timeout=self.timeout, stream=True)
+            with tracer.span("download") as args:
+                args["bytes"] = len(response.content)
+        return response
+
+    def _prepare(self, payload):
+        if isinstance(payload, dict) and "graph" in payload:
+            return resolve_total_time(payload, self.tuning)
+        return payload
+
+    def _retry_delay(self, attempt, response=None):
+        """Seconds to wait before retrying, or None if the outcome is final."""
+        if attempt >= self.max_retries:
+            return None
+        if response is None:
+            return backoff_delay(attempt)
+        if response.status_code not in RETRY_STATUS:
+            return None
+        delay = backoff_delay(attempt, retry_after=response.headers.get("Retry-After"))
+        if self.bucket:
+            self.bucket.pause(delay)
+            return 0.0
+        return delay
+
+    def post(self, endpoint, payload):
+        url = self.url(endpoint)
+        payload = self._prepare(payload)
+        attempt = 0
+        while True:
+            wait = self.bucket.reserve() if self.bucket else 0.0
+            if wait > 0:
+                with get_tracer().span("throttle", reason="rate"):
+                    time.sleep(wait)
+            try:
+                response = self._send(url, payload)
+            except requests.exceptions.ConnectionError:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    return _decode(response)
+            if delay > 0:
+                with get_tracer().span("throttle", reason="retry", attempt=attempt):
+                    time.sleep(delay)
+            attempt += 1
+
+    def solve(self, payload):
+        return self.post("solve", payload)
+
+    def scan_resonance(self, payload):
+        return self.post("scan_resonance", payload)
+
+    def tsp(self, payload):
+        return self.post("tsp", payload)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncEnchanClient(EnchanClient):
+    """asyncio variant: rate limiting and backoff are awaited on the event loop,
+    the pooled session's blocking I/O runs on a worker thread per in-flight request.
+    """
+
+    def __init__(self, base_url=None, rate=1.0, burst=1, max_retries=5,
+                 timeout=300.0, pool_size=8, session=None, tuning=None):
+        super().__init__(base_url, rate, burst, max_retries, timeout, pool_size, session, tuning)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size)
+
+    async def post(self, endpoint, payload):
+        loop = asyncio.get_running_loop()
+        url = self.url(endpoint)
+        payload = self._prepare(payload)
+        attempt = 0
+        while True:
+            wait = self.bucket.reserve() if self.bucket else 0.0
+            if wait > 0:
+                with get_tracer().span("throttle", reason="rate"):
+                    await asyncio.sleep(wait)
+            try:
+                response = await loop.run_in_executor(self._executor, self._send, url, payload)
+            except requests.exceptions.ConnectionError:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    return _decode(response)
+            if delay > 0:
+                with get_tracer().span("throttle", reason="retry", attempt=attempt):
+                    await asyncio.sleep(delay)
+            attempt += 1
+
+    async def solve(self, payload):
+        return await self.post("solve", payload)
+
+    async def scan_resonance(self, payload):
+        return await self.post("scan_resonance", payload)
+
+    async def tsp(self, payload):
+        return await self.post("tsp", payload)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        super().close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
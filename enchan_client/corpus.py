@@ -0,0 +1,202 @@
+"""Reproducible workload corpus: vectorized graph generators with cached snapshots.
+
+Families:
+    er    Erdős–Rényi G(N, p). Up to 8192 nodes this is the same sampler as
+          server-side `density` generation in the local kernel and stand-in;
+          larger graphs draw a Binomial edge count and sample distinct pairs.
+    ba    Barabási–Albert preferential attachment with `m` edges per node
+          (Batagelj–Brandes, vectorized by pointer jumping): heavy hubs.
+    snap  SNAP-style edge files converted through `load_edges`.
+
+Any family can carry ±J couplings (`pmj=True`, the Edwards–Anderson spin
+glass weights) drawn from a separate stream, so the topology is unchanged.
+
+Each instance is written once to a compressed `.npz` snapshot under
+`~/.cache/enchan/corpus` (override with ENCHAN_CORPUS_DIR), named by family,
+parameters and seed and stored with its degrees and canonical graph hash.
+Later runs load it in milliseconds and can send the identical edge list to
+any backend.
+"""
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from .cache import default_cache_dir
+from .edgeio import EdgeList, load_edges
+from .graph import generate_random_graph, graph_hash
+
+CORPUS_VERSION = 1
+# N * N above this switches Erdős–Rényi to pair sampling (the dense sampler draws N^2 uniforms)
+DENSE_ER_LIMIT = 8192 * 8192
+
+
+# ==========================================
+# Generators
+# ==========================================
+def _canonical(N, u, v):
+    """Sorted, de-duplicated (min, max) pairs without self-loops."""
+    keep = u != v
+    lo, hi = np.minimum(u[keep], v[keep]), np.maximum(u[keep], v[keep])
+    keys = np.unique(lo.astype(np.int64) * N + hi)
+    return keys // N, keys % N
+
+
+def erdos_renyi(N, density, seed=42):
+    """G(N, p) as sorted (u, v) int64 arrays with u < v."""
+    if not 0.0 <= density <= 1.0:
+        raise ValueError("density must be a probability in [0, 1].")
+    if N * N <= DENSE_ER_LIMIT:
+        u, v, _ = generate_random_graph(N, density, seed)
+        return _canonical(N, u, v)
+    rng = np.random.default_rng(seed)
+    M = int(rng.binomial(N * (N - 1) // 2, density))
+    keys = np.zeros(0, dtype=np.int64)
+    while len(keys) < M:
+        draw = int((M - len(keys)) * 1.1) + 16
+        a, b = rng.integers(0, N, draw), rng.integers(0, N, draw)
+        ok = a != b
+        keys = np.union1d(keys, np.minimum(a, b)[ok] * N + np.maximum(a, b)[ok])
+    if len(keys) > M:
+        # Uniform pairs drawn with replacement, thinned to M: a uniform M-subset
+        keys = np.sort(rng.choice(keys, M, replace=False))
+    return keys // N, keys % N
+
+
+def barabasi_albert(N, m, seed=42):
+    """Preferential attachment with `m` edges per new node, as sorted (u, v) with u < v.
+
+    Batagelj–Brandes: slot 2e holds edge e's new node, slot 2e+1 copies a
+    uniformly chosen earlier slot (degree-proportional choice). The copies
+    are resolved by pointer jumping instead of a Python loop. Multi-edges and
+    self-loops are dropped, so E is slightly below N * m.
+    """
+    if m < 1:
+        raise ValueError("m must be >= 1.")
+    rng = np.random.default_rng(seed)
+    e = np.arange(N * m, dtype=np.int64)
+    r = rng.integers(0, 2 * e + 1)
+    ptr = r.copy()
+    odd = (ptr & 1) == 1
+    while odd.any():
+        ptr[odd] = r[(ptr[odd] - 1) // 2]
+        odd = (ptr & 1) == 1
+    return _canonical(N, e // m, (ptr // 2) // m)
+
+
+def pm_j_weights(E, seed=42):
+    """±1 couplings with equal probability, independent of the topology stream."""
+    rng = np.random.default_rng([seed, 1])
+    return np.where(rng.random(E) < 0.5, -1.0, 1.0)
+
+
+# ==========================================
+# Snapshots
+# ==========================================
+def corpus_dir():
+    return os.environ.get("ENCHAN_CORPUS_DIR", os.path.join(default_cache_dir(), "corpus"))
+
+
+def instance_name(family, N=None, seed=42, pmj=False, **params):
+    """Snapshot file stem, e.g. `er-n2000-density0.05-s42` or `ba-n100000-m3-s7-pmj`."""
+    parts = [family] + ([f"n{int(N)}"] if N is not None else [])
+    parts += [f"{k}{v:g}" if isinstance(v, float) else f"{k}{v}" for k, v in sorted(params.items())]
+    parts.append(f"s{seed}")
+    if pmj:
+        parts.append("pmj")
+    return "-".join(parts)
+
+
+def save_snapshot(path, g, meta):
+    tmp = f"{path}.tmp"
+    arrays = {"u": g.u, "v": g.v, "degrees": g.degrees,
+              "meta": np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)}
+    if g.w is not None:
+        arrays["w"] = g.w
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+
+
+def load_snapshot(path):
+    """(EdgeList, meta) from a corpus snapshot."""
+    with np.load(path) as data:
+        meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+        w = data["w"] if "w" in data else None
+        g = EdgeList(meta["N"], data["u"], data["v"], w, data["degrees"], meta["graph_hash"])
+    return g, meta
+
+
+def _edge_list(N, u, v, w=None):
+    u, v = u.astype(np.int32), v.astype(np.int32)
+    w = None if w is None else np.asarray(w, dtype=np.float32)
+    degrees = np.bincount(u, minlength=N) + np.bincount(v, minlength=N)
+    return EdgeList(N, u, v, w, degrees, graph_hash(N, u, v, None if w is None else w.astype(np.float64)))
+
+
+def _snap_params(path):
+    """Source identity of a SNAP file: its name plus a digest of size and mtime, so edits re-convert."""
+    st = os.stat(path)
+    stem = os.path.splitext(os.path.basename(path))[0].replace("-", "_")
+    src = hashlib.sha256(f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()[:12]
+    return {"file": stem, "src": src}
+
+
+def corpus_graph(family, N=None, seed=42, pmj=False, directory=None, refresh=False, **params):
+    """Loads (or generates and snapshots) one corpus instance; returns (EdgeList, meta).
+
+    `family` is "er" (density=), "ba" (m=) or "snap" (path=, relabel=True).
+    """
+    if family == "snap":
+        path = params.pop("path")
+        relabel = params.pop("relabel", True)
+        params.update(_snap_params(path))
+    elif family not in ("er", "ba"):
+        raise ValueError(f"Unknown corpus family: {family}")
+    directory = directory or corpus_dir()
+    name = instance_name(family, N, seed, pmj, **params)
+    snapshot = os.path.join(directory, f"{name}.npz")
+    if not refresh and os.path.exists(snapshot):
+        start = time.perf_counter()
+        g, meta = load_snapshot(snapshot)
+        meta = dict(meta, cached=True, load_time=time.perf_counter() - start, path=snapshot)
+        return g, meta
+
+    start = time.perf_counter()
+    if family == "er":
+        g = _edge_list(N, *erdos_renyi(N, params["density"], seed))
+    elif family == "ba":
+        g = _edge_list(N, *barabasi_albert(N, int(params["m"]), seed))
+    else:
+        g = load_edges(path, relabel=relabel)
+        if g.w is None:
+            g = _edge_list(g.N, *_canonical(g.N, g.u.astype(np.int64), g.v.astype(np.int64)))
+    if pmj:
+        g = _edge_list(g.N, g.u, g.v, pm_j_weights(g.E, seed))
+    meta = {"version": CORPUS_VERSION, "name": name, "family": family, "N": g.N, "E": g.E, "seed": seed,
+            "pmj": pmj, "params": params, "graph_hash": g.graph_hash, "max_degree": int(g.degrees.max(initial=0)),
+            "gen_time": time.perf_counter() - start}
+    os.makedirs(directory, exist_ok=True)
+    save_snapshot(snapshot, g, meta)
+    return g, dict(meta, cached=False, load_time=meta["gen_time"], path=snapshot)
+
+
+def parse_spec(spec):
+    """`"ba:N=10000,m=3,seed=7,pmj"` -> ("ba", {"N": 10000, "m": 3, "seed": 7, "pmj": True})."""
+    family, _, rest = spec.partition(":")
+    kwargs = {}
+    for item in filter(None, rest.split(",")):
+        key, eq, value = item.partition("=")
+        if not eq:
+            kwargs[key] = True
+            continue
+        try:
+            kwargs[key] = int(value)
+        except ValueError:
+            try:
+                kwargs[key] = float(value)
+            except ValueError:
+                kwargs[key] = value
+    return family, kwargs
@@ -0,0 +1,253 @@
+"""Streaming edge-list ingestion into compact int32 arrays.
+
+Reads SNAP-style text (`u v` or `u v w` per line, `#`/`%` comments) in fixed-size
+chunks and parses each chunk with vectorized byte arithmetic, so no per-edge
+Python objects are created. N, node degrees and the canonical graph hash are
+accumulated chunk by chunk in the same pass. Binary inputs (`.npy`, `.npz`,
+raw little-endian int32 pairs) are memory-mapped instead of parsed.
+"""
+import mmap
+import os
+
+import numpy as np
+
+from .graph import GraphHasher
+
+CHUNK_BYTES = 32 * 1024 * 1024
+BINARY_SUFFIXES = (".bin", ".i32", ".edges32")
+
+
+class EdgeList:
+    """Parsed graph: int32 endpoints, optional float32 weights and pass-derived stats."""
+
+    def __init__(self, N, u, v, w, degrees, graph_hash, labels=None):
+        self.N = N
+        self.u = u
+        self.v = v
+        self.w = w
+        self.degrees = degrees
+        self.graph_hash = graph_hash
+        # Original node ids when the graph was relabelled to 0..N-1
+        self.labels = labels
+
+    @property
+    def E(self):
+        return len(self.u)
+
+    def weights(self):
+        """Weights as float64 (ones for unweighted graphs)."""
+        return np.ones(self.E) if self.w is None else self.w.astype(np.float64)
+
+    def nbytes(self):
+        arrays = (self.u, self.v, self.w, self.degrees, self.labels)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+
+# ==========================================
+# Vectorized Text Parsing
+# ==========================================
+def _mask_comments(b):
+    """Zeroes out bytes on lines starting with '#' or '%' (in place)."""
+    nl = np.flatnonzero(b == 10)
+    starts = np.concatenate([[0], nl + 1])
+    starts = starts[starts < len(b)]
+    first = b[starts]
+    bad = starts[(first == 35) | (first == 37)]
+    if len(bad) == 0:
+        return
+    nl = np.append(nl, len(b))
+    ends = nl[np.searchsorted(nl, bad)]
+    for s, e in zip(bad, ends):
+        b[s:e] = 32
+
+
+def _masked_bytes(chunk):
+    b = np.frombuffer(chunk, dtype=np.uint8).copy()
+    _mask_comments(b)
+    return b
+
+
+def _is_plain_int(b):
+    """True if the (comment-masked) bytes hold only digits and whitespace."""
+    return bool(np.all(((b >= 48) & (b <= 57)) | (b == 32) | (b == 9) | (b == 10) | (b == 13)))
+
+
+def _count_tokens(b):
+    """Number of whitespace-separated tokens in a uint8 buffer."""
+    word = ~((b == 32) | (b == 9) | (b == 10) | (b == 13) | (b == 11) | (b == 12))
+    return int(np.count_nonzero(word[1:] & ~word[:-1]) + (len(word) > 0 and word[0]))
+
+
+def parse_int_tokens(b):
+    """All non-negative integer tokens in a uint8 buffer, parsed without Python loops."""
+    digit = (b >= 48) & (b <= 57)
+    if not digit.any():
+        return np.zeros(0, dtype=np.int64)
+    edge = np.diff(np.concatenate([[0], digit.view(np.int8), [0]]))
+    starts = np.flatnonzero(edge == 1)
+    ends = np.flatnonzero(edge == -1)
+    lengths = ends - starts
+    if lengths.max() > 18:
+        raise ValueError("Integer token too long for int64.")
+    values = np.zeros(len(starts), dtype=np.int64)
+    for k in range(int(lengths.max())):
+        m = lengths > k if k else slice(None)
+        values[m] = values[m] * 10 + (b[starts[m] + k] - 48)
+    return values
+
+
+def _split_complete_lines(buffer):
+    cut = buffer.rfind(b"\n") + 1
+    return (buffer[:cut], buffer[cut:]) if cut else (b"", buffer)
+
+
+def _detect_columns(head):
+    for line in head.split(b"\n"):
+        line = line.strip()
+        if line and not line.startswith((b"#", b"%")):
+            return len(line.split())
+    return 2
+
+
+def iter_text_chunks(path, chunk_bytes=CHUNK_BYTES, use_mmap=False):
+    """Yields byte chunks that end on a line boundary."""
+    with open(path, "rb") as f:
+        if use_mmap and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos, size = 0, len(mm)
+                while pos < size:
+                    end = min(size, pos + chunk_bytes)
+                    if end < size:
+                        nl = mm.rfind(b"\n", pos, end)
+                        if nl < 0:
+                            nl = mm.find(b"\n", end)
+                        end = size if nl < 0 else nl + 1
+                    yield mm[pos:end]
+                    pos = end
+            return
+        rest = b""
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            complete, rest = _split_complete_lines(rest + block)
+            if complete:
+                yield complete
+        if rest:
+            yield rest
+
+
+# ==========================================
+# Loading
+# ==========================================
+class _Accumulator:
+    def __init__(self):
+        self.us, self.vs, self.ws = [], [], []
+        self.max_id = -1
+        self.degrees = np.zeros(0, dtype=np.int64)
+        self.hasher = GraphHasher()
+
+    def add(self, u, v, w=None):
+        if len(u) == 0:
+            return
+        if u.min() < 0 or v.min() < 0:
+            raise ValueError("Node ids must be non-negative.")
+        if w is not None:
+            # Hash the float32 values that are actually stored and sent
+            w = np.asarray(w, dtype=np.float32).astype(np.float64)
+        self.max_id = max(self.max_id, int(u.max()), int(v.max()))
+        if self.max_id >= len(self.degrees):
+            grown = np.zeros(max(self.max_id + 1, 2 * len(self.degrees)), dtype=np.int64)
+            grown[:len(self.degrees)] = self.degrees
+            self.degrees = grown
+        self.degrees += np.bincount(u, minlength=len(self.degrees))
+        self.degrees += np.bincount(v, minlength=len(self.degrees))
+        self.hasher.update(u, v, w)
+        self.us.append(u.astype(np.int32))
+        self.vs.append(v.astype(np.int32))
+        if w is not None:
+            self.ws.append(w.astype(np.float32))
+
+    def finish(self, N=None, relabel=False):
+        cat = lambda parts, dt: np.concatenate(parts) if parts else np.zeros(0, dtype=dt)
+        u, v = cat(self.us, np.int32), cat(self.vs, np.int32)
+        w = cat(self.ws, np.float32) if self.ws else None
+        n = max(self.max_id + 1, int(N or 0))
+        degrees = self.degrees[:n] if len(self.degrees) >= n else np.pad(self.degrees, (0, n - len(self.degrees)))
+        self.hasher.N = n
+        if not relabel:
+            return EdgeList(n, u, v, w, degrees, self.hasher.hexdigest())
+        labels = np.flatnonzero(degrees)
+        remap = np.full(n, -1, dtype=np.int64)
+        remap[labels] = np.arange(len(labels))
+        u, v = remap[u].astype(np.int32), remap[v].astype(np.int32)
+        g = GraphHasher(len(labels)).update(u, v, w)
+        return EdgeList(len(labels), u, v, w, degrees[labels], g.hexdigest(), labels=labels)
+
+
+def load_text_edges(path, chunk_bytes=CHUNK_BYTES, use_mmap=False, N=None, relabel=False):
+    """Streams a SNAP-style text edge list into an EdgeList."""
+    acc = _Accumulator()
+    ncols = None
+    for chunk in iter_text_chunks(path, chunk_bytes, use_mmap):
+        if ncols is None:
+            ncols = _detect_columns(chunk[:65536])
+            if ncols not in (2, 3):
+                raise ValueError(f"Expected 2 or 3 columns per line, found {ncols}.")
+        b = _masked_bytes(chunk)
+        if ncols == 2 and _is_plain_int(b):
+            tokens = parse_int_tokens(b)
+            if len(tokens) % 2:
+                raise ValueError("Malformed edge list: odd number of node ids.")
+            pairs = tokens.reshape(-1, 2)
+            acc.add(pairs[:, 0], pairs[:, 1])
+        else:
+            # Comments are masked to spaces: one C-level parse for the whole chunk
+            try:
+                values = np.fromstring(b.tobytes(), dtype=np.float64, sep=" ")
+            except ValueError:
+                values = None
+            # Older NumPy stops at the first bad token with only a warning
+            if values is None or len(values) != _count_tokens(b):
+                raise ValueError("Malformed edge list: non-numeric token.")
+            if len(values) % ncols:
+                raise ValueError(f"Malformed edge list: expected {ncols} columns per line.")
+            rows = values.reshape(-1, ncols)
+            acc.add(rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64),
+                    rows[:, 2] if ncols == 3 else None)
+    return acc.finish(N, relabel)
+
+
+def load_binary_edges(path, N=None, relabel=False):
+    """Memory-maps `.npy` (E, 2|3), `.npz` (u, v[, w]) or raw int32 pair files."""
+    w = None
+    if path.endswith(".npz"):
+        data = np.load(path)
+        u, v = data["u"], data["v"]
+        w = data["w"] if "w" in data else None
+    elif path.endswith(".npy"):
+        arr = np.load(path, mmap_mode="r")
+        u, v = arr[:, 0], arr[:, 1]
+        w = arr[:, 2] if arr.shape[1] > 2 else None
+    else:
+        arr = np.memmap(path, dtype="<i4", mode="r").reshape(-1, 2)
+        u, v = arr[:, 0], arr[:, 1]
+    acc = _Accumulator()
+    step = CHUNK_BYTES // 8
+    for s in range(0, len(u), step):
+        acc.add(np.asarray(u[s:s + step], dtype=np.int64), np.asarray(v[s:s + step], dtype=np.int64),
+                None if w is None else np.asarray(w[s:s + step], dtype=np.float64))
+    return acc.finish(N, relabel)
+
+
+def load_edges(path, N=None, relabel=False, use_mmap=False, chunk_bytes=CHUNK_BYTES):
+    """Loads any supported edge file; dispatches on the file suffix."""
+    lower = path.lower()
+    if lower.endswith((".npy", ".npz") + BINARY_SUFFIXES):
+        return load_binary_edges(path, N, relabel)
+    return load_text_edges(path, chunk_bytes, use_mmap, N, relabel)
+
+
+def save_binary_edges(path, u, v):
+    """Writes raw little-endian int32 pairs readable by `load_edges`."""
+    np.column_stack([u, v]).astype("<i4").tofile(path)
@@ -0,0 +1,153 @@
+"""Graph payload normalization shared by the local kernel and client tools."""
+import hashlib
+import struct
+
+import numpy as np
+
+# Public API capacity (requests above this return 400 on the hosted endpoint)
+MAX_NODES = 3000
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+# ==========================================
+# Payload -> Arrays
+# ==========================================
+def as_edge_arrays(edges, weights=None):
+    """Converts `[[u, v], ...]` (or an (E, 2) array) into u, v, w arrays."""
+    e = np.asarray(edges if edges is not None else [], dtype=np.int64)
+    if e.size == 0:
+        e = e.reshape(0, 2)
+    if e.ndim != 2 or e.shape[1] != 2:
+        raise ValueError("graph.edges must be a list of [u, v] pairs.")
+    u = np.ascontiguousarray(e[:, 0])
+    v = np.ascontiguousarray(e[:, 1])
+    if weights is None:
+        w = np.ones(len(u), dtype=np.float64)
+    else:
+        w = np.asarray(weights, dtype=np.float64).reshape(-1)
+        if len(w) != len(u):
+            raise ValueError("graph.weights must have the same length as graph.edges.")
+    return u, v, w
+
+
+def generate_random_graph(N, density, seed):
+    """Erdős–Rényi G(N, p) generated row-block by row-block (upper triangle only)."""
+    if not 0.0 <= density <= 1.0:
+        raise ValueError("graph.density must be a probability in [0, 1].")
+    rng = np.random.default_rng(seed)
+    block = max(1, (1 << 22) // max(N, 1))
+    us, vs = [], []
+    for start in range(0, N, block):
+        stop = min(N, start + block)
+        mask = rng.random((stop - start, N)) < density
+        rows, cols = np.nonzero(mask)
+        rows = rows + start
+        keep = cols > rows
+        us.append(rows[keep])
+        vs.append(cols[keep])
+    u = np.concatenate(us).astype(np.int64) if us else np.zeros(0, np.int64)
+    v = np.concatenate(vs).astype(np.int64) if vs else np.zeros(0, np.int64)
+    return u, v, np.ones(len(u), dtype=np.float64)
+
+
+def normalize_graph(graph, seed=None, max_nodes=None):
+    """Returns (N, u, v, w) for a `/v1/solve` style `graph` object."""
+    if not isinstance(graph, dict) or "N" not in graph:
+        raise ValueError("graph.N is required.")
+    N = int(graph["N"])
+    if N < 1:
+        raise ValueError("graph.N must be >= 1.")
+    if max_nodes is not None and N > max_nodes:
+        raise ValueError(f"Capacity Limit: Max {max_nodes} nodes allowed.")
+
+    edges = graph.get("edges")
+    if edges is None or len(edges) == 0:
+        density = float(graph.get("density") or 0.0)
+        if density > 0.0:
+            return (N,) + generate_random_graph(N, density, seed)
+    u, v, w = as_edge_arrays(edges, graph.get("weights"))
+    if len(u) and (min(u.min(), v.min()) < 0 or max(u.max(), v.max()) >= N):
+        raise ValueError(f"Node index out of bounds (0 <= u, v < {N}).")
+    return N, u, v, w
+
+
+# ==========================================
+# Canonical Graph Hash
+# ==========================================
+def _splitmix64(x):
+    x = (x + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+    x = ((x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+    x = ((x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+    return x ^ (x >> np.uint64(31))
+
+
+class GraphHasher:
+    """Order-independent graph digest that can be fed edge chunks as they stream in.
+
+    Each undirected edge (min(u,v), max(u,v), w) is mixed into a 64-bit word and the
+    words are accumulated with wrapping sums, so the digest does not depend on edge
+    order or chunking. N and E are folded into the final SHA256.
+    """
+
+    def __init__(self, N=None):
+        self.N = N
+        self.E = 0
+        self._acc = [np.uint64(0), np.uint64(0)]
+
+    def update(self, u, v, w=None):
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        if len(u) == 0:
+            return self
+        lo = np.minimum(u, v).astype(np.uint64)
+        hi = np.maximum(u, v).astype(np.uint64)
+        key = (lo << np.uint64(32)) | hi
+        if w is None:
+            wbits = np.full(len(u), np.float64(1.0)).view(np.uint64)
+        else:
+            wbits = np.ascontiguousarray(w, dtype=np.float64).view(np.uint64)
+        with np.errstate(over="ignore"):
+            h = _splitmix64(key ^ _splitmix64(wbits))
+            g = _splitmix64(h ^ np.uint64(0xD6E8FEB86659FD93))
+            self._acc[0] = (self._acc[0] + np.add.reduce(h, dtype=np.uint64)) & _MASK64
+            self._acc[1] = (self._acc[1] + np.add.reduce(g, dtype=np.uint64)) & _MASK64
+        self.E += len(u)
+        return self
+
+    def hexdigest(self):
+        header = struct.pack("<qqQQ", int(self.N or 0), self.E, int(self._acc[0]), int(self._acc[1]))
+        return hashlib.sha256(b"enchan-graph-v1" + header).hexdigest()
+
+
+def graph_hash(N, u, v, w=None):
+    """Canonical hash of an edge list and its weights."""
+    return GraphHasher(N).update(u, v, w).hexdigest()
+
+
+# ==========================================
+# CSR Construction
+# ==========================================
+def build_csr(N, u, v, w):
+    """Symmetric CSR adjacency (indptr, indices, data); self-loops are dropped."""
+    keep = u != v
+    u, v, w = u[keep], v[keep], w[keep]
+    rows = np.concatenate([u, v])
+    cols = np.concatenate([v, u])
+    data = np.concatenate([w, w])
+    order = np.lexsort((cols, rows))
+    rows, cols, data = rows[order], cols[order], data[order]
+    indptr = np.zeros(N + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=N), out=indptr[1:])
+    return indptr, cols.astype(np.int64), data
+
+
+def spmv(indptr, indices, data, x):
+    """y = A @ x for a CSR matrix, via segmented reduction over row slices."""
+    out = np.zeros(len(indptr) - 1, dtype=np.float64)
+    if len(indices) == 0:
+        return out
+    starts = indptr[:-1]
+    nonempty = starts < indptr[1:]
+    out[nonempty] = np.add.reduceat(data * x[indices], starts[nonempty])
+    return out
@@ -0,0 +1,114 @@
+"""Adaptive Resource Injection as an asyncio pipeline.
+
+1. Survey: `/solve` and `/scan_resonance` are issued concurrently.
+2. Injection rounds: flip the field at the top `vulnerable_nodes` of the best
+   state so far and warm-start `/solve` from it (`initial_state`).
+3. A round that raises the cut is kept; otherwise the next window of scan
+   targets is tried. After `patience` non-improving rounds the pipeline stops.
+
+When the payload carries an explicit edge list, targets after an improving
+round are re-ranked locally from the new spins (same frustration metric as the
+scan), so no extra scan round trip is needed.
+"""
+import asyncio
+import time
+
+import numpy as np
+
+from .graph import build_csr, normalize_graph, spmv
+from .kernel import scan_resonance_local, solve_local
+
+
+async def _call(client, endpoint, payload):
+    if client is not None:
+        return await getattr(client, endpoint)(payload)
+    fn = solve_local if endpoint == "solve" else scan_resonance_local
+    return await asyncio.get_running_loop().run_in_executor(None, fn, payload)
+
+
+async def _timed(client, endpoint, payload):
+    start = time.perf_counter()
+    res = await _call(client, endpoint, payload)
+    return res, time.perf_counter() - start
+
+
+def rank_frustrated(csr, spins):
+    """Nodes with instability >= 0.5 under `spins`, most unstable first."""
+    indptr, indices, data = csr
+    N = len(spins)
+    H = spmv(indptr, indices, data, spins)
+    strength = spmv(indptr, indices, np.abs(data), np.ones(N))
+    instability = (np.divide(spins * H, strength, out=np.zeros(N), where=strength > 0) + 1.0) / 2.0
+    ranked = np.lexsort((np.arange(N), -instability))
+    return ranked[instability[ranked] >= 0.5]
+
+
+def _local_csr(payload):
+    graph = payload.get("graph") or {}
+    if graph.get("edges") is None:
+        return None
+    N, u, v, w = normalize_graph(graph)
+    return build_csr(N, u, v, w)
+
+
+async def adaptive_injection(payload, client=None, rounds=4, top_k=64, patience=2, min_gain=0.0):
+    """Runs survey + injection rounds; returns the best response plus a report.
+
+    `client` is an AsyncEnchanClient; without one, the local kernels are used.
+    """
+    start_wall = time.perf_counter()
+    (base, solve_latency), (scan, scan_latency) = await asyncio.gather(
+        _timed(client, "solve", payload), _timed(client, "scan_resonance", payload))
+    survey_time = time.perf_counter() - start_wall
+
+    best = base
+    best_cut = base_cut = float(base["metrics"]["cut"])
+    targets = np.asarray(scan.get("vulnerable_nodes", []), dtype=np.int64)
+    csr = _local_csr(payload)
+    offset, stalls, history = 0, 0, []
+
+    for r in range(1, rounds + 1):
+        window = targets[offset:offset + top_k]
+        if len(window) == 0:
+            break
+        S = np.asarray(best["S"], dtype=np.float64)
+        S[window] *= -1.0
+        res, latency = await _timed(client, "solve", dict(payload, initial_state=S.tolist()))
+        cut = float(res["metrics"]["cut"])
+        accepted = cut > best_cut + min_gain
+        history.append({"round": r, "targets": len(window), "cut": cut, "gain": cut - best_cut,
+                        "latency": latency, "gain_per_sec": (cut - best_cut) / latency if latency > 0 else 0.0,
+                        "accepted": accepted})
+        if accepted:
+            best, best_cut, stalls = res, cut, 0
+            if csr is not None:
+                spins = np.where(np.asarray(res["S"]) >= 0.0, 1.0, -1.0)
+                targets, offset = rank_frustrated(csr, spins), 0
+        else:
+            stalls += 1
+            offset += top_k
+            if stalls >= patience:
+                break
+
+    wall = time.perf_counter() - start_wall
+    injection_time = wall - survey_time
+    return {
+        "best": best,
+        "report": {
+            "base_cut": base_cut,
+            "best_cut": best_cut,
+            "improvement": best_cut - base_cut,
+            "rounds": history,
+            "vulnerable_nodes": int(len(targets)),
+            "survey_time": survey_time,
+            "survey_sequential": solve_latency + scan_latency,
+            "injection_time": injection_time,
+            "wall_time": wall,
+            "gain_per_sec": (best_cut - base_cut) / injection_time if injection_time > 0 else 0.0,
+        },
+    }
+
+
+def run_adaptive_injection(payload, client=None, **kwargs):
+    """Synchronous wrapper around `adaptive_injection`."""
+    return asyncio.run(adaptive_injection(payload, client, **kwargs))
@@ -0,0 +1,214 @@
+"""Local NumPy reference kernel for the `/v1/solve` field dynamics.
+
+Implements the loop published in the whitepaper (Section 3.2):
+
+    Initialize continuous state variables deterministically (LCG)
+    Loop:
+        Compute linear local fields (SpMV)
+        Apply non-linear screening mu_i(H_i)
+        Integrate continuous dynamics (symplectic)
+        Apply phased bifurcation potential
+    Project continuous variables to binary states
+
+This is a reference implementation of the published formulation, not the
+proprietary engine: results follow the same contract and are deterministic for
+a given payload, but S-HASH values are not expected to match the hosted API.
+"""
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from .graph import build_csr, graph_hash, normalize_graph, spmv
+
+# Virtual seconds per integration step (total_time=35.0 -> 700 steps)
+DT_VIRTUAL = 0.05
+# Symplectic step size in the SB time frame
+DT_INTEGRATOR = 0.5
+# Screening steepness alpha in mu_i(H_i) = 1 / (1 + (|H_i| / a0)^alpha)
+SCREEN_ALPHA = 1.0
+# Fraction of the run spent ramping the bifurcation pump (rest is freeze-out)
+PUMP_RAMP = 0.8
+# Initial amplitude of the LCG field
+INIT_AMPLITUDE = 0.01
+# Pump level a fully specified initial_state starts from (warm starts skip the
+# low-pump phase, which would otherwise scramble the injected field)
+WARM_PUMP_START = 0.5
+
+LCG_A = 1664525
+LCG_C = 1013904223
+_LCG_MASK = np.uint64(0xFFFFFFFF)
+
+
+# ==========================================
+# Deterministic Initialization
+# ==========================================
+def lcg_uniform(seed, n, offset=0):
+    """The first n outputs (after `offset`) of a 32-bit LCG as floats in [0, 1).
+
+    Uses jump-ahead (x_k = a^k x_0 + c (a^k - 1)/(a - 1)) so the sequence is
+    produced in one vectorized pass; uint64 wrap-around keeps it exact mod 2^32.
+    """
+    if n == 0:
+        return np.zeros(0, dtype=np.float64)
+    with np.errstate(over="ignore"):
+        a = np.full(offset + n, LCG_A, dtype=np.uint64)
+        a_pow = np.cumprod(a)
+        geom = np.cumsum(np.concatenate([[np.uint64(1)], a_pow[:-1]]))
+        x0 = np.uint64(int(seed) & 0xFFFFFFFF)
+        states = (a_pow * x0 + np.uint64(LCG_C) * geom) & _LCG_MASK
+    return states[offset:].astype(np.float64) / 4294967296.0
+
+
+# ==========================================
+# Field Dynamics
+# ==========================================
+def screening_threshold(indptr, indices, data):
+    """Critical field a0 from the RMS row norm of the coupling matrix."""
+    row_sq = spmv(indptr, indices, data * data, np.ones(len(indptr) - 1))
+    a0 = float(np.sqrt(row_sq.mean()))
+    return a0 if a0 > 0.0 else 1.0
+
+
+def evolve(csr, x, y, steps, alpha=SCREEN_ALPHA, pump_start=0.0):
+    """Integrates the screened bifurcation dynamics in place and returns x."""
+    indptr, indices, data = csr
+    a0 = screening_threshold(indptr, indices, data)
+    c0 = 0.5 / a0
+    ramp = max(1, int(steps * PUMP_RAMP))
+    for step in range(steps):
+        pump = pump_start + (1.0 - pump_start) * min(1.0, (step + 1) / ramp)
+        H = spmv(indptr, indices, data, x)
+        mu = 1.0 / (1.0 + (np.abs(H) / a0) ** alpha)
+        # Energy is sum_(ij) w_ij s_i s_j, so the coupling force is -mu * H
+        y += DT_INTEGRATOR * (-(1.0 - pump) * x - c0 * mu * H)
+        x += DT_INTEGRATOR * y
+        wall = np.abs(x) > 1.0
+        if wall.any():
+            x[wall] = np.sign(x[wall])
+            y[wall] = 0.0
+    return x
+
+
+def cut_value(u, v, w, spins):
+    """Weighted cut: sum of w over edges whose endpoints have opposite spins."""
+    if len(u) == 0:
+        return 0.0
+    return float(w[spins[u] != spins[v]].sum())
+
+
+def field_hash(S):
+    """S-HASH: SHA256 over the little-endian float64 field."""
+    return hashlib.sha256(np.ascontiguousarray(S, dtype="<f8").tobytes()).hexdigest()
+
+
+# ==========================================
+# Public Entry Point
+# ==========================================
+def prepare(payload, max_nodes=None):
+    """Validates a solve payload; returns (N, u, v, w, csr, steps, total_time, x0, y0, pump_start)."""
+    control = payload.get("control") or {}
+    if "total_time" not in control:
+        raise ValueError("control.total_time is required.")
+    total_time = float(control["total_time"])
+    if total_time < 0.1:
+        raise ValueError("control.total_time must be >= 0.1.")
+    seed = int(payload.get("seed") or 0)
+
+    N, u, v, w = normalize_graph(payload.get("graph"), seed=seed, max_nodes=max_nodes)
+    csr = build_csr(N, u, v, w)
+    steps = max(1, int(round(total_time / DT_VIRTUAL)))
+
+    init = payload.get("initial_state")
+    if init is not None:
+        x = np.clip(np.asarray(init, dtype=np.float64), -1.0, 1.0)
+        if len(x) != N:
+            raise ValueError("initial_state length must be N.")
+        # Exact zeros carry no information (new / undecided nodes of a warm
+        # start) and would sit on the symmetric fixed point: seed them like a cold start.
+        pump_start = WARM_PUMP_START * float(np.count_nonzero(x)) / N if N else 0.0
+        noise = (lcg_uniform(seed, N) - 0.5) * 2.0 * INIT_AMPLITUDE
+        x = np.where(x == 0.0, noise, x)
+        y = np.zeros(N, dtype=np.float64)
+    else:
+        x = (lcg_uniform(seed, N) - 0.5) * 2.0 * INIT_AMPLITUDE
+        y = (lcg_uniform(seed, N, offset=N) - 0.5) * 2.0 * INIT_AMPLITUDE
+        pump_start = 0.0
+    return N, u, v, w, csr, steps, total_time, x, y, pump_start
+
+
+def solve_local(payload, max_nodes=None):
+    """Solves a `/v1/solve` payload in-process and returns the API response shape."""
+    start_wall = time.perf_counter()
+    N, u, v, w, csr, steps, total_time, x, y, pump_start = prepare(payload, max_nodes)
+
+    S = evolve(csr, x, y, steps, pump_start=pump_start)
+    spins = np.where(S >= 0.0, 1, -1).astype(np.int8)
+    cut = cut_value(u, v, w, spins)
+    s_hash = field_hash(S)
+    g_hash = graph_hash(N, u, v, w)
+
+    wall_time = time.perf_counter() - start_wall
+    return {
+        "S": S.tolist(),
+        "outputs": {"spins": spins.astype(float).tolist()},
+        "metrics": {"cut": cut, "plus_ratio": float((spins > 0).mean())},
+        "graph": {"N": N, "E": int(len(u)), "graph_hash": g_hash},
+        "audit": {
+            "steps": steps,
+            "total_time": total_time,
+            "HASH": {"S": s_hash},
+            "GUARDIAN": {"total_edge_visits": int(2 * len(u) * steps)},
+            "ENV": {"numpy": np.__version__, "engine": "enchan_client.kernel"},
+        },
+        "audit_public": {"result_hash": s_hash},
+        "TIMING": {"total_wall_time": wall_time},
+        "ENV": {
+            "runtime": {
+                "python_version": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+                "os_info": platform.platform(),
+            }
+        },
+    }
+
+
+def scan_resonance_local(payload, max_nodes=None):
+    """`/v1/scan_resonance` stand-in: ranks nodes by frustration of the relaxed state.
+
+    A node's instability is the fraction of its coupling strength that opposes
+    its current spin, mapped to [0, 1] (0.5 = balanced). Nodes at or above 0.5
+    are reported, most unstable first; `peak_instability` is scaled to
+    [0, total_time] like the hosted metric.
+    """
+    start_wall = time.perf_counter()
+    N, u, v, w, csr, steps, total_time, x, y, pump_start = prepare(payload, max_nodes)
+    S = evolve(csr, x, y, steps, pump_start=pump_start)
+    spins = np.where(S >= 0.0, 1.0, -1.0)
+    indptr, indices, data = csr
+    H = spmv(indptr, indices, data, spins)
+    strength = spmv(indptr, indices, np.abs(data), np.ones(N))
+    frustration = np.divide(spins * H, strength, out=np.zeros(N), where=strength > 0)
+    instability = (frustration + 1.0) / 2.0
+
+    ranked = np.lexsort((np.arange(N), -instability))
+    ranked = ranked[instability[ranked] >= 0.5]
+    peak = float(np.clip((instability.max() - 0.5) * 2.0, 0.0, 1.0)) * total_time if N else 0.0
+    return {
+        "metrics": {"is_active": peak > 0.0, "peak_instability": peak},
+        "vulnerable_nodes": ranked.tolist(),
+        "TIMING": {"total_wall_time": time.perf_counter() - start_wall},
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m enchan_client.kernel <payload.json>")
+        sys.exit(1)
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        result = solve_local(json.load(f))
+    print(json.dumps({k: result[k] for k in ("metrics", "audit", "TIMING")}, indent=2))
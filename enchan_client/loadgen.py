@@ -0,0 +1,138 @@
+"""Concurrent load generator for the Enchan API with latency percentiles."""
+import asyncio
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .client import EnchanAPIError
+from .graph import generate_random_graph
+from .payloads import solve_payload, tsp_payload
+
+ENDPOINTS = ("solve", "scan_resonance", "tsp")
+PERCENTILES = (50, 95, 99)
+
+# One finished request: latency is client round trip, server_time is TIMING.total_wall_time,
+# audited is True/False when the response was verified locally (None = not audited)
+Sample = namedtuple("Sample", "endpoint latency server_time status audited", defaults=(None,))
+
+
+def default_workload(N=200, density=0.05, n_cities=100, total_time=5.0, seed=42, explicit_edges=False):
+    """One representative payload per endpoint.
+
+    `explicit_edges` sends the generated edge list instead of auto-generation
+    parameters, so responses from any server can be audited locally.
+    """
+    rng = np.random.default_rng(seed)
+    cities = np.column_stack([rng.uniform(25.0, 46.0, n_cities), rng.uniform(126.0, 148.0, n_cities)])
+    if explicit_edges:
+        u, v, _ = generate_random_graph(N, density, seed)
+        graph = solve_payload(N, np.column_stack([u, v]).tolist(), total_time=total_time, seed=seed)
+    else:
+        graph = solve_payload(N, density=density, total_time=total_time, seed=seed)
+    return {
+        "solve": graph,
+        "scan_resonance": graph,
+        "tsp": tsp_payload(cities.tolist(), seed=seed),
+    }
+
+
+def parse_mix(text):
+    """'solve=3,tsp=1' -> {'solve': 3.0, 'tsp': 1.0}."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (expected one of {', '.join(ENDPOINTS)}).")
+        mix[name] = float(weight or 1.0)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Request mix must have at least one positive weight.")
+    return mix
+
+
+def schedule(mix, total_requests, seed=0):
+    """Deterministic endpoint sequence drawn from the weighted mix."""
+    names = list(mix)
+    p = np.array([mix[n] for n in names], dtype=np.float64)
+    picks = np.random.default_rng(seed).choice(len(names), size=total_requests, p=p / p.sum())
+    return [names[i] for i in picks]
+
+
+async def run_load(client, workload, mix, total_requests, concurrency, seed=0, verify=None):
+    """Drives `total_requests` calls through `client` with `concurrency` workers.
+
+    `verify(endpoint, response)` may return True/False to audit each success.
+    Returns (samples, wall_seconds).
+    """
+    queue = asyncio.Queue()
+    for endpoint in schedule(mix, total_requests, seed):
+        queue.put_nowait(endpoint)
+    samples = []
+
+    async def worker():
+        while True:
+            try:
+                endpoint = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            audited = None
+            try:
+                res = await client.post(endpoint, workload[endpoint])
+                status = 200
+                server_time = float(res.get("TIMING", {}).get("total_wall_time", 0.0))
+            except EnchanAPIError as e:
+                status, server_time = e.status_code, 0.0
+            except Exception:
+                status, server_time = 0, 0.0
+            latency = time.perf_counter() - start
+            if status == 200 and verify is not None:
+                audited = verify(endpoint, res)
+            samples.append(Sample(endpoint, latency, server_time, status, audited))
+
+    start_wall = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return samples, time.perf_counter() - start_wall
+
+
+# ==========================================
+# Reporting
+# ==========================================
+def _stats(samples, wall):
+    ok = [s for s in samples if s.status == 200]
+    out = {"count": len(samples), "errors": len(samples) - len(ok),
+           "rps": len(ok) / wall if wall > 0 else 0.0,
+           "audited": sum(s.audited is not None for s in ok),
+           "audit_failures": sum(s.audited is False for s in ok)}
+    if ok:
+        lat = np.array([s.latency for s in ok])
+        srv = np.array([s.server_time for s in ok])
+        for q, value in zip(PERCENTILES, np.percentile(lat, PERCENTILES)):
+            out[f"p{q}"] = float(value)
+        out["mean_server"] = float(srv.mean())
+        out["mean_transport"] = float((lat - srv).mean())
+    return out
+
+
+def summarize(samples, wall):
+    """Overall and per-endpoint latency percentiles, throughput and time split."""
+    summary = {"wall_time": wall, "overall": _stats(samples, wall), "endpoints": {}}
+    for endpoint in ENDPOINTS:
+        subset = [s for s in samples if s.endpoint == endpoint]
+        if subset:
+            summary["endpoints"][endpoint] = _stats(subset, wall)
+    return summary
+
+
+def format_report(summary):
+    lines = [f"{'Endpoint':<16} {'Req':>6} {'Err':>5} {'RPS':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+             f"{'Server':>8} {'Transp':>8}"]
+    rows = list(summary["endpoints"].items()) + [("ALL", summary["overall"])]
+    for name, st in rows:
+        if "p50" in st:
+            lines.append(f"{name:<16} {st['count']:>6} {st['errors']:>5} {st['rps']:>8.2f} "
+                         f"{st['p50']:>7.3f}s {st['p95']:>7.3f}s {st['p99']:>7.3f}s "
+                         f"{st['mean_server']:>7.3f}s {st['mean_transport']:>7.3f}s")
+        else:
+            lines.append(f"{name:<16} {st['count']:>6} {st['errors']:>5} {'-':>8}")
+    return "\n".join(lines)
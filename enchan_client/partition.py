@@ -0,0 +1,279 @@
+"""Graph decomposition driver for graphs beyond the per-request node cap.
+
+Pipeline:
+    1. Partition into balanced shards of at most `cap` nodes (BFS blocks from a
+       pseudo-peripheral node, then capacity-aware label-propagation refinement
+       that moves nodes towards the shard holding most of their edge weight).
+    2. Solve every shard concurrently (remote client or local kernel).
+    3. Stitch: flip whole shards when that increases the cut across shards
+       (each shard's solution is only defined up to a global spin flip).
+    4. Boundary fix-up: vectorized local search that flips shard-crossing nodes
+       with positive cut gain, one independent set per pass.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .graph import MAX_NODES, build_csr, spmv
+from .kernel import cut_value, solve_local
+from .payloads import encode_solve_json
+
+
+# ==========================================
+# Partitioning
+# ==========================================
+def csr_rows(indptr):
+    """Row index of every CSR entry."""
+    return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+
+def _neighbors(indptr, indices, frontier):
+    starts = indptr[frontier]
+    lens = indptr[frontier + 1] - starts
+    total = int(lens.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lens)[:-1]]), lens)
+    return indices[offsets + np.arange(total)]
+
+
+def _bfs_from(indptr, indices, start, visited, out):
+    frontier = np.array([start], dtype=np.int64)
+    visited[start] = True
+    last = start
+    while len(frontier):
+        out.append(frontier)
+        last = int(frontier[-1])
+        nbrs = _neighbors(indptr, indices, frontier)
+        nbrs = np.unique(nbrs[~visited[nbrs]])
+        visited[nbrs] = True
+        frontier = nbrs
+    return last
+
+
+def bfs_order(indptr, indices):
+    """Level-synchronous BFS order over all components; isolated nodes go last.
+
+    Each component is traversed from a pseudo-peripheral node (the last node
+    reached by a BFS from its lowest-index node) so consecutive blocks of the
+    order stay spatially compact.
+    """
+    N = len(indptr) - 1
+    degree = np.diff(indptr)
+    visited = degree == 0
+    levels = []
+    for start in range(N):
+        if visited[start]:
+            continue
+        probe = visited.copy()
+        far = _bfs_from(indptr, indices, start, probe, [])
+        _bfs_from(indptr, indices, far, visited, levels)
+    levels.append(np.flatnonzero(degree == 0))
+    return np.concatenate(levels)
+
+
+def refine_partition(csr, parts, k, cap, passes=8, seed=0):
+    """Capacity-aware label propagation; returns refined `parts` (modified in place)."""
+    indptr, indices, data = csr
+    N = len(parts)
+    rows = csr_rows(indptr)
+    wabs = np.abs(data)
+    rng = np.random.default_rng(seed)
+    for _ in range(passes):
+        key = rows * k + parts[indices]
+        uniq, inv = np.unique(key, return_inverse=True)
+        conn = np.bincount(inv, weights=wabs)
+        node, part = uniq // k, uniq % k
+        own = np.zeros(N)
+        is_own = part == parts[node]
+        own[node[is_own]] = conn[is_own]
+
+        ext = ~is_own
+        e_node, e_part, e_conn = node[ext], part[ext], conn[ext]
+        order = np.lexsort((-e_conn, e_node))
+        e_node, e_part, e_conn = e_node[order], e_part[order], e_conn[order]
+        first = np.concatenate([[True], e_node[1:] != e_node[:-1]]) if len(e_node) else e_node.astype(bool)
+        cand, target, gain = e_node[first], e_part[first], e_conn[first] - own[e_node[first]]
+
+        # Move half of the improving nodes per pass so neighbours do not swap back and forth
+        keep = (gain > 1e-12) & (rng.random(len(cand)) < 0.5)
+        cand, target, gain = cand[keep], target[keep], gain[keep]
+        if len(cand) == 0:
+            break
+        sizes = np.bincount(parts, minlength=k)
+        order = np.lexsort((-gain, target))
+        cand, target = cand[order], target[order]
+        starts = np.searchsorted(target, np.arange(k))
+        rank = np.arange(len(target)) - starts[target]
+        accept = rank < (cap - sizes)[target]
+        parts[cand[accept]] = target[accept]
+    return parts
+
+
+def partition_graph(N, u, v, w, cap=MAX_NODES, passes=8, seed=0):
+    """Balanced, cut-minimizing assignment of N nodes to ceil(N / cap) shards."""
+    csr = build_csr(N, u, v, w)
+    k = max(1, -(-N // cap))
+    if k == 1:
+        return np.zeros(N, dtype=np.int64), csr
+    order = bfs_order(csr[0], csr[1])
+    parts = np.empty(N, dtype=np.int64)
+    parts[order] = np.arange(N) * k // N
+    return refine_partition(csr, parts, k, cap, passes, seed), csr
+
+
+# ==========================================
+# Stitching & Boundary Fix-up
+# ==========================================
+def align_shards(u, v, w, parts, spins, k, max_rounds=None):
+    """Greedily flips whole shards while that increases the cross-shard cut."""
+    cross = parts[u] != parts[v]
+    cu, cv, cw = u[cross], v[cross], w[cross]
+    pu, pv = parts[cu], parts[cv]
+    flips = 0
+    for _ in range(max_rounds or 2 * k):
+        agree = cw * spins[cu] * spins[cv]
+        gain = np.bincount(pu, weights=agree, minlength=k) + np.bincount(pv, weights=agree, minlength=k)
+        best = int(np.argmax(gain))
+        if gain[best] <= 1e-12:
+            break
+        spins[parts == best] *= -1
+        flips += 1
+    return spins, flips
+
+
+def local_search(csr, spins, candidates=None, max_passes=100):
+    """Flips nodes with positive cut gain until none remain (in place).
+
+    Per pass only nodes whose gain beats every improving neighbour are flipped,
+    so the flipped set is independent and the gains add up exactly.
+    """
+    indptr, indices, data = csr
+    rows = csr_rows(indptr)
+    s = spins.astype(np.float64)
+    flipped = 0
+    for _ in range(max_passes):
+        gain = s * spmv(indptr, indices, data, s)
+        mask = gain > 1e-12
+        if candidates is not None:
+            mask &= candidates
+        if not mask.any():
+            break
+        g = np.where(mask, gain, -np.inf)
+        beats = mask[indices] & ((g[indices] > g[rows]) | ((g[indices] == g[rows]) & (indices < rows)))
+        blocked = np.bincount(rows[beats], minlength=len(s)) > 0
+        flip = mask & ~blocked
+        s[flip] *= -1
+        flipped += int(flip.sum())
+    spins[:] = s
+    return spins, flipped
+
+
+# ==========================================
+# Driver
+# ==========================================
+def split_shards(u, v, w, parts, k):
+    """Internal edges of every shard relabelled to 0..n-1; list of (nodes, su, sv, sw)."""
+    order = np.argsort(parts, kind="stable")
+    bounds = np.searchsorted(parts[order], np.arange(k + 1))
+    local = np.empty(len(parts), dtype=np.int64)
+    local[order] = np.arange(len(parts)) - bounds[parts[order]]
+
+    inside = np.flatnonzero(parts[u] == parts[v])
+    inside = inside[np.argsort(parts[u[inside]], kind="stable")]
+    ebounds = np.searchsorted(parts[u[inside]], np.arange(k + 1))
+    shards = []
+    for i in range(k):
+        sel = inside[ebounds[i]:ebounds[i + 1]]
+        shards.append((order[bounds[i]:bounds[i + 1]], local[u[sel]], local[v[sel]], w[sel]))
+    return shards
+
+
+async def solve_shards(shards, total_time, seed, client=None, concurrency=4, weighted=True):
+    """Solves (nodes, su, sv, sw) shards concurrently; returns [(nodes, spins, timing)]."""
+    sem = asyncio.Semaphore(max(1, concurrency))
+    loop = asyncio.get_running_loop()
+    executor = None if client is not None else ThreadPoolExecutor(max_workers=max(1, concurrency))
+
+    async def run(idx, nodes, su, sv, sw):
+        sw = sw if weighted else None
+        async with sem:
+            start = time.perf_counter()
+            if client is not None:
+                body = encode_solve_json(len(nodes), su, sv, sw, total_time=total_time, seed=seed)
+                res = await client.solve(body)
+            else:
+                payload = {"graph": {"N": len(nodes), "edges": np.column_stack([su, sv]), "weights": sw},
+                           "control": {"total_time": total_time}, "seed": seed}
+                res = await loop.run_in_executor(executor, solve_local, payload)
+            latency = time.perf_counter() - start
+        spins = np.asarray(res["outputs"]["spins"], dtype=np.float64)
+        timing = {"shard": idx, "nodes": len(nodes), "edges": len(su), "latency": latency,
+                  "server_time": res.get("TIMING", {}).get("total_wall_time", 0.0),
+                  "cut": res.get("metrics", {}).get("cut", 0.0)}
+        return nodes, spins, timing
+
+    try:
+        return await asyncio.gather(*(run(i, *shard) for i, shard in enumerate(shards)))
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
+
+
+async def solve_partitioned_async(N, u, v, w=None, cap=MAX_NODES, total_time=35.0, seed=42,
+                                  client=None, concurrency=4, fixup_passes=100):
+    """Solves a graph of any size by partition / concurrent solve / stitch / fix-up.
+
+    `client` is an AsyncEnchanClient; without one, shards run on the local kernel.
+    Returns the full spin vector plus a report of cut, wall time and shard timings.
+    """
+    start_wall = time.perf_counter()
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    weighted = w is not None
+    w = np.asarray(w, dtype=np.float64) if weighted else np.ones(len(u))
+
+    t0 = time.perf_counter()
+    parts, csr = partition_graph(N, u, v, w, cap, seed=seed)
+    k = int(parts.max()) + 1
+    shards = split_shards(u, v, w, parts, k)
+    partition_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results = await solve_shards(shards, total_time, seed, client, concurrency, weighted)
+    solve_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    spins = np.ones(N)
+    for nodes, shard_spins, _ in results:
+        spins[nodes] = shard_spins
+    cut_shards = cut_value(u, v, w, spins)
+    spins, shard_flips = align_shards(u, v, w, parts, spins, k)
+    cut_aligned = cut_value(u, v, w, spins)
+    boundary = np.zeros(N, dtype=bool)
+    crossing = parts[u] != parts[v]
+    boundary[u[crossing]] = True
+    boundary[v[crossing]] = True
+    spins, node_flips = local_search(csr, spins, boundary, fixup_passes)
+    cut_final = cut_value(u, v, w, spins)
+    stitch_time = time.perf_counter() - t0
+
+    return {
+        "spins": spins,
+        "report": {
+            "N": N, "E": len(u), "shards": k, "cap": cap,
+            "cross_edges": int(crossing.sum()), "boundary_nodes": int(boundary.sum()),
+            "cut": cut_final, "cut_shards": cut_shards, "cut_aligned": cut_aligned,
+            "shard_flips": shard_flips, "node_flips": node_flips,
+            "partition_time": partition_time, "solve_time": solve_time, "stitch_time": stitch_time,
+            "wall_time": time.perf_counter() - start_wall,
+            "shard_timings": [t for _, _, t in results],
+        },
+    }
+
+
+def solve_partitioned(N, u, v, w=None, **kwargs):
+    """Synchronous wrapper around `solve_partitioned_async`."""
+    return asyncio.run(solve_partitioned_async(N, u, v, w, **kwargs))
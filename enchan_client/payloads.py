@@ -0,0 +1,111 @@
+"""Request payload builders for `/v1/solve`, `/v1/scan_resonance` and `/v1/tsp`."""
+import io
+import json
+
+import numpy as np
+
+from .trace import traced
+
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+
+@traced("build", kind="solve")
+def solve_payload(N, edges=None, weights=None, density=None, total_time=35.0,
+                  seed=None, initial_state=None):
+    """Builds a `/v1/solve` (or `/v1/scan_resonance`) request body.
+
+    `total_time="auto"` is resolved by a client created with `tuning=` (see `tuning.py`).
+    """
+    graph = {"N": int(N)}
+    if edges is not None:
+        graph["edges"] = [[int(u), int(v)] for u, v in edges]
+    if weights is not None:
+        graph["weights"] = [float(w) for w in weights]
+    if density is not None:
+        graph["density"] = float(density)
+    payload = {"graph": graph, "control": {"total_time": total_time if total_time == "auto" else float(total_time)}}
+    if initial_state is not None:
+        payload["initial_state"] = [float(x) for x in initial_state]
+    if seed is not None:
+        payload["seed"] = int(seed)
+    return payload
+
+
+@traced("build", kind="tsp")
+def tsp_payload(cities, use_earth_metric=True, seed=314, K=None,
+                industrial_strict=True, use_2opt=True):
+    """Builds a `/v1/tsp` request body from `[[lat, lon], ...]` coordinates."""
+    return {
+        "cities": [[float(a), float(b)] for a, b in cities],
+        "use_earth_metric": bool(use_earth_metric),
+        "seed": int(seed),
+        "K": K,
+        "industrial_strict": bool(industrial_strict),
+        "use_2opt": bool(use_2opt),
+    }
+
+
+# ==========================================
+# Array -> JSON Encoding
+# ==========================================
+def _digit_counts(values):
+    n = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 19):
+        n += values >= _POW10[k]
+    return n
+
+
+def encode_edges_json(u, v):
+    """Renders `[[u,v],...]` as JSON bytes straight from integer arrays.
+
+    Digits are scattered into a preallocated byte buffer with vectorized
+    arithmetic, so no per-edge Python objects are created.
+    """
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    if len(u) == 0:
+        return b"[]"
+    if min(u.min(), v.min()) < 0:
+        raise ValueError("Node ids must be non-negative.")
+    nu, nv = _digit_counts(u), _digit_counts(v)
+    row_len = nu + nv + 4  # '[' u ',' v ']' ','
+    row_start = np.concatenate([[1], 1 + np.cumsum(row_len)[:-1]])
+    buf = np.empty(int(row_len.sum()) + 1, dtype=np.uint8)
+    buf[0] = ord("[")
+    buf[row_start] = ord("[")
+    buf[row_start + 1 + nu] = ord(",")
+    buf[row_start + row_len - 2] = ord("]")
+    buf[row_start + row_len - 1] = ord(",")
+    for values, ndig, first in ((u, nu, row_start + 1), (v, nv, row_start + 2 + nu)):
+        for k in range(int(ndig.max())):
+            m = ndig > k
+            buf[(first + ndig - 1 - k)[m]] = 48 + (values[m] // _POW10[k]) % 10
+    buf[-1] = ord("]")
+    return buf.tobytes()
+
+
+def encode_floats_json(values):
+    """Round-trip JSON list of floats (17 significant digits, one savetxt row)."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return b"[]"
+    if not np.isfinite(values).all():
+        raise ValueError("Weights must be finite.")
+    buf = io.BytesIO()
+    np.savetxt(buf, values[None], fmt="%.17g", delimiter=",", newline="]")
+    return b"[" + buf.getvalue()
+
+
+@traced("encode", format="json")
+def encode_solve_json(N, u, v, w=None, total_time=35.0, seed=None, initial_state=None):
+    """Builds the JSON body of a `/v1/solve` request directly from edge arrays."""
+    parts = [b'{"graph":{"N":', str(int(N)).encode(), b',"edges":', encode_edges_json(u, v)]
+    if w is not None:
+        parts += [b',"weights":', encode_floats_json(w)]
+    parts += [b'},"control":', json.dumps({"total_time": float(total_time)}).encode()]
+    if initial_state is not None:
+        parts += [b',"initial_state":', encode_floats_json(initial_state)]
+    if seed is not None:
+        parts += [b',"seed":', str(int(seed)).encode()]
+    parts.append(b"}")
+    return b"".join(parts)
@@ -0,0 +1,63 @@
+"""Token-bucket rate limiting and 429-aware backoff for the Enchan API."""
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by sync and asyncio callers.
+
+    `reserve()` books the next token and returns how long the caller must wait
+    before sending, so sync code can `time.sleep()` and async code can
+    `await asyncio.sleep()` on the same bucket.
+    """
+
+    def __init__(self, rate=1.0, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be > 0 requests/s.")
+        self.rate = float(rate)
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes one token (possibly borrowing from the future); returns wait seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1.0
+            wait = 0.0 if self._tokens >= 0.0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def try_acquire(self):
+        """Takes one token only if available now; returns 0.0, or the seconds until one is."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1.0 and now >= self._paused_until:
+                self._tokens -= 1.0
+                return 0.0
+            return max((1.0 - self._tokens) / self.rate, self._paused_until - now)
+
+    def pause(self, seconds):
+        """Blocks all callers for `seconds` (used after a 429) and drains the bucket."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self._stamp = now
+
+
+def backoff_delay(attempt, retry_after=None, base=0.5, cap=30.0):
+    """Delay before retry `attempt` (0-based): Retry-After if given, else jittered exponential."""
+    if retry_after is not None:
+        try:
+            return min(cap, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+    delay = min(cap, base * (2 ** attempt))
+    return delay * (0.5 + random.random() / 2)
@@ -0,0 +1,287 @@
+"""Max-Cut kernelization: shrink a graph before solving, then expand exactly.
+
+Reductions (all exact for weighted Max-Cut):
+    * isolated nodes are dropped (any spin);
+    * a leaf x on edge (x, y, w) is folded: s_x = -s_y if w > 0 else s_y,
+      contributing max(w, 0) to the cut;
+    * a degree-2 node x between a and b (weights w1, w2) is folded into the
+      edge (a, b, max(w1, w2) - max(0, w1 + w2)) plus a constant
+      max(0, w1 + w2), so chains collapse into single weighted edges.
+
+Folds run in vectorized rounds (degree-2 folds on a random independent set),
+and every round is recorded so `Reduction.expand` can rebuild the full
+assignment in reverse. The remaining core is split into connected
+components, which are packed into requests of at most `cap` nodes.
+"""
+import asyncio
+import time
+
+import numpy as np
+
+from .graph import MAX_NODES
+from .kernel import cut_value
+from .partition import solve_partitioned_async, solve_shards
+
+
+# ==========================================
+# Edge Utilities
+# ==========================================
+def coalesce(u, v, w):
+    """Canonical (u < v) edges with parallel edges summed; self-loops and zero weights dropped."""
+    a, b = np.minimum(u, v), np.maximum(u, v)
+    keep = a != b
+    a, b, w = a[keep], b[keep], w[keep]
+    if len(a) == 0:
+        return a, b, w
+    order = np.lexsort((b, a))
+    a, b, w = a[order], b[order], w[order]
+    first = np.concatenate([[True], (a[1:] != a[:-1]) | (b[1:] != b[:-1])])
+    idx = np.flatnonzero(first)
+    w = np.add.reduceat(w, idx)
+    a, b = a[idx], b[idx]
+    nz = w != 0
+    return a[nz], b[nz], w[nz]
+
+
+def connected_components(N, u, v):
+    """Component label (smallest member id) of every node, by hook-and-compress."""
+    labels = np.arange(N)
+    while True:
+        lu, lv = labels[u], labels[v]
+        low = np.minimum(lu, lv)
+        hooked = labels.copy()
+        np.minimum.at(hooked, lu, low)
+        np.minimum.at(hooked, lv, low)
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, labels):
+            return labels
+        labels = hooked
+
+
+# ==========================================
+# Reduction
+# ==========================================
+class Reduction:
+    """Reduced core graph plus the fold log needed to expand its solution."""
+
+    def __init__(self, N, E, core_nodes, u, v, w, offset, steps, stats):
+        self.N = N
+        self.E = E
+        # Original ids of the core nodes; core edges use 0..len(core_nodes)-1
+        self.core_nodes = core_nodes
+        self.u = u
+        self.v = v
+        self.w = w
+        self.offset = offset
+        self.steps = steps
+        self.stats = stats
+
+    @property
+    def core_N(self):
+        return len(self.core_nodes)
+
+    @property
+    def ratio(self):
+        """Fraction of nodes left to solve."""
+        return self.core_N / max(self.N, 1)
+
+    def expand(self, core_spins):
+        """Full-graph spins from core spins (cut = core cut + offset)."""
+        s = np.ones(self.N)
+        s[self.core_nodes] = core_spins
+        for step in reversed(self.steps):
+            if step[0] == "leaf":
+                _, x, y, rel = step
+                s[x] = rel * s[y]
+            else:
+                _, x, a, b, w1, w2 = step
+                same = s[a] == s[b]
+                s[x] = np.where(same, np.where(w1 + w2 > 0, -s[a], s[a]), np.where(w1 >= w2, -s[a], -s[b]))
+        return s
+
+
+def _fold_leaves(u, v, w, deg):
+    lu, lv = deg[u] == 1, deg[v] == 1
+    leaf_edge = lu | lv
+    if not leaf_edge.any():
+        return None
+    eu, ev, ew = u[leaf_edge], v[leaf_edge], w[leaf_edge]
+    # Leaf pairs (isolated edges): fold the larger id into the smaller one
+    x = np.where(lv[leaf_edge], ev, eu)
+    y = np.where(lv[leaf_edge], eu, ev)
+    step = ("leaf", x, y, np.where(ew > 0, -1.0, 1.0))
+    offset = float(np.maximum(ew, 0).sum())
+    return step, offset, u[~leaf_edge], v[~leaf_edge], w[~leaf_edge]
+
+
+def _fold_chains(N, u, v, w, deg, rng):
+    is_two = deg == 2
+    if not is_two.any():
+        return None
+    # Independent set of degree-2 nodes: keep x unless a degree-2 neighbour has higher priority
+    prio = rng.permutation(N)
+    beaten = np.zeros(N, dtype=bool)
+    both = is_two[u] & is_two[v]
+    bu, bv = u[both], v[both]
+    beaten[np.where(prio[bu] < prio[bv], bu, bv)] = True
+    chosen = is_two & ~beaten
+
+    ends = np.concatenate([u, v])
+    other = np.concatenate([v, u])
+    ew = np.concatenate([w, w])
+    eid = np.concatenate([np.arange(len(u))] * 2)
+    sel = chosen[ends]
+    ends, other, ew, eid = ends[sel], other[sel], ew[sel], eid[sel]
+    order = np.argsort(ends, kind="stable")
+    ends, other, ew, eid = ends[order], other[order], ew[order], eid[order]
+
+    x, a, b = ends[0::2], other[0::2], other[1::2]
+    w1, w2 = ew[0::2], ew[1::2]
+    base = np.maximum(0.0, w1 + w2)
+    keep = np.ones(len(u), dtype=bool)
+    keep[eid] = False
+    u = np.concatenate([u[keep], a])
+    v = np.concatenate([v[keep], b])
+    w = np.concatenate([w[keep], np.maximum(w1, w2) - base])
+    return ("chain", x, a, b, w1, w2), float(base.sum()), u, v, w
+
+
+def kernelize(N, u, v, w=None, seed=0, max_rounds=10000):
+    """Applies leaf/chain folding until no rule fires; returns a Reduction."""
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    w = np.ones(len(u)) if w is None else np.asarray(w, dtype=np.float64)
+    E = len(u)
+    rng = np.random.default_rng(seed)
+    steps, offset = [], 0.0
+    stats = {"leaves": 0, "chains": 0, "rounds": 0}
+
+    u, v, w = coalesce(u, v, w)
+    isolated_in = int(N - np.count_nonzero(np.bincount(np.concatenate([u, v]), minlength=N)))
+    for _ in range(max_rounds):
+        deg = np.bincount(np.concatenate([u, v]), minlength=N)
+        folded = _fold_leaves(u, v, w, deg)
+        kind = "leaves"
+        if folded is None:
+            folded = _fold_chains(N, u, v, w, deg, rng)
+            kind = "chains"
+        if folded is None:
+            break
+        step, gain, u, v, w = folded
+        u, v, w = coalesce(u, v, w)
+        steps.append(step)
+        offset += gain
+        stats[kind] += len(step[1])
+        stats["rounds"] += 1
+
+    deg = np.bincount(np.concatenate([u, v]), minlength=N)
+    core_nodes = np.flatnonzero(deg > 0)
+    local = np.full(N, -1, dtype=np.int64)
+    local[core_nodes] = np.arange(len(core_nodes))
+    stats["isolated"] = isolated_in
+    return Reduction(N, E, core_nodes, local[u], local[v], w, offset, steps, stats)
+
+
+def pack_components(reduction, cap=MAX_NODES):
+    """Groups core components into shards of at most `cap` nodes (first-fit decreasing).
+
+    Returns (shards, oversized): `shards` are (nodes, su, sv, sw) tuples in core
+    ids; `oversized` lists node arrays of components larger than `cap`.
+    """
+    n = reduction.core_N
+    u, v, w = reduction.u, reduction.v, reduction.w
+    labels = connected_components(n, u, v)
+    comp_ids, comp_of = np.unique(labels, return_inverse=True)
+    sizes = np.bincount(comp_of)
+
+    oversized = [np.flatnonzero(comp_of == c) for c in np.flatnonzero(sizes > cap)]
+    bins, loads = [], []
+    bin_of = np.full(len(comp_ids), -1, dtype=np.int64)
+    for c in np.argsort(-sizes, kind="stable"):
+        if sizes[c] > cap:
+            continue
+        for i, load in enumerate(loads):
+            if load + sizes[c] <= cap:
+                loads[i] += sizes[c]
+                bin_of[c] = i
+                break
+        else:
+            loads.append(sizes[c])
+            bin_of[c] = len(loads) - 1
+
+    node_bin = bin_of[comp_of]
+    shards = []
+    local = np.empty(n, dtype=np.int64)
+    for i in range(len(loads)):
+        nodes = np.flatnonzero(node_bin == i)
+        local[nodes] = np.arange(len(nodes))
+        inside = node_bin[u] == i
+        shards.append((nodes, local[u[inside]], local[v[inside]], w[inside]))
+    return shards, oversized, len(comp_ids)
+
+
+# ==========================================
+# Driver
+# ==========================================
+async def solve_reduced_async(N, u, v, w=None, cap=MAX_NODES, total_time=35.0, seed=42,
+                              client=None, concurrency=4):
+    """Kernelize, solve the core components concurrently, expand to all N nodes.
+
+    `client` is an AsyncEnchanClient; without one, the local kernel is used.
+    Components above `cap` go through the partition driver.
+    """
+    start_wall = time.perf_counter()
+    t0 = time.perf_counter()
+    red = kernelize(N, u, v, w, seed=seed)
+    shards, oversized, n_components = pack_components(red, cap)
+    reduce_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    core_spins = np.ones(red.core_N)
+    timings = []
+    if shards:
+        for nodes, spins, timing in await solve_shards(shards, total_time, seed, client, concurrency, True):
+            core_spins[nodes] = spins
+            timings.append(timing)
+    local = np.empty(red.core_N, dtype=np.int64)
+    for nodes in oversized:
+        local[nodes] = np.arange(len(nodes))
+        inside = np.isin(red.u, nodes)
+        res = await solve_partitioned_async(len(nodes), local[red.u[inside]], local[red.v[inside]],
+                                            red.w[inside], cap=cap, total_time=total_time, seed=seed,
+                                            client=client, concurrency=concurrency)
+        core_spins[nodes] = res["spins"]
+        timings.extend(res["report"]["shard_timings"])
+    solve_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    spins = red.expand(core_spins)
+    expand_time = time.perf_counter() - t0
+
+    uu = np.asarray(u, dtype=np.int64)
+    vv = np.asarray(v, dtype=np.int64)
+    ww = np.ones(len(uu)) if w is None else np.asarray(w, dtype=np.float64)
+    return {
+        "spins": spins,
+        "report": {
+            "N": N, "E": red.E, "core_N": red.core_N, "core_E": len(red.u),
+            "reduction_ratio": red.ratio, "offset": red.offset,
+            "leaves_folded": red.stats["leaves"], "chains_folded": red.stats["chains"],
+            "isolated_dropped": red.stats["isolated"], "rounds": red.stats["rounds"],
+            "components": n_components, "requests": len(timings),
+            "core_cut": cut_value(red.u, red.v, red.w, core_spins) if red.core_N else 0.0,
+            "cut": cut_value(uu, vv, ww, spins),
+            "reduce_time": reduce_time, "solve_time": solve_time, "expand_time": expand_time,
+            "wall_time": time.perf_counter() - start_wall,
+            "shard_timings": timings,
+        },
+    }
+
+
+def solve_reduced(N, u, v, w=None, **kwargs):
+    """Synchronous wrapper around `solve_reduced_async`."""
+    return asyncio.run(solve_reduced_async(N, u, v, w, **kwargs))
@@ -0,0 +1,360 @@
+"""Performance regression suite: fixed scenarios, stored baselines, bootstrap comparison.
+
+Scenarios are deterministic requests (the whitepaper's S-HASH payloads,
+generated graphs, TSP instances and `.enc` programs). Each one is run
+`repeats` times after a warm-up; a run records the latency distribution,
+the solver result (cut or tour length plus a result hash) and the peak
+allocation of one extra traced call.
+
+Baselines are versioned JSON files holding the raw latency samples. A new
+run is compared per scenario with a one-sided Mann–Whitney U test on the
+two sample sets; the p50 latency ratio and the mean throughput ratio are
+reported with 95% bootstrap intervals. A scenario regresses only when the
+ratio is worse than `1 + threshold`, the bootstrap interval excludes
+no-change and the rank test is significant at `alpha`. Comparisons need at
+least MIN_SAMPLES runs on both sides; fewer are reported as "too few
+samples" and never fail. Result drift (different cut or hash for the same
+deterministic request) and peak-memory growth (beyond both the ratio and
+MEMORY_FLOOR_MB) are reported as well.
+"""
+import hashlib
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+
+from .kernel import solve_local
+from .payloads import solve_payload, tsp_payload
+from .tsp import solve_tsp_local
+
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MEMORY_THRESHOLD = 0.25
+DEFAULT_REPEATS = 20
+# Below this many samples per side the rank test has no power and the intervals are too narrow
+MIN_SAMPLES = 10
+DEFAULT_ALPHA = 0.01
+# Peak memory must also grow by more than this many MB to count as a regression
+MEMORY_FLOOR_MB = 1.0
+BOOTSTRAP_SAMPLES = 2000
+SHELL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shell")
+
+# kind selects the handler; params build the request; suites lists where it runs
+Scenario = namedtuple("Scenario", "name kind params suites")
+
+SCENARIOS = (
+    # Whitepaper §4.2 reproducibility payloads
+    Scenario("solve-n3000-d0.05", "solve", {"N": 3000, "density": 0.05, "total_time": 5.0, "seed": 42},
+             ("quick", "full")),
+    Scenario("solve-n3000-d0.5", "solve", {"N": 3000, "density": 0.5, "total_time": 5.0, "seed": 42}, ("full",)),
+    Scenario("solve-n1000-d0.01", "solve", {"N": 1000, "density": 0.01, "total_time": 35.0, "seed": 42},
+             ("quick", "full")),
+    Scenario("solve-n2000-d0.2", "solve", {"N": 2000, "density": 0.2, "total_time": 35.0, "seed": 7}, ("full",)),
+    Scenario("tsp-200", "tsp", {"cities": 200, "seed": 314}, ("quick", "full")),
+    Scenario("tsp-2000", "tsp", {"cities": 2000, "seed": 314}, ("full",)),
+    Scenario("shell-ring64", "shell", {"nodes": 64, "seed": 1}, ("quick", "full")),
+    Scenario("shell-ring1200", "shell", {"nodes": 1200, "seed": 1}, ("full",)),
+)
+
+
+def select(suite="quick", only=None, scenarios=SCENARIOS):
+    """Scenarios of `suite` ("all" for every one) whose name contains any of `only`."""
+    picked = [s for s in scenarios if suite == "all" or suite in s.suites]
+    if only:
+        picked = [s for s in picked if any(key in s.name for key in only)]
+    return picked
+
+
+# ==========================================
+# Backends & Handlers
+# ==========================================
+def local_backend():
+    """`call(kind, payload)` on the in-process reference kernels (payload may be JSON bytes)."""
+    executors = {"solve": solve_local, "tsp": solve_tsp_local}
+
+    def call(kind, payload):
+        if isinstance(payload, (bytes, bytearray)):
+            payload = json.loads(payload)
+        return executors[kind](payload)
+    return call
+
+
+def client_backend(client):
+    """`call(kind, payload)` through an EnchanClient."""
+    return lambda kind, payload: client.post(kind, payload)
+
+
+def _digest(values):
+    return hashlib.sha256(np.asarray(values, dtype=np.int64).tobytes()).hexdigest()
+
+
+def prepare_solve(params, call):
+    payload = solve_payload(params["N"], density=params["density"], total_time=params["total_time"],
+                            seed=params["seed"])
+    edges = params["N"] * (params["N"] - 1) / 2 * params["density"]
+
+    def job():
+        res = call("solve", payload)
+        s_hash = ((res.get("audit") or {}).get("HASH") or {}).get("S") \
+            or (res.get("audit_public") or {}).get("result_hash")
+        return {"cut": float(res["metrics"]["cut"]), "hash": s_hash, "units": edges}
+    return job
+
+
+def prepare_tsp(params, call):
+    rng = np.random.default_rng(params["seed"])
+    n = params["cities"]
+    cities = np.column_stack([rng.uniform(24.0, 46.0, n), rng.uniform(123.0, 146.0, n)])
+    payload = tsp_payload(cities.tolist(), seed=params["seed"])
+
+    def job():
+        outputs = call("tsp", payload)["outputs"]
+        return {"distance": float(outputs["distance"]), "hash": _digest(outputs["order"]), "units": n}
+    return job
+
+
+def ring_program(nodes, seed):
+    """`.enc` script: a biased ring with random ±1 couplings and chords, then `run`."""
+    rng = np.random.default_rng(seed)
+    lines = ["node 0 1.0"]
+    lines += [f"edge {i} {(i + 1) % nodes} {w:g}" for i, w in enumerate(rng.choice([-1.0, 1.0], nodes))]
+    lines += [f"edge {i} {(i + nodes // 3) % nodes} -0.5" for i in range(0, nodes, 3)]
+    lines.append("run")
+    return "\n".join(lines)
+
+
+def prepare_shell(params, call):
+    """Engine path of the web shell: bulk parse, JSON encode, solve and bit decode.
+
+    The engine lives in `shell/enc_engine.py` (not a package) and is imported on first use.
+    """
+    import asyncio
+    if SHELL_DIR not in sys.path:
+        sys.path.insert(0, SHELL_DIR)
+    from enc_engine import EncEngine
+
+    text = ring_program(params["nodes"], params["seed"])
+    last = {}
+
+    async def solve(body):
+        last["res"] = call("solve", body)
+        return last["res"]
+
+    def job():
+        engine = EncEngine(solve=solve)
+        asyncio.run(engine.run_script(text, "regress"))
+        bits, _ = engine.decode_result(last["res"])
+        return {"bits": hashlib.sha256(bytes(bits)).hexdigest(), "hash": last["res"]["audit_public"]["result_hash"],
+                "units": len(text.splitlines())}
+    return job
+
+
+HANDLERS = {"solve": prepare_solve, "tsp": prepare_tsp, "shell": prepare_shell}
+
+
+# ==========================================
+# Runner
+# ==========================================
+def _peak_mb(job):
+    tracemalloc.start()
+    try:
+        job()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def run_scenario(scenario, call, repeats=DEFAULT_REPEATS, warmup=1, memory=True, handlers=None):
+    """Latency samples, distribution summary, result and peak memory of one scenario."""
+    prepare = (handlers or HANDLERS)[scenario.kind]
+    job = prepare(scenario.params, call)
+    for _ in range(warmup):
+        job()
+    latency, results = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        results.append(job())
+        latency.append(time.perf_counter() - start)
+    lat = np.array(latency)
+    result = {k: v for k, v in results[-1].items() if k != "units"}
+    out = {
+        "kind": scenario.kind,
+        "params": scenario.params,
+        "latency": latency,
+        "p50": float(np.percentile(lat, 50)),
+        "p95": float(np.percentile(lat, 95)),
+        "mean": float(lat.mean()),
+        "throughput": results[-1]["units"] / float(lat.mean()),
+        "result": result,
+        "deterministic": all({k: v for k, v in r.items() if k != "units"} == result for r in results),
+        "peak_mb": _peak_mb(job) if memory else None,
+    }
+    return out
+
+
+def environment(backend):
+    return {
+        "backend": backend,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(scenarios, call, backend="local", repeats=DEFAULT_REPEATS, warmup=1, memory=True, handlers=None,
+              progress=None):
+    """Runs every scenario; returns a baseline-format dict."""
+    report = {"version": BASELINE_VERSION, "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+              "env": environment(backend), "repeats": repeats, "scenarios": {}}
+    for scenario in scenarios:
+        report["scenarios"][scenario.name] = run_scenario(scenario, call, repeats, warmup, memory, handlers)
+        if progress:
+            progress(scenario.name, report["scenarios"][scenario.name])
+    return report
+
+
+# ==========================================
+# Baselines
+# ==========================================
+def save_baseline(path, report):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_baseline(path):
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Baseline {path} has version {report.get('version')}, expected {BASELINE_VERSION}.")
+    return report
+
+
+# ==========================================
+# Comparison
+# ==========================================
+def bootstrap_ratio(new, old, stat=np.median, samples=BOOTSTRAP_SAMPLES, level=0.95, seed=0):
+    """stat(new) / stat(old) with a percentile-bootstrap confidence interval."""
+    new, old = np.asarray(new, dtype=np.float64), np.asarray(old, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    a = stat(new[rng.integers(0, len(new), (samples, len(new)))], axis=1)
+    b = stat(old[rng.integers(0, len(old), (samples, len(old)))], axis=1)
+    tail = (1.0 - level) / 2 * 100
+    lo, hi = np.percentile(a / b, [tail, 100 - tail])
+    return float(stat(new) / stat(old)), float(lo), float(hi)
+
+
+def mann_whitney(new, old):
+    """One-sided Mann–Whitney U p-values (normal approximation, tie-corrected): (p_slower, p_faster)."""
+    new, old = np.asarray(new, dtype=np.float64), np.asarray(old, dtype=np.float64)
+    n1, n2 = len(new), len(old)
+    values = np.concatenate([new, old])
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    # Mid-ranks: each tied group gets the mean of the ranks it spans
+    ranks = (np.cumsum(counts) - (counts - 1) / 2.0)[inverse]
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    var = n1 * n2 / 12.0 * ((n + 1) - float((counts ** 3 - counts).sum()) / (n * (n - 1)))
+    if var <= 0:
+        return 1.0, 1.0
+    z = (u - n1 * n2 / 2.0) / math.sqrt(var)
+    sf = lambda x: 0.5 * math.erfc(x / math.sqrt(2.0))
+    return sf(z - 0.5 / math.sqrt(var)), sf(-z - 0.5 / math.sqrt(var))
+
+
+def _verdict(ratio, lo, hi, p_slower, p_faster, threshold, alpha):
+    """Ratio of a cost (>1 is worse): regressed / improved only if material and significant."""
+    if ratio > 1 + threshold and lo > 1.0 and p_slower < alpha:
+        return "regressed"
+    if ratio < 1 / (1 + threshold) and hi < 1.0 and p_faster < alpha:
+        return "improved"
+    return "ok"
+
+
+def compare_scenario(new, old, threshold=DEFAULT_THRESHOLD, memory_threshold=DEFAULT_MEMORY_THRESHOLD,
+                     alpha=DEFAULT_ALPHA):
+    latency = bootstrap_ratio(new["latency"], old["latency"], np.median)
+    # Throughput is work / mean latency, so its drop is the mean-latency ratio
+    cost = bootstrap_ratio(new["latency"], old["latency"], np.mean)
+    p_slower, p_faster = mann_whitney(new["latency"], old["latency"])
+    enough = min(len(new["latency"]), len(old["latency"])) >= MIN_SAMPLES
+    row = {
+        "p50_ratio": latency,
+        "throughput_ratio": (1 / cost[0], 1 / cost[2], 1 / cost[1]),
+        "p_value": p_slower,
+        "samples": (len(new["latency"]), len(old["latency"])),
+        "latency": _verdict(*latency, p_slower, p_faster, threshold, alpha) if enough else "too few samples",
+        "throughput": _verdict(*cost, p_slower, p_faster, threshold, alpha) if enough else "too few samples",
+        "result_match": new["result"] == old["result"],
+        "memory": "ok",
+    }
+    if new.get("peak_mb") and old.get("peak_mb"):
+        row["memory_ratio"] = new["peak_mb"] / old["peak_mb"]
+        grew = new["peak_mb"] - old["peak_mb"]
+        if row["memory_ratio"] > 1 + memory_threshold and grew > MEMORY_FLOOR_MB:
+            row["memory"] = "regressed"
+    return row
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD, memory_threshold=DEFAULT_MEMORY_THRESHOLD,
+            allow_drift=False, alpha=DEFAULT_ALPHA):
+    """Per-scenario comparison plus `failed`, the names that regressed (or drifted)."""
+    rows, failed = {}, []
+    for name, new in report["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            rows[name] = {"status": "new"}
+            continue
+        row = compare_scenario(new, old, threshold, memory_threshold, alpha)
+        verdicts = (row["latency"], row["throughput"], row["memory"])
+        drift = not row["result_match"] and not allow_drift
+        if "regressed" in verdicts or drift:
+            row["status"] = "regressed" if "regressed" in verdicts else "drift"
+            failed.append(name)
+        elif "too few samples" in verdicts:
+            row["status"] = "too few samples"
+        else:
+            row["status"] = "improved" if "improved" in verdicts else "ok"
+        rows[name] = row
+    missing = sorted(set(baseline["scenarios"]) - set(report["scenarios"]))
+    return {"scenarios": rows, "failed": failed, "missing": missing, "threshold": threshold,
+            "env_match": report["env"] == baseline["env"]}
+
+
+def format_run(report):
+    lines = [f"{'Scenario':<20} {'p50':>9} {'p95':>9} {'Throughput':>12} {'Peak MB':>8}  Result"]
+    for name, st in report["scenarios"].items():
+        result = ", ".join(f"{k}={v:.6g}" if isinstance(v, float) else f"{k}={str(v)[:12]}"
+                           for k, v in st["result"].items())
+        peak = f"{st['peak_mb']:.1f}" if st["peak_mb"] is not None else "-"
+        lines.append(f"{name:<20} {st['p50']:>8.3f}s {st['p95']:>8.3f}s {st['throughput']:>12.4g} {peak:>8}  "
+                     f"{result}{'' if st['deterministic'] else ' (NON-DETERMINISTIC)'}")
+    return "\n".join(lines)
+
+
+def format_comparison(comparison):
+    lines = [f"{'Scenario':<20} {'p50 ratio [95% CI]':>26} {'Throughput [95% CI]':>26} {'p':>7} {'Mem':>6}  Status"]
+    for name, row in comparison["scenarios"].items():
+        if row["status"] == "new":
+            lines.append(f"{name:<20} {'(not in baseline)':>26}")
+            continue
+        r, lo, hi = row["p50_ratio"]
+        t, tlo, thi = row["throughput_ratio"]
+        mem = f"x{row['memory_ratio']:.2f}" if "memory_ratio" in row else "-"
+        status = row["status"].upper() + ("" if row["result_match"] else " (result changed)")
+        lines.append(f"{name:<20} {f'x{r:.3f} [{lo:.3f}, {hi:.3f}]':>26} {f'x{t:.3f} [{tlo:.3f}, {thi:.3f}]':>26} "
+                     f"{row['p_value']:>7.4f} {mem:>6}  {status}")
+    for name in comparison["missing"]:
+        lines.append(f"{name:<20} {'(not run)':>26}")
+    return "\n".join(lines)
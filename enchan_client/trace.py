@@ -0,0 +1,263 @@
+"""Per-phase timing spans for clients, the shell and benchmarks.
+
+A span is one timed phase of a request:
+
+    build     payload construction (graph generation, program parsing)
+    encode    JSON or binary serialization of the request body
+    throttle  client-side waits (rate limiter, retry backoff)
+    connect   TCP/TLS connection setup (only when the pool opens a socket)
+    upload    sending request line, headers and body
+    server    waiting for the first response byte (server compute + one round trip)
+    download  reading the response body
+    decode    JSON parsing of the response
+    verify    local post-processing / audit of the result
+
+Spans are recorded on the active tracer (`set_tracer`, `tracing()`, or the
+ENCHAN_TRACE=path.jsonl environment variable, which appends the process's
+spans to that file at exit). The default tracer records nothing. Spans are
+written as JSON lines (one record per span, tagged with a run id, so runs
+can be appended to one file) or as Chrome trace events for chrome://tracing
+and Perfetto; `summarize` aggregates JSON lines across runs per phase.
+
+Standard library only.
+"""
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+PHASES = ("build", "encode", "throttle", "connect", "upload", "server", "download", "decode", "verify")
+
+
+class Tracer:
+    """Thread-safe span recorder for one run."""
+
+    enabled = True
+
+    def __init__(self, run=None, **meta):
+        self.run = run or uuid.uuid4().hex[:12]
+        self.meta = meta
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # perf_counter for durations, anchored to the wall clock so runs line up
+        self._origin = time.perf_counter()
+        self._epoch = time.time()
+
+    def add(self, name, start, end, **args):
+        """Records a span from two `time.perf_counter()` readings."""
+        scope = getattr(self._local, "args", None)
+        if scope:
+            args = dict(scope, **args)
+        record = {"run": self.run, "name": name, "ts": self._epoch + (start - self._origin),
+                  "dur": max(0.0, end - start), "tid": threading.get_ident(), "args": args}
+        with self._lock:
+            self.spans.append(record)
+        return record
+
+    @contextmanager
+    def span(self, name, **args):
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.add(name, start, time.perf_counter(), **args)
+
+    @contextmanager
+    def scope(self, **args):
+        """Tags every span recorded on this thread (e.g. endpoint, request id) while active."""
+        previous = getattr(self._local, "args", None)
+        self._local.args = dict(previous or {}, **args)
+        try:
+            yield
+        finally:
+            self._local.args = previous
+
+    def records(self):
+        with self._lock:
+            return list(self.spans)
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+    def write_jsonl(self, path, append=True):
+        """Writes (by default appends) one JSON object per span."""
+        with open(path, "a" if append else "w", encoding="utf-8") as f:
+            for record in self.records():
+                f.write(json.dumps(record) + "\n")
+
+    def write_chrome(self, path):
+        write_chrome(self.records(), path)
+
+
+class NullTracer:
+    """Default tracer: every call is a no-op."""
+
+    enabled = False
+    run = None
+
+    def add(self, name, start, end, **args):
+        return None
+
+    @contextmanager
+    def span(self, name, **args):
+        yield args
+
+    @contextmanager
+    def scope(self, **args):
+        yield
+
+    def records(self):
+        return []
+
+
+NULL_TRACER = NullTracer()
+_active = None
+
+
+def get_tracer():
+    """The active tracer; ENCHAN_TRACE=path.jsonl installs one that appends to `path` at exit."""
+    global _active
+    if _active is None:
+        path = os.environ.get("ENCHAN_TRACE")
+        if path:
+            _active = Tracer(source="ENCHAN_TRACE")
+            atexit.register(_active.write_jsonl, path)
+        else:
+            _active = NULL_TRACER
+    return _active
+
+
+def set_tracer(tracer):
+    """Installs `tracer` (None restores the no-op tracer); returns the previous one."""
+    global _active
+    previous = get_tracer()
+    _active = tracer or NULL_TRACER
+    return previous
+
+
+@contextmanager
+def tracing(tracer=None):
+    """Records spans on `tracer` (a fresh Tracer by default) inside the block."""
+    tracer = tracer or Tracer()
+    previous = set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
+
+
+def span(name, **args):
+    """`with span("verify"):` on the active tracer."""
+    return get_tracer().span(name, **args)
+
+
+def traced(name, **span_args):
+    """Decorator recording every call of the function as a `name` span."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with get_tracer().span(name, **span_args):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+# ==========================================
+# Export
+# ==========================================
+def load_jsonl(*paths):
+    """Span records from one or more JSON-lines files."""
+    records = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+
+def chrome_events(records):
+    """Complete ("X") trace events, one process per run and one track per thread."""
+    pids, events = {}, []
+    for r in records:
+        if r["run"] not in pids:
+            pids[r["run"]] = len(pids) + 1
+            events.append({"name": "process_name", "ph": "M", "pid": pids[r["run"]], "tid": 0,
+                           "args": {"name": f"run {r['run']}"}})
+        events.append({"name": r["name"], "cat": "enchan", "ph": "X", "ts": r["ts"] * 1e6, "dur": r["dur"] * 1e6,
+                       "pid": pids[r["run"]], "tid": r["tid"], "args": r.get("args", {})})
+    return events
+
+
+def write_chrome(records, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": chrome_events(records), "displayTimeUnit": "ms"}, f)
+
+
+# ==========================================
+# Summary
+# ==========================================
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q / 100.0
+    lo, hi = math.floor(k), math.ceil(k)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(records):
+    """Per-phase totals across runs: count, total, per-run mean, span p50/p95 and share of all phases."""
+    runs = {r["run"] for r in records}
+    phases = {}
+    for r in records:
+        phases.setdefault(r["name"], []).append(r["dur"])
+    grand = sum(sum(d) for d in phases.values())
+    order = [p for p in PHASES if p in phases] + sorted(p for p in phases if p not in PHASES)
+    out = {}
+    for name in order:
+        durs = sorted(phases[name])
+        total = sum(durs)
+        out[name] = {"count": len(durs), "total": total, "per_run": total / max(1, len(runs)),
+                     "mean": total / len(durs), "p50": _percentile(durs, 50), "p95": _percentile(durs, 95),
+                     "share": total / grand if grand > 0 else 0.0}
+    return {"runs": len(runs), "spans": len(records), "phases": out}
+
+
+def compare(summary, baseline):
+    """Per-phase change of per-run time versus a baseline summary (ratio > 1 is slower)."""
+    delta = {}
+    for name in dict.fromkeys(list(summary["phases"]) + list(baseline["phases"])):
+        new = summary["phases"].get(name, {}).get("per_run", 0.0)
+        old = baseline["phases"].get(name, {}).get("per_run", 0.0)
+        delta[name] = {"per_run": new, "baseline": old, "delta": new - old,
+                       "ratio": new / old if old > 0 else None}
+    return delta
+
+
+def format_summary(summary, baseline=None):
+    lines = [f"{summary['spans']} spans from {summary['runs']} run(s)",
+             f"{'Phase':<10} {'Count':>7} {'Per run':>10} {'Mean':>10} {'p50':>10} {'p95':>10} {'Share':>7}"
+             + (f" {'Baseline':>10} {'Change':>8}" if baseline else "")]
+    delta = compare(summary, baseline) if baseline else {}
+    for name, st in summary["phases"].items():
+        line = (f"{name:<10} {st['count']:>7} {st['per_run'] * 1e3:>8.2f}ms {st['mean'] * 1e3:>8.2f}ms "
+                f"{st['p50'] * 1e3:>8.2f}ms {st['p95'] * 1e3:>8.2f}ms {st['share'] * 100:>6.1f}%")
+        if baseline:
+            d = delta[name]
+            change = f"{(d['ratio'] - 1) * 100:+.1f}%" if d["ratio"] is not None else "new"
+            line += f" {d['baseline'] * 1e3:>8.2f}ms {change:>8}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_phases(records, names=PHASES):
+    """One-line `phase=ms` breakdown for benchmark reports."""
+    totals = {}
+    for r in records:
+        totals[r["name"]] = totals.get(r["name"], 0.0) + r["dur"]
+    return ", ".join(f"{n} {totals[n] * 1e3:.1f}ms" for n in names if n in totals)
@@ -0,0 +1,389 @@
+"""Local TSP reference solver with the `/v1/tsp` request/response contract.
+
+Also provides the vectorized distance engine (whole tours and batches of
+candidate moves) and `refine_tour`, a 2-opt / Or-opt polisher driven by
+k-nearest-neighbour candidate lists, for checking and improving returned
+orders locally. SciPy's cKDTree builds the candidate lists when installed;
+otherwise a chunked brute-force search is used (fine up to ~20k cities).
+"""
+import math
+import time
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # optional dependency
+    cKDTree = None
+
+R_EARTH = 6371.0  # Earth radius in km
+# Moves must gain more than this (km, or coordinate units) to be applied
+MOVE_EPS = 1e-9
+
+
+# ==========================================
+# Distances
+# ==========================================
+def pair_distance(a, b, earth=True):
+    """Element-wise distance between coordinate arrays a and b (broadcasting)."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if not earth:
+        return np.sqrt(((a - b) ** 2).sum(axis=-1))
+    lat1, lon1 = np.radians(a[..., 0]), np.radians(a[..., 1])
+    lat2, lon2 = np.radians(b[..., 0]), np.radians(b[..., 1])
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return R_EARTH * 2 * np.arctan2(np.sqrt(h), np.sqrt(np.maximum(0.0, 1 - h)))
+
+
+def leg_distances(coords, order, earth=True):
+    """Length of every leg of a path given as a node order."""
+    order = np.asarray(order, dtype=np.int64)
+    return pair_distance(coords[order[:-1]], coords[order[1:]], earth)
+
+
+def tour_length(coords, order, earth=True):
+    return float(leg_distances(coords, order, earth).sum())
+
+
+def close_tour(order):
+    order = [int(i) for i in order]
+    return order + order[:1] if order and order[0] != order[-1] else order
+
+
+def open_tour(order):
+    """Permutation without the closing city (accepts closed or open orders)."""
+    order = np.asarray(order, dtype=np.int64)
+    return order[:-1] if len(order) > 1 and order[0] == order[-1] else order
+
+
+def _scalar_distance(coords, earth=True):
+    """d(a, b) on city ids with plain floats, for re-checking single moves."""
+    pts = [tuple(p) for p in embed(coords, earth).tolist()]
+    if not earth:
+        return lambda a, b: math.dist(pts[a], pts[b])
+    return lambda a, b: 2.0 * R_EARTH * math.asin(min(1.0, math.dist(pts[a], pts[b]) / 2.0))
+
+
+# ==========================================
+# Candidate Lists
+# ==========================================
+def embed(coords, earth=True):
+    """Points whose Euclidean nearest neighbours match the metric (unit vectors on the sphere)."""
+    coords = np.asarray(coords, dtype=np.float64)
+    if not earth:
+        return coords
+    lat, lon = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def knn_candidates(coords, k=8, earth=True):
+    """(n, k) nearest other cities of every city, nearest first."""
+    pts = embed(coords, earth)
+    n = len(pts)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.zeros((n, 0), dtype=np.int64)
+    if cKDTree is not None:
+        _, idx = cKDTree(pts).query(pts, k=k + 1)
+        idx = idx.astype(np.int64)
+        # Drop self; with duplicate points it may not be first, else drop the last column
+        is_self = idx == np.arange(n)[:, None]
+        is_self[~is_self.any(axis=1), -1] = True
+        return idx[~is_self].reshape(n, k)
+    sq = (pts * pts).sum(axis=1)
+    out = np.empty((n, k), dtype=np.int64)
+    rows = max(1, (1 << 24) // n)
+    for lo in range(0, n, rows):
+        hi = min(n, lo + rows)
+        d2 = sq[lo:hi, None] + sq[None, :] - 2.0 * pts[lo:hi] @ pts.T
+        d2[np.arange(hi - lo), np.arange(lo, hi)] = np.inf
+        part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        out[lo:hi] = np.take_along_axis(part, np.argsort(np.take_along_axis(d2, part, axis=1), axis=1), axis=1)
+    return out
+
+
+# ==========================================
+# Batched Move Evaluation
+# ==========================================
+def batch_distance(coords, earth=True):
+    """d(a_ids, b_ids) over id arrays; great-circle distance from chords of unit vectors."""
+    axes = [np.ascontiguousarray(c) for c in embed(coords, earth).T]
+
+    def chord(a, b):
+        sq = np.zeros(len(a))
+        for c in axes:
+            diff = c[a] - c[b]
+            sq += diff * diff
+        return np.sqrt(sq)
+    if not earth:
+        return chord
+    return lambda a, b: (2.0 * R_EARTH) * np.arcsin(np.minimum(1.0, chord(a, b) * 0.5))
+
+
+def _best_per_city(delta, first, *rest):
+    """Best move per distinct `first` city, best first (the others would overlap it)."""
+    best = np.argsort(delta, kind="stable")
+    _, keep = np.unique(first[best], return_index=True)
+    best = best[np.sort(keep)]
+    return (first[best],) + tuple(r[best] for r in rest) + (delta[best],)
+
+
+def two_opt_moves(dist, tour, pos, cand, nodes=None):
+    """Improving 2-opt moves (a, b, delta), best first.
+
+    Each move replaces edges (a, succ a) and (b, succ b) with (a, b) and
+    (succ a, succ b). For every city i in `nodes` (default all) and candidate
+    neighbour j, both the successor form (a, b = i, j) and the predecessor
+    form (a, b = pred i, pred j, which links i to j) are evaluated at once with
+    `dist` from `batch_distance`.
+    """
+    n, k = cand.shape
+    nodes = np.arange(n) if nodes is None else nodes
+    i = np.repeat(nodes, k)
+    j = cand[nodes].ravel()
+    pi, pj = pos[i], pos[j]
+    succ_len = dist(tour, np.roll(tour, -1))
+    d_ij = dist(i, j)
+    a, b, delta = [], [], []
+    for step in (1, -1):
+        ni, nj = tour[(pi + step) % n], tour[(pj + step) % n]
+        # (i, succ i) sits at pos i; (pred i, i) at pos i - 1
+        ei, ej = (pi, pj) if step == 1 else ((pi - 1) % n, (pj - 1) % n)
+        d = d_ij + dist(ni, nj) - succ_len[ei] - succ_len[ej]
+        m = (d < -MOVE_EPS) & (j != ni) & (i != nj)
+        a.append(i[m] if step == 1 else ni[m])
+        b.append(j[m] if step == 1 else nj[m])
+        delta.append(d[m])
+    return _best_per_city(np.concatenate(delta), np.concatenate(a), np.concatenate(b))
+
+
+def or_opt_moves(dist, tour, pos, cand, nodes=None, max_len=3):
+    """Improving Or-opt moves (start, length, j, reversed, delta), best first.
+
+    Moves the segment of `length` cities starting at `start` between j and
+    succ j, where j is a candidate neighbour of either segment end. Only
+    segments containing a city of `nodes` (default all) are considered.
+    """
+    n, k = cand.shape
+    succ_len = dist(tour, np.roll(tour, -1))
+    moves = []
+    for L in range(1, min(max_len, n - 3) + 1):
+        if nodes is None:
+            p = np.arange(n)
+        else:
+            p = np.unique(np.concatenate([(pos[nodes] - l) % n for l in range(L)]))
+        s, e = tour[p], tour[(p + L - 1) % n]
+        prev, nxt = tour[p - 1], tour[(p + L) % n]
+        removed = succ_len[p - 1] + succ_len[(p + L - 1) % n] - dist(prev, nxt)
+        start = np.concatenate([np.repeat(s, k), np.repeat(s, k)])
+        end = np.concatenate([np.repeat(e, k), np.repeat(e, k)])
+        gain = np.concatenate([np.repeat(removed, k), np.repeat(removed, k)])
+        ps = np.concatenate([np.repeat(p, k), np.repeat(p, k)])
+        j = np.concatenate([cand[s].ravel(), cand[e].ravel()])
+        pj = pos[j]
+        sj = tour[(pj + 1) % n]
+        outside = ((pj - ps) % n >= L) & ((pj + 1 - ps) % n >= L)
+        forward = dist(j, start) + dist(end, sj)
+        backward = dist(j, end) + dist(start, sj)
+        delta = np.minimum(forward, backward) - succ_len[pj] - gain
+        m = outside & (delta < -MOVE_EPS)
+        moves.append((start[m], np.full(int(m.sum()), L), j[m], backward[m] < forward[m], delta[m]))
+    start, length, j, rev, delta = (np.concatenate(parts) for parts in zip(*moves))
+    return _best_per_city(delta, start, length, j, rev)
+
+
+# ==========================================
+# Move Application
+# ==========================================
+def _reverse(tour, pos, lo, hi):
+    """Reverses positions lo..hi (cyclic, inclusive), or the shorter complement."""
+    n = len(tour)
+    L = (hi - lo) % n + 1
+    if L > n // 2:
+        lo, hi, L = (hi + 1) % n, (lo - 1) % n, n - L
+    idx = np.arange(lo, lo + L) % n
+    tour[idx] = tour[idx][::-1]
+    pos[tour[idx]] = idx
+
+
+def _apply_two_opt(tour, pos, dist, i, j):
+    n = len(tour)
+    si, sj = tour[(pos[i] + 1) % n], tour[(pos[j] + 1) % n]
+    if j == si or i == sj:
+        return None
+    delta = dist(i, j) + dist(si, sj) - dist(i, si) - dist(j, sj)
+    if delta >= -MOVE_EPS:
+        return None
+    _reverse(tour, pos, (pos[i] + 1) % n, pos[j])
+    return (i, j, si, sj)
+
+
+def _apply_or_opt(tour, pos, dist, s, L, j, rev):
+    n = len(tour)
+    p = pos[s]
+    if p + L > n:
+        return None  # segment wraps the array end
+    seg = tour[p:p + L]
+    e = seg[-1]
+    q = pos[j]
+    if p <= q < p + L or j == tour[p - 1]:
+        return None
+    sj = tour[(q + 1) % n]
+    if p <= (q + 1) % n < p + L:
+        return None
+    prev, nxt = tour[p - 1], tour[(p + L) % n]
+    a, b = (e, s) if rev else (s, e)
+    delta = (dist(prev, nxt) - dist(prev, s) - dist(e, nxt)
+             + dist(j, a) + dist(b, sj) - dist(j, sj))
+    if delta >= -MOVE_EPS:
+        return None
+    seg = seg[::-1].copy() if rev else seg.copy()
+    if q > p:
+        tour[p:q + 1 - L] = tour[p + L:q + 1].copy()
+        tour[q + 1 - L:q + 1] = seg
+        lo, hi = p, q + 1
+    else:
+        tour[q + 1 + L:p + L] = tour[q + 1:p].copy()
+        tour[q + 1:q + 1 + L] = seg
+        lo, hi = q + 1, p + L
+    pos[tour[lo:hi]] = np.arange(lo, hi)
+    return (prev, nxt, s, e, j, sj)
+
+
+def refine_tour(coords, order, earth=True, k=8, max_passes=50, or_opt=True, cand=None, time_limit=None):
+    """Polishes a tour with neighbour-list 2-opt and Or-opt; returns (closed order, report).
+
+    Each pass evaluates the candidate moves in one batch, then applies the
+    improving ones best first, re-checking each against the current tour.
+    After the first pass only cities next to a changed edge (or whose move
+    was pre-empted by an overlapping one) are re-evaluated; a full pass
+    confirms convergence.
+    """
+    start = time.perf_counter()
+    coords = np.asarray(coords, dtype=np.float64)
+    tour = open_tour(order).copy()
+    n = len(tour)
+    initial = tour_length(coords, close_tour(tour), earth) if n > 1 else 0.0
+    report = {"N": n, "initial_distance": initial, "passes": 0, "two_opt_moves": 0, "or_opt_moves": 0,
+              "knn_time": 0.0}
+    if n >= 5:
+        if cand is None:
+            cand = knn_candidates(coords, k, earth)
+            report["knn_time"] = time.perf_counter() - start
+        pos = np.empty(n, dtype=np.int64)
+        pos[tour] = np.arange(n)
+        dist, batch = _scalar_distance(coords, earth), batch_distance(coords, earth)
+        active = None
+        for _ in range(max_passes):
+            report["passes"] += 1
+            touched, retry = [], []
+            for i, j, _ in zip(*(a.tolist() for a in two_opt_moves(batch, tour, pos, cand, active))):
+                changed = _apply_two_opt(tour, pos, dist, i, j)
+                if changed:
+                    touched.extend(changed)
+                    report["two_opt_moves"] += 1
+                else:
+                    retry.append(i)
+            if or_opt:
+                s, L, j, rev, _ = or_opt_moves(batch, tour, pos, cand, active)
+                for args in zip(s.tolist(), L.tolist(), j.tolist(), rev.tolist()):
+                    changed = _apply_or_opt(tour, pos, dist, *args)
+                    if changed:
+                        touched.extend(changed)
+                        report["or_opt_moves"] += 1
+                    else:
+                        retry.append(args[0])
+            if time_limit and time.perf_counter() - start > time_limit:
+                break
+            if not touched:
+                if active is None:
+                    break
+                active = None  # confirm with a full pass before stopping
+                continue
+            # Cities next to a changed edge, plus those whose improving move lost a conflict
+            active = np.unique(np.array(touched + retry, dtype=np.int64))
+    order = close_tour(tour)
+    report["distance"] = tour_length(coords, order, earth) if n > 1 else 0.0
+    report["improvement"] = initial - report["distance"]
+    report["refine_time"] = time.perf_counter() - start
+    return order, report
+
+
+# ==========================================
+# Construction
+# ==========================================
+def nearest_neighbor_tour(coords, earth=True, start=0):
+    """Greedy nearest-neighbour permutation (open, starting at `start`)."""
+    n = len(coords)
+    visited = np.zeros(n, dtype=bool)
+    order = np.empty(n, dtype=np.int64)
+    cur = start
+    for k in range(n):
+        order[k] = cur
+        visited[cur] = True
+        if k == n - 1:
+            break
+        d = pair_distance(coords[cur], coords, earth)
+        d[visited] = np.inf
+        cur = int(np.argmin(d))
+    return order
+
+
+def space_filling_tour(coords, bits=16):
+    """Cities in Hilbert-curve order of their (lon, lat) grid cell: an O(n log n) start tour."""
+    coords = np.asarray(coords, dtype=np.float64)
+    side = (1 << bits) - 1
+    lo, span = coords.min(axis=0), np.ptp(coords, axis=0)
+    y, x = (np.round((coords - lo) / np.where(span > 0, span, 1.0) * side).astype(np.int64)).T
+    d = np.zeros(len(coords), dtype=np.int64)
+    s = 1 << (bits - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve stays continuous
+        flip = ~ry & rx
+        x = np.where(flip, side - x, x)
+        y = np.where(flip, side - y, y)
+        x, y = np.where(~ry, y, x), np.where(~ry, x, y)
+        s >>= 1
+    return np.argsort(d, kind="stable")
+
+
+# ==========================================
+# Public Entry Point
+# ==========================================
+def solve_tsp_local(payload):
+    """Solves a `/v1/tsp` payload in-process and returns the API response shape."""
+    start_wall = time.perf_counter()
+    cities = payload.get("cities")
+    if not cities:
+        raise ValueError("cities must be a non-empty list of [lat, lon] pairs.")
+    coords = np.asarray(cities, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        raise ValueError("cities must be a list of [lat, lon] pairs.")
+    earth = bool(payload.get("use_earth_metric", True))
+
+    raw = nearest_neighbor_tour(coords, earth)
+    refine = payload.get("use_2opt", True) or payload.get("industrial_strict", True)
+    final = open_tour(refine_tour(coords, raw, earth)[0]) if refine else raw
+
+    raw_order, order = close_tour(raw), close_tour(final)
+    solve_time = time.perf_counter() - start_wall
+    K = payload.get("K")
+    return {
+        "outputs": {
+            "order": order,
+            "distance": tour_length(coords, order, earth),
+            "raw_order": raw_order,
+            "raw_distance": tour_length(coords, raw_order, earth),
+            "diagnostics": {
+                "solve_time": solve_time,
+                "k_mode": "Auto" if K is None else "Manual",
+                "k_target": K if K is not None else "N/A",
+                "engine": "enchan_client.tsp",
+            },
+        },
+        "TIMING": {"total_wall_time": solve_time},
+    }
@@ -0,0 +1,265 @@
+"""Spatial decomposition driver for city sets beyond one `/v1/tsp` call.
+
+Pipeline:
+    1. Cluster the cities into tiles of at most `max_size` (k-means on the
+       unit sphere, or a balanced latitude/longitude grid); oversized
+       clusters are split along the Hilbert curve.
+    2. Order the clusters with a coarse tour over their centroids.
+    3. Solve every cluster concurrently (remote client or local solver).
+    4. Stitch: open each sub-tour at the edge whose removal best connects
+       the previous cluster's exit to the next cluster.
+    5. Refine the whole tour with k-NN 2-opt / Or-opt, which repairs the
+       seams between clusters.
+"""
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .graph import MAX_NODES
+from .payloads import tsp_payload
+from .tsp import (
+    close_tour,
+    embed,
+    open_tour,
+    pair_distance,
+    refine_tour,
+    solve_tsp_local,
+    space_filling_tour,
+    tour_length,
+)
+
+# Target cluster size as a fraction of `max_size` (k-means clusters are uneven)
+CLUSTER_FILL = 0.75
+
+
+# ==========================================
+# Clustering
+# ==========================================
+def _nearest_center(pts, centers):
+    """Index of the nearest center for every point (chunked to bound memory)."""
+    out = np.empty(len(pts), dtype=np.int64)
+    csq = (centers * centers).sum(axis=1)
+    rows = max(1, (1 << 22) // max(1, len(centers)))
+    for lo in range(0, len(pts), rows):
+        out[lo:lo + rows] = np.argmin(csq[None, :] - 2.0 * pts[lo:lo + rows] @ centers.T, axis=1)
+    return out
+
+
+def kmeans_labels(coords, k, earth=True, iters=25):
+    """Lloyd's k-means on the embedded points (spherical: centers renormalized); Hilbert-spread seeds."""
+    pts = embed(coords, earth)
+    n = len(pts)
+    k = max(1, min(k, n))
+    seeds = space_filling_tour(coords)[((np.arange(k) + 0.5) * n / k).astype(np.int64)]
+    centers = pts[seeds].copy()
+    labels = None
+    for _ in range(iters):
+        new = _nearest_center(pts, centers)
+        if labels is not None and np.array_equal(new, labels):
+            break
+        labels = new
+        counts = np.bincount(labels, minlength=k)
+        keep = counts > 0
+        sums = np.column_stack([np.bincount(labels, weights=c, minlength=k) for c in pts.T])
+        centers[keep] = sums[keep] / counts[keep, None]
+        if earth:
+            centers[keep] /= np.maximum(np.linalg.norm(centers[keep], axis=1), 1e-12)[:, None]
+    return labels
+
+
+def grid_labels(coords, k):
+    """Balanced grid: latitude bands of equal count, each cut into equal-count longitude cells."""
+    coords = np.asarray(coords, dtype=np.float64)
+    rows = max(1, int(round(math.sqrt(k))))
+    cols = max(1, math.ceil(k / rows))
+    labels = np.empty(len(coords), dtype=np.int64)
+    for r, band in enumerate(np.array_split(np.argsort(coords[:, 0], kind="stable"), rows)):
+        for c, cell in enumerate(np.array_split(band[np.argsort(coords[band, 1], kind="stable")], cols)):
+            labels[cell] = r * cols + c
+    return labels
+
+
+def cluster_cities(coords, max_size=MAX_NODES, method="kmeans", earth=True):
+    """Splits city indices into spatial clusters of at most `max_size`; returns a list of index arrays."""
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    k = max(1, math.ceil(n / (max_size * CLUSTER_FILL)))
+    if method == "kmeans":
+        labels = kmeans_labels(coords, k, earth)
+    elif method == "grid":
+        labels = grid_labels(coords, k)
+    else:
+        raise ValueError(f"Unknown clustering method: {method}")
+
+    clusters = []
+    for members in np.split(np.argsort(labels, kind="stable"), np.cumsum(np.bincount(labels))[:-1]):
+        if len(members) == 0:
+            continue
+        if len(members) <= max_size:
+            clusters.append(members)
+            continue
+        members = members[space_filling_tour(coords[members])]
+        clusters.extend(np.array_split(members, math.ceil(len(members) / max_size)))
+    return clusters
+
+
+def centroids(coords, clusters, earth=True):
+    """[lat, lon] (or plain mean) centroid of every cluster."""
+    coords = np.asarray(coords, dtype=np.float64)
+    if not earth:
+        return np.array([coords[c].mean(axis=0) for c in clusters])
+    mean = np.array([embed(coords[c]).mean(axis=0) for c in clusters])
+    lat = np.degrees(np.arctan2(mean[:, 2], np.hypot(mean[:, 0], mean[:, 1])))
+    lon = np.degrees(np.arctan2(mean[:, 1], mean[:, 0]))
+    return np.column_stack([lat, lon])
+
+
+def cluster_route(coords, clusters, earth=True):
+    """Visiting order of the clusters: a local tour over their centroids."""
+    if len(clusters) <= 3:
+        return np.arange(len(clusters))
+    res = solve_tsp_local({"cities": centroids(coords, clusters, earth).tolist(), "use_earth_metric": earth})
+    return open_tour(res["outputs"]["order"])
+
+
+# ==========================================
+# Concurrent Cluster Solve
+# ==========================================
+async def solve_clusters(coords, clusters, client=None, earth=True, seed=314, concurrency=4):
+    """Solves every cluster concurrently; returns ([open sub-tour as global ids], timings)."""
+    sem = asyncio.Semaphore(max(1, concurrency))
+    loop = asyncio.get_running_loop()
+    executor = None if client is not None else ThreadPoolExecutor(max_workers=max(1, concurrency))
+
+    async def run(idx, members):
+        payload = tsp_payload(coords[members], use_earth_metric=earth, seed=seed)
+        async with sem:
+            start = time.perf_counter()
+            if len(members) < 2:
+                res = {"outputs": {"order": [0]}}
+            elif client is not None:
+                res = await client.tsp(payload)
+            else:
+                res = await loop.run_in_executor(executor, solve_tsp_local, payload)
+            latency = time.perf_counter() - start
+        local = open_tour(res["outputs"]["order"])
+        valid = len(local) == len(members) and np.array_equal(np.sort(local), np.arange(len(members)))
+        if not valid:
+            # Keep the driver going on a malformed reply; the refiner still polishes this tile
+            local = space_filling_tour(coords[members])
+        timing = {"cluster": idx, "cities": len(members), "latency": latency, "valid": bool(valid),
+                  "server_time": res.get("TIMING", {}).get("total_wall_time", 0.0)}
+        return members[local], timing
+
+    try:
+        results = await asyncio.gather(*(run(i, c) for i, c in enumerate(clusters)))
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
+    return [r[0] for r in results], [r[1] for r in results]
+
+
+# ==========================================
+# Stitching
+# ==========================================
+def _anchor(coords, members, toward, earth=True):
+    """City of `members` closest to the point `toward`."""
+    return members[int(np.argmin(pair_distance(coords[members], toward, earth)))]
+
+
+def open_subtour(coords, sub, prev, nxt, earth=True):
+    """Opens the cyclic `sub` into a path from near `prev` to near `nxt`.
+
+    Tries every edge (a, b) in both directions: cost d(prev, entry) +
+    d(exit, nxt) - d(a, b); the path runs entry -> ... -> exit.
+    """
+    m = len(sub)
+    if m < 2:
+        return sub
+    a, b = sub, np.roll(sub, -1)
+    edge = pair_distance(coords[a], coords[b], earth)
+    fwd = pair_distance(coords[prev], coords[b], earth) + pair_distance(coords[a], coords[nxt], earth) - edge
+    rev = pair_distance(coords[prev], coords[a], earth) + pair_distance(coords[b], coords[nxt], earth) - edge
+    j = int(np.argmin(np.minimum(fwd, rev)))
+    if fwd[j] <= rev[j]:
+        return np.roll(sub, -(j + 1))  # b ... a
+    r = sub[::-1]
+    return np.roll(r, -(m - 1 - j))  # a ... b
+
+
+def stitch_subtours(coords, clusters, subtours, earth=True):
+    """Joins sub-tours (already in visiting order) into one open tour."""
+    if len(subtours) == 1:
+        return subtours[0]
+    cents = centroids(coords, clusters, earth)
+    count = len(subtours)
+    prev = _anchor(coords, clusters[-1], cents[0], earth)
+    path = []
+    for i, sub in enumerate(subtours):
+        nxt = _anchor(coords, clusters[(i + 1) % count], cents[i], earth)
+        piece = open_subtour(coords, sub, prev, nxt, earth)
+        path.append(piece)
+        prev = piece[-1]
+    return np.concatenate(path)
+
+
+# ==========================================
+# Public Entry Point
+# ==========================================
+async def solve_tsp_decomposed_async(cities, client=None, max_size=MAX_NODES, method="kmeans", earth=True,
+                                     seed=314, concurrency=4, refine=True, time_limit=None):
+    """Solves a city set of any size by cluster / concurrent solve / stitch / refine.
+
+    `client` is an AsyncEnchanClient; without one, clusters run on the local
+    solver. Returns a `/v1/tsp`-shaped response (closed `outputs.order`) plus
+    a report of distance after each stage, stage times and cluster timings.
+    """
+    start_wall = time.perf_counter()
+    coords = np.asarray(cities, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 2 or len(coords) == 0:
+        raise ValueError("cities must be a non-empty list of [lat, lon] pairs.")
+
+    t0 = time.perf_counter()
+    clusters = cluster_cities(coords, max_size, method, earth)
+    route = cluster_route(coords, clusters, earth)
+    clusters = [clusters[c] for c in route]
+    t1 = time.perf_counter()
+    subtours, timings = await solve_clusters(coords, clusters, client, earth, seed, concurrency)
+    t2 = time.perf_counter()
+    tour = stitch_subtours(coords, clusters, subtours, earth)
+    stitched = tour_length(coords, close_tour(tour), earth)
+    t3 = time.perf_counter()
+    order, polish = refine_tour(coords, tour, earth, time_limit=time_limit) if refine else (close_tour(tour), None)
+    t4 = time.perf_counter()
+
+    sizes = [len(c) for c in clusters]
+    distance = polish["distance"] if polish else stitched
+    return {
+        "outputs": {"order": order, "distance": distance},
+        "report": {
+            "N": len(coords),
+            "method": method,
+            "clusters": len(clusters),
+            "max_cluster": max(sizes),
+            "min_cluster": min(sizes),
+            "concurrency": concurrency,
+            "invalid_subtours": sum(not t["valid"] for t in timings),
+            "stitched_distance": stitched,
+            "distance": distance,
+            "refine_moves": (polish["two_opt_moves"] + polish["or_opt_moves"]) if polish else 0,
+            "cluster_time": t1 - t0,
+            "solve_time": t2 - t1,
+            "stitch_time": t3 - t2,
+            "refine_time": t4 - t3,
+            "wall_time": time.perf_counter() - start_wall,
+            "cluster_timings": timings,
+        },
+    }
+
+
+def solve_tsp_decomposed(cities, client=None, **kwargs):
+    """Synchronous wrapper around `solve_tsp_decomposed_async`."""
+    return asyncio.run(solve_tsp_decomposed_async(cities, client, **kwargs))
@@ -0,0 +1,184 @@
+"""`control.total_time` tuning: the cheapest duration whose cut has converged.
+
+A representative workload is swept with successive halving. Every candidate
+duration is first scored on a few graph/seed samples; each round keeps the
+shortest durations that are still within `tol` of the best mean cut (plus the
+longest one as the reference and the last non-converged one as the boundary)
+and re-scores them on `eta` times as many samples. Cuts are compared
+relative to the best cut on each sample, so graphs of different sizes mix.
+
+Recommendations are stored per graph class (N, density and degree skew
+buckets) in a JSON file. Clients created with `tuning=` resolve
+`control.total_time = "auto"` from it.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from .cache import default_cache_dir
+from .graph import normalize_graph
+from .kernel import solve_local
+
+DEFAULT_DURATIONS = (1.0, 2.0, 3.5, 5.0, 7.5, 10.0, 15.0, 20.0, 25.0, 35.0)
+DEFAULT_TOTAL_TIME = 35.0
+TUNING_VERSION = 1
+
+
+def default_tuning_path():
+    return os.environ.get("ENCHAN_TUNING_FILE", os.path.join(default_cache_dir(), "total_time.json"))
+
+
+# ==========================================
+# Graph Classes
+# ==========================================
+def graph_features(payload):
+    """N, density and degree skew (max degree / mean degree) of a solve payload."""
+    graph = payload.get("graph") or {}
+    if graph.get("edges") is None:
+        N = int(graph["N"])
+        return {"N": N, "density": float(graph.get("density") or 0.0), "skew": 1.0}
+    N, u, v, _ = normalize_graph(graph)
+    deg = np.bincount(u, minlength=N) + np.bincount(v, minlength=N)
+    mean = deg.mean() if N else 0.0
+    return {
+        "N": N,
+        "density": 2.0 * len(u) / (N * (N - 1)) if N > 1 else 0.0,
+        "skew": float(deg.max() / mean) if mean > 0 else 1.0,
+    }
+
+
+def graph_class(features):
+    """Bucket key: N to the next power of two, density to the nearest half decade, skew per power of two."""
+    n = 1 << max(0, math.ceil(math.log2(max(1, features["N"]))))
+    d = features["density"]
+    d = round(round(math.log10(d) * 2) / 2, 1) if d > 0 else "0"
+    s = max(0, math.ceil(math.log2(max(1.0, features["skew"]))))
+    return f"n{n}-d{d}-s{s}"
+
+
+# ==========================================
+# Successive Halving
+# ==========================================
+async def _solve(client, payload, gate):
+    async with gate:
+        if client is not None:
+            return await client.solve(payload)
+        return await asyncio.get_running_loop().run_in_executor(None, solve_local, payload)
+
+
+async def successive_halving(payloads, client=None, durations=DEFAULT_DURATIONS, seeds=(42,),
+                             tol=0.005, eta=2, initial_samples=1, concurrency=4):
+    """Finds the shortest `total_time` within `tol` of the best mean relative cut."""
+    start = time.perf_counter()
+    samples = [(p, s) for s in seeds for p in payloads]
+    gate = asyncio.Semaphore(concurrency)
+    alive = sorted(set(float(d) for d in durations))
+    cuts = {}
+    n = max(1, min(len(samples), initial_samples))
+    rounds, curve = [], None
+
+    while True:
+        todo = [(d, j) for d in alive for j in range(n) if (d, j) not in cuts]
+
+        async def one(d, j):
+            payload, seed = samples[j]
+            body = dict(payload, seed=seed, control=dict(payload.get("control") or {}, total_time=d))
+            res = await _solve(client, body, gate)
+            cuts[(d, j)] = float(res["metrics"]["cut"])
+
+        await asyncio.gather(*(one(d, j) for d, j in todo))
+        ref = [max(cuts[(d, j)] for d in alive) for j in range(n)]
+        score = {d: float(np.mean([cuts[(d, j)] / ref[j] if ref[j] > 0 else 1.0 for j in range(n)]))
+                 for d in alive}
+        converged = [d for d in alive if score[d] >= 1.0 - tol] or [max(alive, key=score.get)]
+        if curve is None:
+            curve = [{"total_time": d, "relative_cut": score[d]} for d in alive]
+        rounds.append({"samples": n, "candidates": list(alive), "scores": score,
+                       "evaluations": len(todo), "converged": converged})
+        if n >= len(samples):
+            break
+        below = [d for d in alive if d < converged[0]]
+        keep = converged[:max(1, math.ceil(len(converged) / eta))] + [alive[-1]] + below[-1:]
+        alive = sorted(set(keep))
+        n = min(len(samples), n * eta)
+
+    best = rounds[-1]["converged"][0]
+    spent = sum(d for d, _ in cuts)
+    grid = sum(sorted(set(float(d) for d in durations))) * len(samples)
+    return {
+        "total_time": best,
+        "tol": tol,
+        "samples": len(samples),
+        "curve": curve,
+        "rounds": rounds,
+        "compute_seconds": spent,
+        "grid_compute_seconds": grid,
+        "savings": 1.0 - spent / grid if grid > 0 else 0.0,
+        "saved_per_solve": DEFAULT_TOTAL_TIME - best,
+        "wall_time": time.perf_counter() - start,
+    }
+
+
+async def tune_workload(payloads, client=None, **kwargs):
+    """Runs `successive_halving` per graph class; returns {class: report}."""
+    classes = {}
+    for p in payloads:
+        features = graph_features(p)
+        classes.setdefault(graph_class(features), ([], features))[0].append(p)
+    reports = {}
+    for key, (members, features) in classes.items():
+        report = await successive_halving(members, client, **kwargs)
+        report["features"] = features
+        reports[key] = report
+    return reports
+
+
+def run_tuning(payloads, client=None, **kwargs):
+    """Synchronous wrapper around `tune_workload`."""
+    return asyncio.run(tune_workload(payloads, client, **kwargs))
+
+
+# ==========================================
+# Persisted Recommendations
+# ==========================================
+class TuningStore:
+    """Per-graph-class `total_time` recommendations in a JSON file."""
+
+    def __init__(self, path=None):
+        self.path = path or default_tuning_path()
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == TUNING_VERSION:
+                self.entries = data.get("classes", {})
+
+    def update(self, reports):
+        for key, r in reports.items():
+            self.entries[key] = {"total_time": r["total_time"], "tol": r["tol"], "samples": r["samples"],
+                                 "features": r.get("features"), "updated": time.time()}
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": TUNING_VERSION, "classes": self.entries}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def recommend(self, payload, default=DEFAULT_TOTAL_TIME):
+        entry = self.entries.get(graph_class(graph_features(payload)))
+        return entry["total_time"] if entry else default
+
+
+def resolve_total_time(payload, store=None):
+    """Replaces `control.total_time = "auto"` with the stored recommendation (35.0 without one)."""
+    control = payload.get("control") or {}
+    if control.get("total_time") != "auto":
+        return payload
+    total_time = store.recommend(payload) if store is not None else DEFAULT_TOTAL_TIME
+    return dict(payload, control=dict(control, total_time=total_time))
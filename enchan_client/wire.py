@@ -0,0 +1,222 @@
+"""Compact binary wire format for solve requests.
+
+Edges travel as little-endian int32 pairs, weights as float32 and
+`initial_state` as float64, optionally gzip/zstd compressed. Two transports:
+
+* raw: `Content-Type: application/x-enchan-graph`, body =
+  `MAGIC | u8 version | u8 codec | u16 flags | u32 meta_len | meta JSON | blob`
+* base64: a normal JSON body whose `graph` carries `encoding`, `edges_b64`
+  (and `weights_b64`), for transports that only accept JSON.
+
+Only servers that understand the format (e.g. `enchan_server`) can decode it;
+the hosted public API accepts plain JSON.
+"""
+import base64
+import gzip
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from .trace import traced
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+MAGIC = b"ENCH"
+VERSION = 1
+CONTENT_TYPE = "application/x-enchan-graph"
+FORMAT_NAME = "enchan-bin-v1"
+
+CODECS = {"none": 0, "gzip": 1, "zstd": 2}
+_CODEC_NAMES = {v: k for k, v in CODECS.items()}
+FLAG_WEIGHTS = 1
+FLAG_INITIAL_STATE = 2
+
+# Corrupt or truncated streams surface as these; decoders re-raise them as ValueError (client error)
+_CORRUPT = (OSError, EOFError, zlib.error)
+if zstandard is not None:
+    _CORRUPT += (zstandard.ZstdError,)
+
+_HEADER = struct.Struct("<4sBBHI")
+
+
+class EncodedPayload(bytes):
+    """Pre-encoded request body that remembers its Content-Type."""
+
+    def __new__(cls, data, content_type="application/json"):
+        obj = super().__new__(cls, data)
+        obj.content_type = content_type
+        return obj
+
+
+# ==========================================
+# Compression
+# ==========================================
+def default_codec():
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def compress(data, codec, level=None):
+    if codec == "none":
+        return data
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=1 if level is None else level)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd codec requires the 'zstandard' package.")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise ValueError(f"Unknown codec '{codec}'.")
+
+
+def decompress(data, codec):
+    """Decompresses `data`; corrupt input raises ValueError."""
+    if codec == "none":
+        return data
+    try:
+        if codec == "gzip":
+            return gzip.decompress(data)
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstd codec requires the 'zstandard' package.")
+            return zstandard.ZstdDecompressor().decompress(data)
+    except _CORRUPT as e:
+        raise ValueError(f"Corrupt {codec} stream: {e}") from e
+    raise ValueError(f"Unknown codec '{codec}'.")
+
+
+# ==========================================
+# Array Packing
+# ==========================================
+def _pack_arrays(u, v, w=None, initial_state=None):
+    edges = np.empty((len(u), 2), dtype="<i4")
+    edges[:, 0] = u
+    edges[:, 1] = v
+    parts = [edges.tobytes()]
+    if w is not None:
+        parts.append(np.ascontiguousarray(w, dtype="<f4").tobytes())
+    if initial_state is not None:
+        parts.append(np.ascontiguousarray(initial_state, dtype="<f8").tobytes())
+    return b"".join(parts)
+
+
+def _unpack_arrays(blob, E, N, flags):
+    pos = 8 * E
+    if len(blob) < pos:
+        raise ValueError("Truncated edge block.")
+    edges = np.frombuffer(blob, dtype="<i4", count=2 * E).reshape(E, 2)
+    weights = initial_state = None
+    if flags & FLAG_WEIGHTS:
+        weights = np.frombuffer(blob, dtype="<f4", count=E, offset=pos)
+        pos += 4 * E
+    if flags & FLAG_INITIAL_STATE:
+        initial_state = np.frombuffer(blob, dtype="<f8", count=N, offset=pos)
+        pos += 8 * N
+    if pos != len(blob):
+        raise ValueError("Unexpected trailing bytes in payload.")
+    return edges, weights, initial_state
+
+
+# ==========================================
+# Raw octet-stream transport
+# ==========================================
+@traced("encode", format="binary")
+def encode_binary(N, u, v, w=None, total_time=35.0, seed=None, initial_state=None, codec=None):
+    """Encodes a solve request as a raw binary body (EncodedPayload)."""
+    codec = codec or default_codec()
+    flags = (FLAG_WEIGHTS if w is not None else 0) | (FLAG_INITIAL_STATE if initial_state is not None else 0)
+    meta = {"N": int(N), "E": int(len(u)), "control": {"total_time": float(total_time)}}
+    if seed is not None:
+        meta["seed"] = int(seed)
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    blob = compress(_pack_arrays(u, v, w, initial_state), codec)
+    header = _HEADER.pack(MAGIC, VERSION, CODECS[codec], flags, len(meta_bytes))
+    return EncodedPayload(header + meta_bytes + blob, CONTENT_TYPE)
+
+
+def decode_binary(body):
+    """Decodes a raw binary body into a solve payload dict holding NumPy arrays.
+
+    Malformed bodies (bad header, missing meta fields, corrupt blob) raise ValueError.
+    """
+    try:
+        return _decode_binary(body)
+    except (KeyError, TypeError, AttributeError, struct.error) as e:
+        raise ValueError(f"Malformed binary payload: {e!r}") from e
+
+
+def _decode_binary(body):
+    if len(body) < _HEADER.size:
+        raise ValueError("Payload too short.")
+    magic, version, codec, flags, meta_len = _HEADER.unpack_from(body)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not an enchan-bin-v1 payload.")
+    if codec not in _CODEC_NAMES:
+        raise ValueError(f"Unknown codec id {codec}.")
+    start = _HEADER.size
+    meta = json.loads(body[start:start + meta_len])
+    blob = decompress(bytes(body[start + meta_len:]), _CODEC_NAMES[codec])
+    edges, weights, initial_state = _unpack_arrays(blob, int(meta["E"]), int(meta["N"]), flags)
+
+    payload = {"graph": {"N": meta["N"], "edges": edges}, "control": meta["control"]}
+    if weights is not None:
+        payload["graph"]["weights"] = weights
+    if initial_state is not None:
+        payload["initial_state"] = initial_state
+    if "seed" in meta:
+        payload["seed"] = meta["seed"]
+    return payload
+
+
+# ==========================================
+# JSON + base64 transport
+# ==========================================
+@traced("encode", format="base64")
+def encode_base64_json(N, u, v, w=None, total_time=35.0, seed=None, initial_state=None, codec=None):
+    """Encodes a solve request as JSON with base64 array fields (EncodedPayload)."""
+    codec = codec or default_codec()
+    b64 = lambda raw: base64.b64encode(compress(raw, codec)).decode("ascii")
+    edges = np.empty((len(u), 2), dtype="<i4")
+    edges[:, 0] = u
+    edges[:, 1] = v
+    graph = {"N": int(N), "encoding": {"format": FORMAT_NAME, "codec": codec}, "edges_b64": b64(edges.tobytes())}
+    if w is not None:
+        graph["weights_b64"] = b64(np.ascontiguousarray(w, dtype="<f4").tobytes())
+    payload = {"graph": graph, "control": {"total_time": float(total_time)}}
+    if initial_state is not None:
+        payload["initial_state"] = [float(x) for x in initial_state]
+    if seed is not None:
+        payload["seed"] = int(seed)
+    return EncodedPayload(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_base64_graph(payload):
+    """Replaces `edges_b64`/`weights_b64` in a parsed JSON payload with arrays (in place)."""
+    graph = payload.get("graph") if isinstance(payload, dict) else None
+    if not isinstance(graph, dict) or "edges_b64" not in graph:
+        return payload
+    encoding = graph.pop("encoding", {}) or {}
+    if not isinstance(encoding, dict):
+        raise ValueError("graph.encoding must be an object.")
+    if encoding.get("format", FORMAT_NAME) != FORMAT_NAME:
+        raise ValueError(f"Unsupported graph encoding '{encoding.get('format')}'.")
+    codec = encoding.get("codec", "none")
+    for key in ("edges_b64", "weights_b64"):
+        if key in graph and not isinstance(graph[key], str):
+            raise ValueError(f"graph.{key} must be a base64 string.")
+    raw = decompress(base64.b64decode(graph.pop("edges_b64"), validate=True), codec)
+    graph["edges"] = np.frombuffer(raw, dtype="<i4").reshape(-1, 2)
+    if "weights_b64" in graph:
+        raw = decompress(base64.b64decode(graph.pop("weights_b64"), validate=True), codec)
+        graph["weights"] = np.frombuffer(raw, dtype="<f4")
+    return payload
+
+
+def decode_request(body, content_type="application/json"):
+    """Server-side entry point: any supported body -> payload dict."""
+    if content_type.split(";", 1)[0].strip() in (CONTENT_TYPE, "application/octet-stream"):
+        return decode_binary(body)
+    return decode_base64_graph(json.loads(body))
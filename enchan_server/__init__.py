@@ -0,0 +1,4 @@
+"""Offline stand-in server implementing the Enchan API request/response contracts."""
+from .app import ROUTES, RequestError, make_server, start_background
+
+__all__ = ["ROUTES", "RequestError", "make_server", "start_background"]
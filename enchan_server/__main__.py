@@ -0,0 +1,35 @@
+import argparse
+
+from .app import make_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline Enchan API stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    parser.add_argument("--workers", type=int, help="Solver processes (default: one per CPU; 0 = request threads)")
+    parser.add_argument("--queue-size", type=int, default=32, help="Requests allowed to wait for a worker (then 503)")
+    parser.add_argument("--client-rate", type=float, default=0.0,
+                        help="Per-client admission in req/s, 429 beyond it (hosted API: ~1; 0 = off)")
+    parser.add_argument("--client-burst", type=int, default=1)
+    parser.add_argument("--no-pack", action="store_true", help="Send every small request to a worker on its own")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, verbose=args.verbose, workers=args.workers,
+                         queue_size=args.queue_size, client_rate=args.client_rate or None,
+                         client_burst=args.client_burst, pack=not args.no_pack)
+    scheduler = server.scheduler
+    print(f"Enchan stand-in listening on http://{args.host}:{server.server_port}/v1")
+    print(f"Workers: {scheduler.workers or 'request threads'}, queue: {scheduler.capacity}, "
+          f"client rate: {args.client_rate or 'off'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
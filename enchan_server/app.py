@@ -0,0 +1,206 @@
+"""Local stand-in for the Enchan API (`/v1/solve`, `/v1/scan_resonance`, `/v1/tsp`).
+
+Implements the documented request/response contracts on top of the
+`enchan_client` reference kernels using only the standard library HTTP server,
+so load tests and pipelines can run offline. Error bodies follow the hosted
+shape: `{"detail": [{"loc": [...], "msg": "...", "type": "..."}]}`.
+
+Solves run on a `SolveScheduler` process pool behind a bounded queue (503
+when full) with optional per-client admission (429, like the hosted 1 req/s
+limit); both carry Retry-After so `EnchanClient` backs off correctly.
+"""
+import json
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from enchan_client.graph import MAX_NODES
+from enchan_client.wire import decode_request
+
+from .scheduler import AdmissionControl, QueueFull, SolveScheduler
+
+MAX_TOTAL_TIME = 35.0
+MAX_BODY_SIZE = 256 * 1024 * 1024
+# The web shell is served from /shell/ so it can post to this server's /v1/solve
+SHELL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shell"))
+SHELL_TYPES = {".html": "text/html", ".py": "text/x-python", ".json": "application/json", ".enc": "text/plain"}
+
+
+class RequestError(Exception):
+    """Maps to an HTTP error response with a FastAPI-style `detail` list."""
+
+    def __init__(self, status, msg, loc=("body",), type_="value_error", headers=None):
+        super().__init__(msg)
+        self.status = status
+        self.detail = [{"loc": list(loc), "msg": msg, "type": type_}]
+        self.headers = headers or {}
+
+
+# ==========================================
+# Validation
+# ==========================================
+def _require(body, *path):
+    node = body
+    for i, key in enumerate(path):
+        if not isinstance(node, dict) or key not in node:
+            raise RequestError(422, "field required", ("body",) + path[:i + 1], "value_error.missing")
+        node = node[key]
+    return node
+
+
+def validate_graph_request(body):
+    """Checks a solve/scan body and applies the public caps (N <= 3000, t <= 35)."""
+    N = _require(body, "graph", "N")
+    total_time = _require(body, "control", "total_time")
+    if not isinstance(N, int) or isinstance(N, bool):
+        raise RequestError(422, "value is not a valid integer", ("body", "graph", "N"), "type_error.integer")
+    if not isinstance(total_time, (int, float)) or isinstance(total_time, bool):
+        raise RequestError(422, "value is not a valid float", ("body", "control", "total_time"), "type_error.float")
+    if N < 1 or N > MAX_NODES:
+        raise RequestError(400, f"Capacity Limit: Max {MAX_NODES} nodes allowed.", ("body", "graph", "N"))
+    if total_time < 0.1:
+        raise RequestError(422, "total_time must be >= 0.1", ("body", "control", "total_time"))
+    body["control"]["total_time"] = min(float(total_time), MAX_TOTAL_TIME)
+    return body
+
+
+def validate_tsp_request(body):
+    cities = _require(body, "cities")
+    if not isinstance(cities, list) or not all(isinstance(c, list) and len(c) == 2 for c in cities):
+        raise RequestError(422, "cities must be a list of [lat, lon] pairs", ("body", "cities"), "type_error.list")
+    if not 1 <= len(cities) <= MAX_NODES:
+        raise RequestError(400, f"Capacity Limit: Max {MAX_NODES} cities allowed.", ("body", "cities"))
+    return body
+
+
+# ==========================================
+# Routes
+# ==========================================
+ROUTES = {
+    "/v1/solve": ("solve", validate_graph_request),
+    "/v1/scan_resonance": ("scan_resonance", validate_graph_request),
+    "/v1/tsp": ("tsp", validate_tsp_request),
+}
+
+
+def _retry_after(seconds):
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+class EnchanRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "EnchanStandIn/1.0"
+    # Headers and body go out in two writes; with Nagle on, the body waits for the delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def _send_json(self, status, obj, headers=None):
+        out = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(out)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_SIZE:
+            raise RequestError(413, "Request body too large.")
+        raw = self.rfile.read(length)
+        try:
+            body = decode_request(raw or b"null", self.headers.get("Content-Type", "application/json"))
+        except (ValueError, RuntimeError) as e:
+            raise RequestError(422, f"Payload decode error: {e}", ("body",), "value_error.jsondecode")
+        if not isinstance(body, dict):
+            raise RequestError(422, "value is not a valid dict", ("body",), "type_error.dict")
+        return body
+
+    def _client_id(self):
+        return self.headers.get("X-API-Key") or self.headers.get("X-Client-Id") or self.client_address[0]
+
+    def _handle(self, kind, validate):
+        body = self._read_body()
+        wait = self.server.admission.admit(self._client_id())
+        if wait > 0:
+            raise RequestError(429, "Rate limit exceeded. Please retry after a delay.", type_="rate_limit",
+                               headers=_retry_after(wait))
+        body = validate(body)
+        try:
+            status, out = self.server.scheduler.run(kind, body)
+        except QueueFull:
+            raise RequestError(503, "Server busy: solve queue is full.", type_="server_busy",
+                               headers=_retry_after(1.0)) from None
+        if status != 200:
+            raise RequestError(status, out)
+        return out
+
+    def do_POST(self):
+        route = ROUTES.get(self.path.split("?", 1)[0].rstrip("/"))
+        if route is None:
+            self._send_json(404, {"detail": "Not Found"})
+            return
+        try:
+            self._send_json(200, self._handle(*route))
+        except RequestError as e:
+            self._send_json(e.status, {"detail": e.detail}, e.headers)
+        except Exception as e:
+            self._send_json(500, {"detail": f"Internal Server Error: {e}"})
+
+    def _send_shell_file(self, name):
+        name = name or "index.html"
+        ctype = SHELL_TYPES.get(os.path.splitext(name)[1])
+        if ctype is None or "/" in name or name not in os.listdir(SHELL_DIR):
+            self._send_json(404, {"detail": "Not Found"})
+            return
+        with open(os.path.join(SHELL_DIR, name), "rb") as f:
+            out = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path.rstrip("/") in ("", "/v1"):
+            self._send_json(200, {"status": "ok", "endpoints": sorted(ROUTES), "warm_start": True,
+                                  "scheduler": self.server.scheduler.snapshot(),
+                                  "rate_limited": self.server.admission.rejected})
+        elif path.startswith("/shell/"):
+            self._send_shell_file(path[len("/shell/"):])
+        else:
+            self._send_json(404, {"detail": "Not Found"})
+
+
+# ==========================================
+# Server Lifecycle
+# ==========================================
+class EnchanHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def server_close(self):
+        super().server_close()
+        self.scheduler.close()
+
+
+def make_server(host="127.0.0.1", port=8000, verbose=False, workers=0, queue_size=32,
+                client_rate=None, client_burst=1, pack=True):
+    """Builds the stand-in; `workers=0` solves on the request threads, `None` uses one process per CPU."""
+    server = EnchanHTTPServer((host, port), EnchanRequestHandler)
+    server.verbose = verbose
+    server.scheduler = SolveScheduler(workers, queue_size, pack_max=8 if pack else 1)
+    server.admission = AdmissionControl(client_rate, client_burst)
+    return server
+
+
+def start_background(host="127.0.0.1", port=0, **options):
+    """Starts a stand-in on a daemon thread; returns (server, base_url). See `make_server` for options."""
+    server = make_server(host, port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/v1"
@@ -0,0 +1,182 @@
+"""Worker pool, bounded queue and per-client admission for the stand-in server.
+
+Validated requests run on a process pool (`workers=0` runs them inline on the
+request thread). At most `workers + queue_size` requests are accepted at once;
+beyond that `run` raises `QueueFull` and the server answers 503 with
+Retry-After. Small requests (N or cities <= `pack_nodes`) that arrive within
+`pack_window` seconds of each other are sent to one worker as a single task,
+which saves the per-task IPC and pickling overhead that dominates
+millisecond-scale solves. Every request is still solved on its own, so
+responses (and S-HASH) are identical to unpacked ones.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from enchan_client.kernel import scan_resonance_local, solve_local
+from enchan_client.ratelimit import TokenBucket
+from enchan_client.tsp import solve_tsp_local
+
+EXECUTORS = {"solve": solve_local, "scan_resonance": scan_resonance_local, "tsp": solve_tsp_local}
+PACK_NODES = 256
+PACK_MAX = 8
+PACK_WINDOW = 0.002
+MAX_CLIENTS = 4096
+
+
+class QueueFull(Exception):
+    """All worker and queue slots are taken."""
+
+
+# ==========================================
+# Worker Entry Points
+# ==========================================
+def execute(kind, body):
+    """Runs one validated request; returns (200, response) or (400, message)."""
+    try:
+        return 200, EXECUTORS[kind](body)
+    except ValueError as e:
+        return 400, str(e)
+
+
+def execute_packed(jobs):
+    """Runs several small requests in one worker task."""
+    return [execute(kind, body) for kind, body in jobs]
+
+
+def request_size(kind, body):
+    if kind == "tsp":
+        return len(body.get("cities") or ())
+    return int(body["graph"]["N"])
+
+
+# ==========================================
+# Scheduler
+# ==========================================
+class SolveScheduler:
+    """Runs requests on a process pool behind a bounded queue, packing small ones."""
+
+    def __init__(self, workers=None, queue_size=32, pack_nodes=PACK_NODES, pack_max=PACK_MAX,
+                 pack_window=PACK_WINDOW):
+        self.workers = (os.cpu_count() or 1) if workers is None else max(0, workers)
+        self.capacity = max(1, self.workers) + max(0, queue_size)
+        self.pack_nodes = pack_nodes
+        self.pack_max = pack_max
+        self.pack_window = pack_window
+        self.pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers else None
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "in_flight": 0, "rejected": 0, "packed_requests": 0, "packs": 0}
+        self._small = None
+        if self.pool is not None and pack_max > 1:
+            self._small = queue.Queue()
+            threading.Thread(target=self._pack_loop, daemon=True).start()
+
+    def _count(self, key, delta=1):
+        with self._lock:
+            self.stats[key] += delta
+
+    def run(self, kind, body):
+        """Blocks until the request is solved; returns (status, response or message)."""
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise QueueFull()
+        self._count("requests")
+        self._count("in_flight")
+        try:
+            if self.pool is None:
+                return execute(kind, body)
+            return self._submit(kind, body).result()
+        finally:
+            self._count("in_flight", -1)
+            self._slots.release()
+
+    def _submit(self, kind, body):
+        if self._small is None or request_size(kind, body) > self.pack_nodes:
+            return self.pool.submit(execute, kind, body)
+        future = Future()
+        self._small.put((kind, body, future))
+        return future
+
+    def _pack_loop(self):
+        """Collects small requests for up to `pack_window` seconds (or `pack_max` of them) per task."""
+        while True:
+            item = self._small.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.pack_window
+            while len(batch) < self.pack_max:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._small.get(timeout=remaining) if remaining > 0 else self._small.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._small.put(None)
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        if len(batch) > 1:
+            self._count("packs")
+            self._count("packed_requests", len(batch))
+        try:
+            task = self.pool.submit(execute_packed, [(kind, body) for kind, body, _ in batch])
+        except RuntimeError as e:  # pool shut down
+            for *_, future in batch:
+                future.set_exception(e)
+            return
+
+        def done(task):
+            try:
+                results = task.result()
+            except BaseException as e:
+                for *_, future in batch:
+                    future.set_exception(e)
+                return
+            for (*_, future), result in zip(batch, results):
+                future.set_result(result)
+        task.add_done_callback(done)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, workers=self.workers, capacity=self.capacity)
+
+    def close(self):
+        if self._small is not None:
+            self._small.put(None)
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ==========================================
+# Per-Client Admission
+# ==========================================
+class AdmissionControl:
+    """One token bucket per client (API key header or IP); `admit` returns 0.0 or Retry-After seconds."""
+
+    def __init__(self, rate=None, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def admit(self, client):
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                if len(self._buckets) >= MAX_CLIENTS:
+                    self._buckets.clear()  # bounded memory; forgetting a client only refills its burst
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+        wait = bucket.try_acquire()
+        if wait > 0:
+            with self._lock:
+                self.rejected += 1
+        return wait
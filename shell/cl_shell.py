@@ -1,28 +1,49 @@
-import json
 import asyncio
-import pyodide_http
-import requests
+import hashlib
+import time
+from collections import OrderedDict, deque
 from pyscript import document, window
 from pyodide.ffi import create_proxy
+from pyodide.http import pyfetch
 from js import window as js_window
-from js import FileReader
-
-pyodide_http.patch_all()
+from js import AbortController, FileReader
+from enc_engine import EncEngine, MAX_BATCH_LINES
 
 state = {
-    "h": {},
-    "J": {},
-    "N_max": 0,
     "history": [],
     "history_idx": 0,
-    "docs_cache": None
+    "docs_cache": None,
+    "result_cache": OrderedDict(),
+    # Log rendering: every line lives in a bounded scrollback; only a window is in the DOM
+    "log_seq": 0,
+    "scrollback": deque(maxlen=5000),
+    "pending": [],
+    "flush_scheduled": False,
+    "dom_first_seq": 0,
+    "bulky": OrderedDict(),
+    # Background `run` jobs by name (finished ones are kept for `jobs` until JOB_KEEP)
+    "jobs": OrderedDict(),
+    "job_seq": 0,
+    "progress_running": False,
+    "sec_per_sim": None
 }
 
 # --- Constants for Safety ---
 MAX_FILE_SIZE = 1024 * 1024
-MAX_BATCH_LINES = 5000
-MAX_RUN_DURATION = 120.0
 ALLOWED_EXTENSIONS = (".enc", ".txt", ".py")
+MAX_RETRIES = 3
+RESULT_CACHE_SIZE = 32
+
+# --- Log Rendering ---
+DOM_LINES = 400          # lines kept in the DOM while following output
+PAGE_LINES = 200         # lines restored per "show earlier" click
+BULKY_CHARS = 480        # longer lines render collapsed until clicked
+BULKY_PREVIEW = 160
+BULKY_KEEP = 64          # collapsed payloads kept for expansion
+
+# --- Jobs ---
+JOB_KEEP = 20            # finished jobs listed by `jobs`
+PROGRESS_INTERVAL = 0.25 # seconds between status-line updates
 
 history_div = document.getElementById("history")
 cmd_input = document.getElementById("cmd-input")
@@ -30,33 +51,165 @@ input_area = document.getElementById("input-area")
 loading_msg = document.getElementById("loading")
 terminal_container = document.getElementById("terminal-container")
 file_loader = document.getElementById("file-loader")
+job_status = document.getElementById("job-status")
 
 # ==========================================
 # Helpers
 # ==========================================
 def log(msg, style="text"):
+    """Queues a line; the DOM is updated once per animation frame by flush_log."""
+    entry = (state["log_seq"], str(msg), style)
+    state["log_seq"] += 1
+    state["scrollback"].append(entry)
+    pending = state["pending"]
+    pending.append(entry)
+    if len(pending) > 2 * DOM_LINES:
+        del pending[:-DOM_LINES]
+    if not state["flush_scheduled"]:
+        state["flush_scheduled"] = True
+        js_window.requestAnimationFrame(proxy_flush)
+
+def make_line(seq, msg, style):
     div = document.createElement("div")
     div.className = f"line {style}"
-    div.textContent = str(msg)
-    history_div.appendChild(div)
-    terminal_container.scrollTop = terminal_container.scrollHeight
-
-def load_docs():
+    div.dataset.seq = str(seq)
+    if len(msg) > BULKY_CHARS:
+        bulky = state["bulky"]
+        bulky[seq] = msg
+        while len(bulky) > BULKY_KEEP:
+            bulky.popitem(last=False)
+        div.classList.add("collapsed")
+        div.textContent = f"{msg[:BULKY_PREVIEW]} ... [+{len(msg) - BULKY_PREVIEW:,} chars, click to expand]"
+    else:
+        div.textContent = msg
+    return div
+
+def update_more_marker():
+    scrollback = state["scrollback"]
+    hidden = state["dom_first_seq"] - scrollback[0][0] if scrollback else 0
+    more_div.style.display = "block" if hidden > 0 else "none"
+    more_div.textContent = f"... {hidden:,} earlier lines (click to show more)"
+
+def drop_lines(count=None):
+    """Removes the oldest `count` rendered lines (all when None) with a single Range."""
+    first = more_div.nextElementSibling
+    if first is None: return
+    lines = history_div.childElementCount - 1
+    count = lines if count is None else min(count, lines)
+    if count <= 0: return
+    rng = document.createRange()
+    rng.setStartBefore(first)
+    if count >= lines:
+        rng.setEndAfter(history_div.lastElementChild)
+    else:
+        rng.setEndBefore(history_div.children.item(count + 1))
+    rng.deleteContents()
+
+def flush_log(*args):
+    state["flush_scheduled"] = False
+    pending = state["pending"]
+    if not pending: return
+    state["pending"] = []
+    at_bottom = (terminal_container.scrollHeight - terminal_container.scrollTop
+                 - terminal_container.clientHeight) < 40
+    rendered = pending[-DOM_LINES:]
+    # A burst larger than the window replaces it; earlier lines stay reachable via "show more"
+    if len(pending) > DOM_LINES or history_div.childElementCount == 1:
+        drop_lines()
+        state["dom_first_seq"] = rendered[0][0]
+
+    frag = document.createDocumentFragment()
+    for entry in rendered:
+        frag.appendChild(make_line(*entry))
+    history_div.appendChild(frag)
+    # Keep the DOM bounded while following output; leave it alone while the user reads history
+    if at_bottom:
+        drop_lines(history_div.childElementCount - 1 - DOM_LINES)
+        first = more_div.nextElementSibling
+        if first is not None:
+            state["dom_first_seq"] = int(first.dataset.seq)
+        terminal_container.scrollTop = terminal_container.scrollHeight
+    update_more_marker()
+
+def show_earlier():
+    scrollback = state["scrollback"]
+    if not scrollback: return
+    stop = state["dom_first_seq"] - scrollback[0][0]
+    start = max(0, stop - PAGE_LINES)
+    if stop <= 0: return
+    frag = document.createDocumentFragment()
+    for i in range(start, stop):
+        frag.appendChild(make_line(*scrollback[i]))
+    history_div.insertBefore(frag, more_div.nextSibling)
+    state["dom_first_seq"] = scrollback[start][0]
+    update_more_marker()
+
+def on_history_click(event):
+    target = event.target
+    if target.classList.contains("more"):
+        show_earlier()
+    elif target.classList.contains("collapsed"):
+        msg = state["bulky"].get(int(target.dataset.seq))
+        target.classList.remove("collapsed")
+        target.textContent = msg if msg is not None else target.textContent + " (expired)"
+
+proxy_flush = create_proxy(flush_log)
+more_div = document.createElement("div")
+more_div.className = "line system more"
+more_div.style.display = "none"
+history_div.appendChild(more_div)
+
+async def post_with_backoff(url, body, signal=None):
+    """POSTs an encoded JSON body with async fetch, waiting out 429s (Retry-After or 2^n s).
+
+    The browser's main thread stays free while the request is in flight;
+    `signal` (an AbortSignal) cancels it.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        response = await pyfetch(url, method="POST", body=body.decode("utf-8"),
+                                 headers={"Content-Type": "application/json"}, signal=signal)
+        if response.status != 429 or attempt == MAX_RETRIES:
+            return response
+        try:
+            delay = float(response.headers.get("retry-after", ""))
+        except ValueError:
+            delay = float(2 ** attempt)
+        log(f"Rate limited. Retrying in {delay:.1f}s...", "system")
+        await asyncio.sleep(delay)
+
+def payload_key(url, body):
+    """Content hash of a request; identical programs map to the same key."""
+    return hashlib.sha256(url.encode("utf-8") + b"\n" + body).hexdigest()
+
+def cache_get(key):
+    cache = state["result_cache"]
+    if key not in cache: return None
+    cache.move_to_end(key)
+    return cache[key]
+
+def cache_put(key, value):
+    cache = state["result_cache"]
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > RESULT_CACHE_SIZE:
+        cache.popitem(last=False)
+
+async def load_docs():
     if state["docs_cache"]:
         return state["docs_cache"]
     try:
         target_url = f"{js_window.location.origin}/shell/docs.json"
-        res = requests.get(target_url)
-        if res.status_code == 200:
-            data = res.json()
+        res = await pyfetch(target_url)
+        if res.status == 200:
+            data = await res.json()
             state["docs_cache"] = data
             return data
     except Exception as e:
         log(f"Warning: Failed to load docs.json: {e}", "error")
     return None
 
-def show_doc_section(section_name):
-    data = load_docs()
+async def show_doc_section(section_name):
+    data = await load_docs()
     if not data or section_name not in data:
         log(f"Documentation for '{section_name}' not found.", "error")
         return
@@ -64,188 +217,224 @@ def show_doc_section(section_name):
     for line in data[section_name]:
         log(line.get("text", ""), line.get("style", "text"))
 
+async def probe_backend():
+    """Enables short warm runs only if the API origin reports that it honours initial_state."""
+    try:
+        res = await pyfetch(f"{js_window.location.origin}/v1")
+        if res.status == 200:
+            data = await res.json()
+            engine.warm_backend = bool(data.get("warm_start"))
+    except Exception:
+        engine.warm_backend = False
+
 def show_welcome():
     loading_msg.style.display = "none"
     input_area.style.display = "flex"
     
-    load_docs()
+    asyncio.ensure_future(load_docs())
+    asyncio.ensure_future(probe_backend())
     
     log("Research Preview", "system")
     log("System Ready.", "system")
     log("Type 'help' for commands.", "result")
     cmd_input.focus()
 
-def decode_bits_to_text(bits):
-    n_bytes = len(bits) // 8
-    if n_bytes == 0: return ""
-    chars = []
-    for i in range(n_bytes):
-        byte_bits = bits[i*8 : (i+1)*8]
-        byte_str = "".join(str(b) for b in byte_bits)
-        ascii_code = int(byte_str, 2)
-        if 32 <= ascii_code <= 126:
-            chars.append(chr(ascii_code))
-        else:
-            chars.append("?")
-    return "".join(chars)
+async def solve_remote(body, signal=None):
+    """Solves through the API origin, serving identical programs from the result cache."""
+    target_url = f"{js_window.location.origin}/v1/solve"
+    key = payload_key(target_url, body)
+    res = cache_get(key)
+    if res is not None:
+        log("Cache hit: identical program already solved.", "system")
+        return res
+
+    response = await post_with_backoff(target_url, body, signal)
+    if response.status != 200:
+        raise Exception(f"Error ({response.status}): {await response.string()}")
+    res = await response.json()
+    cache_put(key, res)
+    return res
+
+def open_file_picker(args):
+    file_loader.value = ""
+    file_loader.click()
+    log("Select .enc file...", "system")
 
 # ==========================================
-# Batch Processor
+# Background Jobs
 # ==========================================
-async def run_batch_script(script_text, source_name="Script"):
-    if not script_text: return
-    lines = script_text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+class Job:
+    """One in-flight or finished `run`: its task, abort controller and timing."""
+
+    def __init__(self, name, ticket):
+        self.name = name
+        self.ticket = ticket
+        self.status = "running"
+        self.start = time.monotonic()
+        self.end = None
+        self.controller = AbortController.new()
+        self.task = None
+
+    def elapsed(self):
+        return (self.end or time.monotonic()) - self.start
+
+    def cancel(self):
+        if self.status != "running": return False
+        self.status = "cancelled"
+        self.end = time.monotonic()
+        self.controller.abort()
+        self.task.cancel()
+        return True
+
+def running_jobs():
+    return [job for job in state["jobs"].values() if job.status == "running"]
+
+def estimate_seconds(job):
+    """Expected wall time from finished jobs (seconds per simulated second), or None."""
+    rate = state["sec_per_sim"]
+    return None if rate is None else rate * job.ticket["duration"]
+
+def render_progress():
+    parts = []
+    for job in running_jobs():
+        elapsed, expected = job.elapsed(), estimate_seconds(job)
+        if expected:
+            filled = min(9, int(10 * elapsed / expected))
+            parts.append(f"{job.name} [{'#' * filled}{'.' * (10 - filled)}] {elapsed:.1f}s / ~{expected:.0f}s")
+        else:
+            parts.append(f"{job.name} {elapsed:.1f}s (N={job.ticket['N']}, t={job.ticket['duration']}s)")
+    job_status.textContent = "Running: " + "  |  ".join(parts) if parts else ""
+    job_status.style.display = "block" if parts else "none"
 
-    total_lines = len(lines)
-    if total_lines > MAX_BATCH_LINES:
-        log(f"Security Alert: Script too long ({total_lines} lines).", "error")
-        log(f"Limit is {MAX_BATCH_LINES} lines.", "system")
+async def progress_loop():
+    """Refreshes the status line while any job is in flight."""
+    state["progress_running"] = True
+    try:
+        while running_jobs():
+            render_progress()
+            await asyncio.sleep(PROGRESS_INTERVAL)
+    finally:
+        state["progress_running"] = False
+        render_progress()
+
+async def job_main(job, payload):
+    prefix = f"[{job.name}] "
+    try:
+        res = await solve_remote(payload, job.controller.signal)
+    except asyncio.CancelledError:
+        job.status = "cancelled"
+        log(f"{prefix}Cancelled after {job.elapsed():.1f}s.", "system")
+        return
+    except Exception as e:
+        if job.status == "cancelled" or job.controller.signal.aborted:
+            job.status = "cancelled"
+            log(f"{prefix}Cancelled after {job.elapsed():.1f}s.", "system")
+        else:
+            job.status = "failed"
+            log(f"{prefix}Error: {str(e)}", "error")
         return
+    finally:
+        job.end = job.end or time.monotonic()
+    job.status = "done"
+    rate = job.elapsed() / job.ticket["duration"]
+    state["sec_per_sim"] = rate if state["sec_per_sim"] is None else 0.5 * (state["sec_per_sim"] + rate)
+    engine.finish_run(res, job.ticket, prefix)
+
+def prune_jobs():
+    jobs = state["jobs"]
+    finished = [name for name, job in jobs.items() if job.status != "running"]
+    for name in finished[:max(0, len(finished) - JOB_KEEP)]:
+        del jobs[name]
+
+async def run_job(args):
+    """`run [seconds] [cold] [as <name>]` in the background; scripts wait for it before the next line."""
+    name = None
+    lowered = [a.lower() for a in args]
+    if "as" in lowered:
+        i = lowered.index("as")
+        if i + 1 >= len(args): raise Exception("Usage: run [seconds] [cold] [as <name>]")
+        name, args = args[i + 1], args[:i] + args[i + 2:]
+    if name is None:
+        state["job_seq"] += 1
+        name = f"job{state['job_seq']}"
+    existing = state["jobs"].get(name)
+    if existing is not None and existing.status == "running":
+        raise Exception(f"Job '{name}' is still running (cancel {name}).")
+
+    payload, ticket = engine.prepare_run(args)
+    job = Job(name, ticket)
+    state["jobs"].pop(name, None)
+    state["jobs"][name] = job
+    prune_jobs()
+    log(f"[{name}] Computing (N={ticket['N']}, t={ticket['duration']}s) in background...", "result")
+    job.task = asyncio.ensure_future(job_main(job, payload))
+    if not state["progress_running"]:
+        asyncio.ensure_future(progress_loop())
+    if engine.scripted:
+        await wait_jobs([job])
+
+async def wait_jobs(jobs):
+    tasks = [job.task for job in jobs if job.status == "running"]
+    if tasks: await asyncio.wait(tasks)
+
+def find_jobs(args):
+    """Jobs named in args ('all' for every running one); the newest running job by default."""
+    if args and args[0].lower() == "all":
+        return running_jobs()
+    if args:
+        job = state["jobs"].get(args[0])
+        if job is None: raise Exception(f"No job named '{args[0]}'.")
+        return [job]
+    running = running_jobs()
+    return running[-1:]
+
+def cancel_jobs(args):
+    jobs = [job for job in find_jobs(args) if job.cancel()]
+    if not jobs:
+        log("No running job to cancel.", "system")
+    for job in jobs:
+        log(f"[{job.name}] Cancel requested.", "system")
+
+async def wait_command(args):
+    jobs = find_jobs(args or ["all"])
+    await wait_jobs(jobs)
+    log(f"Waited for {len(jobs)} job(s).", "system")
+
+def list_jobs(args):
+    jobs = state["jobs"]
+    if not jobs:
+        log("No jobs.", "system")
+        return
+    for job in jobs.values():
+        t = job.ticket
+        log(f"{job.name:<12} {job.status:<10} {job.elapsed():>7.1f}s  N={t['N']}, t={t['duration']}s", "system")
+
+# Interpreter state (node / edge / reset) lives in the headless engine; `run` becomes a background job
+engine = EncEngine(emit=log, solve=solve_remote)
+engine.register("help", lambda args: show_doc_section("help"))
+engine.register("docs", lambda args: show_doc_section("docs"))
+engine.register("source", open_file_picker)
+engine.register("run", run_job)
+engine.register("jobs", list_jobs)
+engine.register("cancel", cancel_jobs)
+engine.register("wait", wait_command)
 
-    log(f"--- Loading {source_name} ({len(lines)} lines) ---", "system")
-    count = 0
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith("#"): continue
-        await process_single_line(line)
-        count += 1
-        await asyncio.sleep(0.005)
-    log(f"--- Finished ({count} ops) ---", "system")
+# ==========================================
+# Batch Processor
+# ==========================================
+async def run_batch_script(script_text, source_name="Script"):
+    await engine.run_script(script_text, source_name, bulk=True)
 
 # ==========================================
 # Core Logic
 # ==========================================
 async def process_single_line(line):
     line = line.strip()
-    if not line: return
-    if line.startswith("#"): return
-
-    log(f"Enchan> {line}", "text")
+    if not line or line.startswith("#"): return
     if not state["history"] or state["history"][-1] != line:
         state["history"].append(line)
     state["history_idx"] = len(state["history"])
-
-    parts = line.split()
-    cmd = parts[0].lower()
-    args = parts[1:]
-
-    try:
-        if cmd == "help":
-            show_doc_section("help")
-
-        elif cmd == "docs":
-            show_doc_section("docs")
-
-        elif cmd == "reset":
-            state["h"] = {}
-            state["J"] = {}
-            state["N_max"] = 0
-            log("Memory cleared.", "system")
-
-        elif cmd == "node":
-            if len(args) < 2: raise Exception("Usage: node <index> <bias>")
-            i, bias = int(args[0]), float(args[1])
-            state["h"][i] = bias
-            state["N_max"] = max(state["N_max"], i + 1)
-
-        elif cmd == "edge":
-            if len(args) < 3: raise Exception("Usage: edge <i> <j> <weight>")
-            u, v, w = int(args[0]), int(args[1]), float(args[2])
-            if u > v: u, v = v, u
-            key = f"{u},{v}"
-            state["J"][key] = {"u": u, "v": v, "w": w}
-            state["N_max"] = max(state["N_max"], u + 1, v + 1)
-            log(f"Link[{u}-{v}] set to {w}", "system")
-        
-        elif cmd == "source":
-            file_loader.value = ""
-            file_loader.click()
-            log("Select .enc file...", "system")
-
-        elif cmd == "run":
-            if state["N_max"] == 0: raise Exception("No data in memory.")
-            duration = max(5.0, state["N_max"] * 0.2)
-            if args: duration = float(args[0])
-            if duration < 35.0: duration = 35.0
-            if duration > MAX_RUN_DURATION:
-                duration = MAX_RUN_DURATION
-                log(f"Warning: Duration capped at {MAX_RUN_DURATION}s", "system")
-
-            core_N = state["N_max"]
-            has_bias = len(state["h"]) > 0
-            ghost_idx = core_N
-            final_N = core_N + (1 if has_bias else 0)
-
-            edges_list = []
-            weights_list = []
-            for k, v in state["J"].items():
-                edges_list.append([v["u"], v["v"]])
-                weights_list.append(v["w"])
-
-            if has_bias:
-                for idx, bias in state["h"].items():
-                    if idx < core_N:
-                        edges_list.append([idx, ghost_idx])
-                        weights_list.append(bias) 
-
-            init_state = [0.0] * final_N
-            if has_bias:
-                init_state[ghost_idx] = 1.0
-
-            payload = {
-                "graph": { 
-                    "N": final_N, 
-                    "edges": edges_list, 
-                    "weights": weights_list, 
-                    "density": 0.0 
-                },
-                "control": { "total_time": duration },
-                "initial_state": init_state,
-                "seed": 314
-            }
-
-            log(f"Computing (N={core_N}, t={duration}s)...", "result")
-            
-            headers = {"Content-Type": "application/json"}
-            target_url = f"{js_window.location.origin}/v1/solve"
-            
-            response = requests.post(target_url, json=payload, headers=headers)
-            
-            if response.status_code != 200:
-                raise Exception(f"Error ({response.status_code}): {response.text}")
-
-            res = response.json()
-
-            audit_pub = res.get("audit_public", {})
-            res_hash = audit_pub.get("result_hash", "no-signature")
-
-            spins = res.get("outputs", {}).get("spins", [])
-            
-            if has_bias:
-                ghost_spin = spins[ghost_idx]
-                bits = []
-                for i in range(core_N):
-                    bits.append(1 if (spins[i] * ghost_spin > 0) else 0)
-            else:
-                bits = [1 if s > 0 else 0 for s in spins[:core_N]]
-            
-            timing = res.get("TIMING", {})
-            wall_time = timing.get("total_wall_time", 0.0)
-
-            log(f"Done ({wall_time:.4f}s)", "result")
-            log(f"Binary: {bits}", "audit")
-            
-            log(f"Hash: [{res_hash}]", "system")
-            
-            decoded_text = decode_bits_to_text(bits)
-            if decoded_text:
-                log(f"String: \"{decoded_text}\"", "result")
-
-        else:
-            log(f"Unknown: {cmd}", "error")
-
-    except Exception as e:
-        log(f"Error: {str(e)}", "error")
+    await engine.execute(line)
 
 # --- Events ---
 show_welcome()
@@ -315,5 +504,7 @@ proxy_paste = create_proxy(on_paste)
 cmd_input.addEventListener("paste", proxy_paste)
 proxy_focus = create_proxy(keep_focus)
 terminal_container.addEventListener("click", proxy_focus)
+proxy_history_click = create_proxy(on_history_click)
+history_div.addEventListener("click", proxy_history_click)
 proxy_file_select = create_proxy(on_file_selected)
 file_loader.addEventListener("change", proxy_file_select)
\ No newline at end of file
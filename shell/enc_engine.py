@@ -0,0 +1,692 @@
+"""Headless .enc command engine (no DOM, no network, standard library only).
+
+Holds the Ising program state (`node` biases, `edge` couplings) in a typed
+array store and turns `run` into an encoded `/v1/solve` JSON body. Output goes
+through an `emit(msg, style)` callback and solving through an async
+`solve(body)` callback, so the same engine drives the PyScript web shell and
+plain CPython:
+
+    python shell/enc_engine.py program.enc --local     # reference kernel
+    python shell/enc_engine.py program.enc --dry-run   # parse only
+    python shell/enc_engine.py a.enc b.enc --local     # one after another
+    python shell/enc_engine.py gates/*.enc --batch --local
+
+Bulk mode (`run_script(..., bulk=True)`) applies node / edge / reset lines in
+one pass and emits one summary line per build segment (before the `run` that
+follows it) instead of one log line per command. Batch mode
+(`solve_batch`) packs many small programs into one solve as a disjoint union.
+
+An optional `tracer` (anything with `span(name, **args)` and `add(name, start,
+end, **args)`, e.g. `enchan_client.trace.Tracer`) records build / encode / decode spans; the CLI
+enables it with `--trace spans.jsonl`.
+"""
+import argparse
+import asyncio
+import contextlib
+import inspect
+import json
+import math
+import os
+import sys
+import time
+from array import array
+
+MAX_BATCH_LINES = 5000
+MIN_RUN_DURATION = 35.0
+MAX_RUN_DURATION = 120.0
+RUN_SEED = 314
+MAX_BULK_ERRORS = 5
+# Node cap of one batched request (the public API's N limit)
+MAX_BATCH_NODES = 3000
+# Floor of `run` when it is seeded from the previous field
+WARM_MIN_DURATION = 5.0
+# Rows per cached JSON fragment of the edge / weight arrays
+ENCODE_CHUNK = 4096
+
+
+def decode_bits_to_text(bits):
+    n_bytes = len(bits) // 8
+    if n_bytes == 0: return ""
+    chars = []
+    for i in range(n_bytes):
+        byte_str = "".join(str(b) for b in bits[i*8 : (i+1)*8])
+        ascii_code = int(byte_str, 2)
+        chars.append(chr(ascii_code) if 32 <= ascii_code <= 126 else "?")
+    return "".join(chars)
+
+
+def split_script(text):
+    return text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+
+
+def decode_block(spins, offset, core_N, ghost):
+    """(bits, text) of nodes offset..offset+core_N, read relative to the ghost node if present."""
+    if ghost:
+        ghost_spin = spins[offset + core_N]
+        bits = [1 if spins[offset + i] * ghost_spin > 0 else 0 for i in range(core_N)]
+    else:
+        bits = [1 if s > 0 else 0 for s in spins[offset:offset + core_N]]
+    return bits, decode_bits_to_text(bits)
+
+
+def trace_span(tracer, name, **args):
+    """`tracer.span(...)`, or a no-op context without a tracer."""
+    return tracer.span(name, **args) if tracer is not None else contextlib.nullcontext(args)
+
+
+def solve_body(N, edges, weights, init, duration, seed):
+    """`/v1/solve` JSON body (bytes) from pre-rendered array fragments."""
+    return (f'{{"graph":{{"N":{N},"edges":[{edges}],"weights":[{weights}],"density":0.0}},'
+            f'"control":{{"total_time":{duration!r}}},"initial_state":[{init}],"seed":{seed}}}').encode("utf-8")
+
+
+# ==========================================
+# Model Store
+# ==========================================
+class ModelStore:
+    """Ising program as parallel typed arrays, de-duplicated through hash indexes.
+
+    Couplings live in `eu`/`ev` (int32) and `ew` (float64) with `edge_index`
+    mapping `u << 32 | v` to the row; biases likewise in `hi`/`hv`. The JSON
+    body is rendered straight from the arrays with one %-format per chunk of
+    `ENCODE_CHUNK` rows, so no per-edge lists or dicts are ever built.
+
+    Rendered chunks are cached between exports: edges are append-only, so only
+    the trailing chunk, new chunks and chunks whose weights were overwritten
+    are re-encoded on the next `run`.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.eu, self.ev, self.ew = array("i"), array("i"), array("d")
+        self.hi, self.hv = array("i"), array("d")
+        self.edge_index = {}
+        self.node_index = {}
+        self.N = 0
+        self._edge_chunks, self._weight_chunks = [], []
+        self._encoded_rows = 0
+        self._dirty = set()
+        self.last_encoded = (0, 0)
+
+    @property
+    def E(self):
+        return len(self.ew)
+
+    @property
+    def B(self):
+        return len(self.hv)
+
+    def set_node(self, i, bias):
+        if i < 0: raise Exception("Node index must be >= 0")
+        if not math.isfinite(bias): raise Exception("Bias must be finite")
+        pos = self.node_index.get(i)
+        if pos is None:
+            self.node_index[i] = len(self.hv)
+            self.hi.append(i)
+            self.hv.append(bias)
+        else:
+            self.hv[pos] = bias
+        self.N = max(self.N, i + 1)
+
+    def set_edge(self, u, v, w):
+        if u > v: u, v = v, u
+        if u < 0: raise Exception("Node index must be >= 0")
+        if not math.isfinite(w): raise Exception("Weight must be finite")
+        key = u << 32 | v
+        pos = self.edge_index.get(key)
+        if pos is None:
+            self.edge_index[key] = len(self.ew)
+            self.eu.append(u)
+            self.ev.append(v)
+            self.ew.append(w)
+        else:
+            self.ew[pos] = w
+            self._dirty.add(pos // ENCODE_CHUNK)
+        self.N = max(self.N, v + 1)
+        return u, v, w
+
+    def nbytes(self):
+        """Approximate footprint: array buffers plus both hash indexes (keys included)."""
+        arrays = sum(a.itemsize * len(a) for a in (self.eu, self.ev, self.ew, self.hi, self.hv))
+        index = sys.getsizeof(self.edge_index) + sys.getsizeof(self.node_index)
+        # int keys: u << 32 | v needs 32 bytes, node ids 28
+        return arrays + index + 32 * len(self.edge_index) + 28 * len(self.node_index)
+
+    def _render_chunk(self, c):
+        lo, hi = c * ENCODE_CHUNK, min(self.E, (c + 1) * ENCODE_CHUNK)
+        pairs = array("i", bytes(4 * 2 * (hi - lo)))
+        pairs[0::2] = self.eu[lo:hi]
+        pairs[1::2] = self.ev[lo:hi]
+        edges = ("[%d,%d]," * (hi - lo) % tuple(pairs))[:-1]
+        weights = ("%r," * (hi - lo) % tuple(self.ew[lo:hi]))[:-1]
+        if c < len(self._edge_chunks):
+            self._edge_chunks[c], self._weight_chunks[c] = edges, weights
+        else:
+            self._edge_chunks.append(edges)
+            self._weight_chunks.append(weights)
+
+    def encode_links(self):
+        """(edges, weights) JSON fragments of the couplings, re-rendering only stale chunks."""
+        n_chunks = -(-self.E // ENCODE_CHUNK)
+        first_new = self._encoded_rows // ENCODE_CHUNK
+        stale = sorted(c for c in self._dirty if c < first_new) + list(range(first_new, n_chunks))
+        for c in stale:
+            self._render_chunk(c)
+        self._encoded_rows = self.E
+        self._dirty.clear()
+        self.last_encoded = (len(stale), n_chunks)
+        return ",".join(self._edge_chunks), ",".join(self._weight_chunks)
+
+    def export_json(self, duration, seed, init=None):
+        """`/v1/solve` body (bytes); biases become edges to a ghost node pinned at +1.
+
+        `init` is the initial field of the N core nodes (default all 0.0).
+        """
+        core_N = self.N
+        B = self.B
+        final_N = core_N + (1 if B else 0)
+        edges, weights = self.encode_links()
+        if B:
+            pairs = array("i", [core_N]) * (2 * B)
+            pairs[0::2] = self.hi
+            bias_edges = ("[%d,%d]," * B % tuple(pairs))[:-1]
+            bias_weights = ("%r," * B % tuple(self.hv))[:-1]
+            edges = f"{edges},{bias_edges}" if edges else bias_edges
+            weights = f"{weights},{bias_weights}" if weights else bias_weights
+        init = ("%r," * core_N % tuple(init))[:-1] if init is not None else ("0.0," * core_N)[:-1]
+        if B: init = f"{init},1.0"
+        return solve_body(final_N, edges, weights, init, duration, seed)
+
+    def render_block(self, offset):
+        """(edges, weights, init) fragments with node ids shifted by `offset`, ghost included.
+
+        Not cached: used to place small programs side by side in one batch.
+        """
+        core_N, E, B = self.N, self.E, self.B
+        ids = array("i", bytes(4 * 2 * (E + B)))
+        ids[0:2 * E:2] = self.eu
+        ids[1:2 * E:2] = self.ev
+        if B:
+            ids[2 * E::2] = self.hi
+            ids[2 * E + 1::2] = array("i", [core_N]) * B
+        edges = ("[%d,%d]," * (E + B) % tuple(i + offset for i in ids))[:-1]
+        weights = ("%r," * (E + B) % (tuple(self.ew) + tuple(self.hv)))[:-1]
+        init = ("0.0," * core_N + "1.0") if B else ("0.0," * core_N)[:-1]
+        return edges, weights, init
+
+
+# ==========================================
+# Engine
+# ==========================================
+class EncEngine:
+    """Interpreter for node / edge / reset / run; UI commands are registered by the host."""
+
+    def __init__(self, emit=None, solve=None, tracer=None):
+        self.emit = emit or (lambda msg, style="text": None)
+        self.solve = solve
+        self.tracer = tracer
+        self.handlers = {}
+        self.model = ModelStore()
+        self.warm = True
+        # Shortened warm durations only when the backend is known to use initial_state
+        self.warm_backend = False
+        self.last_field = None
+        # Bumped by reset so results of runs started before it are not kept as warm fields
+        self.epoch = 0
+        self.script_depth = 0
+
+    @property
+    def N_max(self):
+        return self.model.N
+
+    def reset(self):
+        self.model.clear()
+        self.last_field = None
+        self.epoch += 1
+
+    @property
+    def scripted(self):
+        """True while commands come from `run_script` (hosts then finish `run` before the next line)."""
+        return self.script_depth > 0
+
+    def register(self, name, handler):
+        """Adds a host command (`help`, `source`, ...); handler(args) may be async.
+
+        Host handlers take precedence over built-ins, so a host can replace `run`.
+        """
+        self.handlers[name] = handler
+
+    # --- Program state ---
+    def set_node(self, args):
+        if len(args) < 2: raise Exception("Usage: node <index> <bias>")
+        self.model.set_node(int(args[0]), float(args[1]))
+
+    def set_edge(self, args):
+        if len(args) < 3: raise Exception("Usage: edge <i> <j> <weight>")
+        return self.model.set_edge(int(args[0]), int(args[1]), float(args[2]))
+
+    def model_summary(self):
+        m = self.model
+        return f"N={m.N}, {m.E} links, {m.B} biases, {m.nbytes() / 1024:.1f} KB"
+
+    def run_duration(self, args, warm=False):
+        """(duration, warning) following the shell's run rules.
+
+        Warm runs start near the previous fixed point: their default is a tenth
+        of the cold one and their floor is WARM_MIN_DURATION. Callers pass
+        warm=True only for backends that honour initial_state (`warm_backend`).
+        """
+        duration = max(5.0, self.N_max * (0.02 if warm else 0.2))
+        if args: duration = float(args[0])
+        floor = WARM_MIN_DURATION if warm else MIN_RUN_DURATION
+        if duration < floor: duration = floor
+        if duration > MAX_RUN_DURATION:
+            return MAX_RUN_DURATION, f"Warning: Duration capped at {MAX_RUN_DURATION}s"
+        return duration, None
+
+    def warm_field(self):
+        """Core-node field seeded from the last result, or None for a cold start.
+
+        The previous `S` is flipped into the frame where its ghost node is +1
+        (the ghost is re-pinned at +1 and moves to the new core_N); nodes added
+        since then start at 0.0.
+        """
+        if not self.warm or self.last_field is None: return None
+        prev_N, had_bias, S = self.last_field
+        if prev_N > self.N_max: return None
+        sign = -1.0 if had_bias and S[prev_N] < 0 else 1.0
+        return [sign * s for s in S[:prev_N]] + [0.0] * (self.N_max - prev_N)
+
+    def build_payload(self, duration, init=None):
+        """Encoded `/v1/solve` JSON body for the current program."""
+        if self.N_max == 0: raise Exception("No data in memory.")
+        return self.model.export_json(duration, RUN_SEED, init)
+
+    def decode_result(self, res):
+        """(bits, text) read relative to the ghost node when biases are present."""
+        spins = res.get("outputs", {}).get("spins", [])
+        return decode_block(spins, 0, self.N_max, self.model.B > 0)
+
+    def prepare_run(self, args):
+        """(payload, ticket) for `run [seconds] [cold]`.
+
+        The ticket snapshots the program shape, so `finish_run` decodes the
+        result correctly even if the program changed while the solve was in flight.
+        """
+        cold = "cold" in [a.lower() for a in args]
+        args = [a for a in args if a.lower() != "cold"]
+        init = None if cold else self.warm_field()
+        # A backend that ignores initial_state solves cold, so it keeps the cold floor
+        duration, warning = self.run_duration(args, warm=init is not None and self.warm_backend)
+        if warning: self.emit(warning, "system")
+        with trace_span(self.tracer, "encode", format="json", N=self.N_max) as span_args:
+            payload = self.build_payload(duration, init)
+            span_args["bytes"] = len(payload)
+
+        if init is not None:
+            new_nodes = self.N_max - self.last_field[0]
+            stale, chunks = self.model.last_encoded
+            self.emit(f"Warm start from previous field (+{new_nodes} nodes, "
+                      f"{stale}/{chunks} link chunks re-encoded)", "system")
+        return payload, {"N": self.N_max, "biased": self.model.B > 0, "duration": duration, "epoch": self.epoch}
+
+    def finish_run(self, res, ticket, prefix=""):
+        """Keeps the returned field for warm starts and emits the decoded result."""
+        S = res.get("S")
+        if S is None:
+            S = res.get("outputs", {}).get("spins")
+        if S is not None and ticket["epoch"] == self.epoch:
+            self.last_field = (ticket["N"], ticket["biased"], list(S))
+        with trace_span(self.tracer, "decode"):
+            bits, text = decode_block(res.get("outputs", {}).get("spins", []), 0, ticket["N"], ticket["biased"])
+        wall_time = res.get("TIMING", {}).get("total_wall_time", 0.0)
+        res_hash = res.get("audit_public", {}).get("result_hash", "no-signature")
+
+        self.emit(f"{prefix}Done ({wall_time:.4f}s)", "result")
+        self.emit(f"{prefix}Binary: {bits}", "audit")
+        self.emit(f"{prefix}Hash: [{res_hash}]", "system")
+        if text:
+            self.emit(f"{prefix}String: \"{text}\"", "result")
+        return bits, text
+
+    async def run(self, args):
+        payload, ticket = self.prepare_run(args)
+        if self.solve is None: raise Exception("No solver attached.")
+        self.emit(f"Computing (N={ticket['N']}, t={ticket['duration']}s)...", "result")
+        res = await self.solve(payload)
+        self.finish_run(res, ticket)
+        return res
+
+    # --- Dispatch ---
+    async def execute(self, line, echo=True):
+        """Runs one command line; errors are emitted, not raised."""
+        line = line.strip()
+        if not line or line.startswith("#"): return
+        if echo: self.emit(f"Enchan> {line}", "text")
+        parts = line.split()
+        cmd, args = parts[0].lower(), parts[1:]
+        try:
+            if cmd in self.handlers:
+                out = self.handlers[cmd](args)
+                if inspect.isawaitable(out): await out
+            elif cmd == "reset":
+                self.reset()
+                self.emit("Memory cleared.", "system")
+            elif cmd == "warm":
+                if args: self.warm = args[0].lower() in ("on", "1", "true")
+                state = "on" if self.warm else "off"
+                kept = "field kept" if self.last_field else "no field yet"
+                floor = "short runs" if self.warm_backend else "cold durations, backend not known to honour it"
+                self.emit(f"Warm start: {state} ({kept}; {floor})", "system")
+            elif cmd == "node":
+                self.set_node(args)
+            elif cmd == "edge":
+                u, v, w = self.set_edge(args)
+                self.emit(f"Link[{u}-{v}] set to {w}", "system")
+            elif cmd == "run":
+                await self.run(args)
+            elif cmd == "stats":
+                self.emit(f"Model: {self.model_summary()}", "system")
+            else:
+                self.emit(f"Unknown: {cmd}", "error")
+        except Exception as e:
+            self.emit(f"Error: {str(e)}", "error")
+
+    async def run_script(self, script_text, source_name="Script", bulk=True):
+        """Executes a script; bulk mode applies node/edge/reset silently and summarizes each build segment."""
+        self.script_depth += 1
+        try:
+            return await self._run_script(script_text, source_name, bulk)
+        finally:
+            self.script_depth -= 1
+
+    async def _run_script(self, script_text, source_name, bulk):
+        if not script_text: return None
+        lines = split_script(script_text)
+        if len(lines) > MAX_BATCH_LINES:
+            self.emit(f"Security Alert: Script too long ({len(lines)} lines).", "error")
+            self.emit(f"Limit is {MAX_BATCH_LINES} lines.", "system")
+            return None
+
+        self.emit(f"--- Loading {source_name} ({len(lines)} lines) ---", "system")
+        start = time.perf_counter()
+        counts = {"node": 0, "edge": 0, "reset": 0, "other": 0}
+        errors = []
+        # Each run of node / edge / reset lines between other commands is one build segment:
+        # one "build" span and, in bulk mode, one summary line before the next command runs
+        build_start, applied, segment_errors = None, {"node": 0, "edge": 0, "reset": 0}, []
+        for lineno, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"): continue
+            if not bulk:
+                await self.execute(line)
+                counts["other"] += 1
+                continue
+            parts = line.split()
+            cmd = parts[0].lower()
+            if cmd not in applied:
+                counts["other"] += 1
+                self._end_build(build_start, applied, segment_errors)
+                build_start, applied, segment_errors = None, dict.fromkeys(applied, 0), []
+                await self.execute(line)
+                continue
+            if build_start is None: build_start = time.perf_counter()
+            try:
+                if cmd == "node":
+                    self.set_node(parts[1:])
+                elif cmd == "edge":
+                    self.set_edge(parts[1:])
+                else:
+                    self.reset()
+                counts[cmd] += 1
+                applied[cmd] += 1
+            except Exception as e:
+                errors.append(lineno)
+                segment_errors.append(lineno)
+                if len(segment_errors) <= MAX_BULK_ERRORS:
+                    self.emit(f"Error (line {lineno}): {str(e)}", "error")
+
+        self._end_build(build_start, applied, segment_errors)
+        elapsed = time.perf_counter() - start
+        ops = sum(counts.values())
+        self.emit(f"--- Finished ({ops} ops in {elapsed * 1e3:.1f} ms) ---", "system")
+        return {"ops": ops, "errors": len(errors), "elapsed": elapsed, **counts}
+
+    def _end_build(self, build_start, applied, errors):
+        """Closes a build segment: records its span and summarizes the model about to be used."""
+        if build_start is None: return
+        if self.tracer is not None:
+            self.tracer.add("build", build_start, time.perf_counter(), N=self.N_max, links=self.model.E)
+        if len(errors) > MAX_BULK_ERRORS:
+            self.emit(f"... {len(errors) - MAX_BULK_ERRORS} more errors", "error")
+        self.emit(f"Applied {applied['node']} node, {applied['edge']} edge, {applied['reset']} reset "
+                  f"({self.model_summary()})", "system")
+
+
+# ==========================================
+# Batch Solve
+# ==========================================
+def load_program(script_text):
+    """ModelStore of a script's node / edge / reset lines; `run` and host commands are skipped."""
+    engine = EncEngine()
+    for lineno, line in enumerate(split_script(script_text), 1):
+        parts = line.split()
+        if not parts or parts[0].startswith("#"): continue
+        cmd = parts[0].lower()
+        try:
+            if cmd == "node":
+                engine.set_node(parts[1:])
+            elif cmd == "edge":
+                engine.set_edge(parts[1:])
+            elif cmd == "reset":
+                engine.reset()
+        except Exception as e:
+            raise ValueError(f"line {lineno}: {str(e)}") from e
+    return engine.model
+
+
+def pack_programs(models, duration, seed=RUN_SEED):
+    """Disjoint union of programs as one `/v1/solve` body.
+
+    Each program keeps its own ghost node right after its core nodes. Returns
+    (body, layout) with layout[k] = (offset, core_N, has_ghost).
+    """
+    edges, weights, init, layout = [], [], [], []
+    offset = 0
+    for m in models:
+        if m.N == 0: raise Exception("Empty program in batch.")
+        e, w, x = m.render_block(offset)
+        if e:
+            edges.append(e)
+            weights.append(w)
+        init.append(x)
+        layout.append((offset, m.N, m.B > 0))
+        offset += m.N + (1 if m.B else 0)
+    return solve_body(offset, ",".join(edges), ",".join(weights), ",".join(init), duration, seed), layout
+
+
+def unpack_batch(res, layout):
+    """Per-program (bits, text) from a batched response."""
+    spins = res.get("outputs", {}).get("spins", [])
+    return [decode_block(spins, offset, core_N, ghost) for offset, core_N, ghost in layout]
+
+
+def group_programs(models, max_nodes=MAX_BATCH_NODES):
+    """Consecutive runs of programs whose blocks fit in `max_nodes`; oversized ones go alone."""
+    groups, current, used = [], [], 0
+    for k, m in enumerate(models):
+        size = m.N + (1 if m.B else 0)
+        if current and used + size > max_nodes:
+            groups.append(current)
+            current, used = [], 0
+        current.append(k)
+        used += size
+    if current: groups.append(current)
+    return groups
+
+
+async def solve_batch(models, solve, duration=None, max_nodes=MAX_BATCH_NODES, seed=RUN_SEED, tracer=None):
+    """Solves many small programs in as few requests as possible.
+
+    Blocks are independent, so each request runs for the duration the largest
+    program in it would get from `run` (unless `duration` is given). Returns
+    {"programs": [{"bits", "text", "request"}, ...], "report": {...}}.
+    """
+    start = time.perf_counter()
+    groups = group_programs(models, max_nodes)
+
+    async def one(group):
+        members = [models[k] for k in group]
+        t = duration or min(MAX_RUN_DURATION, max(MIN_RUN_DURATION, max(m.N for m in members) * 0.2))
+        with trace_span(tracer, "encode", format="json", programs=len(members)):
+            body, layout = pack_programs(members, t, seed)
+        res = await solve(body)
+        with trace_span(tracer, "decode", programs=len(members)):
+            return unpack_batch(res, layout), len(body)
+
+    results = await asyncio.gather(*(one(g) for g in groups))
+    programs = [None] * len(models)
+    for r, (group, (decoded, _)) in enumerate(zip(groups, results)):
+        for k, (bits, text) in zip(group, decoded):
+            programs[k] = {"bits": bits, "text": text, "request": r}
+    elapsed = time.perf_counter() - start
+    return {
+        "programs": programs,
+        "report": {
+            "programs": len(models),
+            "requests": len(groups),
+            "nodes": sum(m.N + (1 if m.B else 0) for m in models),
+            "body_bytes": sum(size for _, size in results),
+            "wall_time": elapsed,
+            "programs_per_sec": len(models) / elapsed if elapsed > 0 else 0.0,
+        },
+    }
+
+
+# ==========================================
+# CPython CLI
+# ==========================================
+def _print_emit(msg, style="text"):
+    stream = sys.stderr if style == "error" else sys.stdout
+    print(msg, file=stream)
+
+
+def _use_client_package():
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def _make_solver(args, tracer=None):
+    _use_client_package()
+    if args.local:
+        from enchan_client import solve_local
+
+        def local(body):
+            with trace_span(tracer, "server", backend="local"):
+                return solve_local(json.loads(body))
+        return lambda body: asyncio.get_running_loop().run_in_executor(None, local, body)
+    from enchan_client import AsyncEnchanClient
+    client = AsyncEnchanClient(args.base_url, rate=None)
+    return client.solve
+
+
+def _make_tracer(args):
+    """Tracer shared by the engine and the API client (`--trace`), or None."""
+    if not args.trace: return None
+    _use_client_package()
+    from enchan_client.trace import Tracer, set_tracer
+    tracer = Tracer(source="enc_engine")
+    set_tracer(tracer)
+    return tracer
+
+
+def _finish_trace(args, tracer):
+    if tracer is None: return
+    from enchan_client.trace import format_phases
+    tracer.write_jsonl(args.trace)
+    _print_emit(f"Trace: {format_phases(tracer.records())} -> {args.trace}", "system")
+
+
+async def main_batch(args, tracer=None):
+    """Solves every script that parses as one batch; returns the number of scripts skipped."""
+    models, paths, failed = [], [], 0
+    for path in args.script:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            with trace_span(tracer, "build", program=os.path.basename(path)):
+                model = load_program(text)
+            if model.N == 0: raise ValueError("empty program")
+        except ValueError as e:
+            _print_emit(f"Error ({os.path.basename(path)}): {str(e)}", "error")
+            failed += 1
+            continue
+        models.append(model)
+        paths.append(path)
+    if not models:
+        return failed
+    if args.dry_run:
+        async def solve(body):
+            n = json.loads(body)["graph"]["N"]
+            _print_emit(f"[dry-run] N={n}, body {len(body):,} bytes", "system")
+            return {"outputs": {"spins": [1.0] * n}}
+    else:
+        solve = _make_solver(args, tracer)
+
+    result = await solve_batch(models, solve, tracer=tracer)
+    for path, prog in zip(paths, result["programs"]):
+        text = f' "{prog["text"]}"' if prog["text"] else ""
+        _print_emit(f"{os.path.basename(path)}: {''.join(map(str, prog['bits']))}{text}", "result")
+    report = result["report"]
+    _print_emit(f"--- {report['programs']} programs in {report['requests']} requests, "
+                f"{report['programs_per_sec']:.1f} programs/s ---", "system")
+    if failed:
+        _print_emit(f"--- {failed} program(s) skipped after errors ---", "error")
+    if args.json:
+        print(json.dumps(result))
+    return failed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Execute .enc programs outside the browser.")
+    parser.add_argument("script", nargs="+", help=".enc program file(s), run in order (or as one batch)")
+    parser.add_argument("--local", action="store_true", help="Solve with the local reference kernel")
+    parser.add_argument("--base-url", help="Solve through this API (default: ENCHAN_BASE_URL or public API)")
+    parser.add_argument("--dry-run", action="store_true", help="Parse only; print model and body size of each run")
+    parser.add_argument("--verbose", action="store_true", help="Per-line execution and logs (no bulk mode)")
+    parser.add_argument("--batch", action="store_true", help="Solve all scripts as one block-diagonal batch")
+    parser.add_argument("--json", action="store_true", help="Print the script summary as JSON")
+    parser.add_argument("--trace", help="Append per-phase timing spans to this JSON-lines file")
+    args = parser.parse_args()
+    tracer = _make_tracer(args)
+
+    if args.batch:
+        failed = await main_batch(args, tracer)
+        _finish_trace(args, tracer)
+        if failed: sys.exit(1)
+        return
+    engine = EncEngine(emit=_print_emit, tracer=tracer)
+    engine.warm_backend = args.local
+    if args.dry_run:
+        async def solve(body):
+            m = engine.model
+            _print_emit(f"[dry-run] {engine.model_summary()}, body {len(body):,} bytes", "system")
+            return {"outputs": {"spins": [1.0] * (m.N + (1 if m.B else 0))}}
+        engine.solve = solve
+    else:
+        engine.solve = _make_solver(args, tracer)
+
+    # Each script is its own program: run in order, starting from an empty model
+    for path in args.script:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        engine.reset()
+        summary = await engine.run_script(text, os.path.basename(path), bulk=not args.verbose)
+        if args.json and summary:
+            print(json.dumps(summary))
+    _finish_trace(args, tracer)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())